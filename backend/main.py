@@ -2,15 +2,41 @@
 from dotenv import load_dotenv
 load_dotenv()
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from routers import session, feedback, research, health
+from services import factcheck_cache, factcheck_worker, graph_writer, memory, memory_schema, modulate, retrieval, task_poller
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application-lifetime resources: Neo4j schema migrations run once before serving
+    (see GET /ready) and unacked journaled graph writes are replayed; queued graph writes are
+    flushed, changed retrieval indexes saved and shared vendor clients closed on shutdown.
+    """
+    await memory_schema.bootstrap()
+    await graph_writer.start()
+    yield
+    await memory_schema.shutdown()
+    await graph_writer.close()
+    await retrieval.close()
+    await modulate.close_client()
+    await factcheck_worker.close()
+    await task_poller.close()
+    factcheck_cache.close()
+    await memory.close_driver()
+
 
 app = FastAPI(
     title="VoiceCoach AI",
     description="Adaptive AI interview trainer — Modulate, Yutori, Fastino",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -26,6 +52,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.middleware("http")(session.limit_answer_upload_size)
+
 app.include_router(session.router)
 app.include_router(feedback.router)
 app.include_router(research.router)
@@ -40,3 +68,12 @@ async def root():
 @app.get("/health")
 async def health():
     return {"status": "ok"}
+
+
+@app.get("/ready")
+async def ready():
+    """Readiness: 503 until the Neo4j schema migrations have applied (always ready in stub mode)."""
+    schema = memory_schema.status()
+    if not memory_schema.is_ready():
+        return JSONResponse(status_code=503, content={"status": "starting", "schema": schema})
+    return {"status": "ready", "schema": schema}
@@ -1,7 +1,7 @@
 """Pydantic models for session and answer flow."""
 from enum import Enum
-from typing import Optional
-from pydantic import BaseModel, Field
+from typing import Any, Optional
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class Difficulty(str, Enum):
@@ -50,8 +50,15 @@ class ModulateResult(BaseModel):
     confidence_level: str = "medium"
     confidence_score: float = 0.5
     hesitation_count: int = 0
-    emotion: Optional[dict] = None
+    emotion: Optional[dict] = None  # summary only: model, duration_ms, counts, backend
     deception_score: Optional[float] = None
+    # Per-utterance detail as a services.utterances.UtteranceStore; never serialized into
+    # responses (served by GET /session/{id}/answers/{n}/utterances instead).
+    _utterances: Any = PrivateAttr(default=None)
+
+    @property
+    def utterances(self) -> Any:
+        return self._utterances
 
 
 class FactCheckResult(BaseModel):
@@ -88,3 +95,4 @@ class AnswerResponse(BaseModel):
     voice_coaching_tip: Optional[str] = None  # Modulate-derived hint for judges
     voice_pacing_score: Optional[float] = None  # 0-100 from hesitations + stress
     metrics_source: Optional[str] = None  # "modulate" = real per-answer; "stub" = demo/fallback
+    pipeline_timings: Optional[dict] = None  # { total_ms, critical_path, stages: { name: { start_ms, end_ms, duration_ms } } }
@@ -65,20 +65,9 @@ async def get_session_feedback(session_id: str):
     state = sessions[session_id]
     user_id = state.user_id
 
-    fastino_ctx = await memory.get_user_context(
-        user_id,
-        "Summarize this learner's interview performance: strengths, weak topics, and stress/confidence patterns.",
-    )
-    rag_snippets = await memory.get_rag_context(
-        user_id,
-        [{"role": "user", "content": "Session summary and key takeaways from past answers."}],
-    )
-
-    report = await orchestrator.generate_session_report(
+    report = await orchestrator.get_session_report(
         session_id=session_id,
         user_id=user_id,
-        fastino_context=fastino_ctx,
-        rag_snippets=rag_snippets,
         session_state=state.model_dump(),
     )
     return SessionFeedbackReport(**report)
@@ -1,7 +1,7 @@
 """Sponsor / infra status endpoints for quick live-vs-stub checks."""
 import os
 from fastapi import APIRouter
-from services import memory
+from services import company_brief, factcheck_cache, factcheck_worker, graph_writer, memory, memory_sqlite, modulate, orchestrator, retrieval, task_poller, transcription_cache, voice_events
 
 
 router = APIRouter(prefix="/sponsors", tags=["sponsors"])
@@ -24,9 +24,31 @@ async def sponsor_status():
   )
 
   return {
-    "modulate": {"live": modulate_live},
-    "yutori": {"live": yutori_live},
+    "modulate": {
+      "live": modulate_live,
+      "transcription_cache": transcription_cache.stats(),
+      "voice_events": voice_events.stats(),
+      "prewarm": modulate.prewarm_stats(),
+    },
+    "yutori": {
+      "live": yutori_live,
+      "company_brief_cache": company_brief.stats(),
+      "factcheck_cache": factcheck_cache.stats(),
+      "factcheck_worker": factcheck_worker.stats(),
+      "task_poller": task_poller.stats(),
+    },
     "fastino": {"live": fastino_live, "pioneer_live": pioneer_live},
-    "neo4j": {"live": neo4j_live},
+    "neo4j": {
+      "live": neo4j_live,
+      "graph_writer": graph_writer.stats(),
+      "profile_cache": memory.profile_cache_stats(),
+      "session_graph_cache": memory.session_graph_cache_stats(),
+    },
+    "memory": {
+      "backend": memory.backend(),
+      "sqlite": memory_sqlite.stats(),
+      "retrieval": retrieval.stats(),
+    },
+    "reports": orchestrator.session_report_cache_stats(),
   }
 
@@ -1,7 +1,7 @@
 """Research endpoints: Yutori Browsing company brief."""
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from services import yutori
+from services import company_brief
 
 router = APIRouter(prefix="/research", tags=["research"])
 
@@ -15,16 +15,12 @@ class CompanyBriefRequest(BaseModel):
 @router.post("/company-brief")
 async def post_company_brief(body: CompanyBriefRequest):
     """
-    Run Yutori Browsing to get company/role expectations. Optionally attach to session.
+    Company/role expectations from Yutori Browsing, shared across sessions via the brief cache
+    (services.company_brief). Optionally attach to session.
     Returns expectations, hints, source_urls. If session_id provided, stores summary in session for orchestrator.
     """
-    brief = await yutori.run_company_brief_browsing(body.role, body.company)
-    summary_parts = []
-    if brief["expectations"]:
-        summary_parts.append("Company/role expectations: " + "; ".join(brief["expectations"][:3]))
-    if brief["hints"]:
-        summary_parts.append("Hints for candidates: " + "; ".join(brief["hints"][:3]))
-    summary = " ".join(summary_parts) if summary_parts else None
+    brief = await company_brief.get_company_brief(body.role, body.company)
+    summary = company_brief.summarize_company_brief(brief)
 
     if body.session_id and summary:
         from routers.session import sessions
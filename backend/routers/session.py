@@ -1,7 +1,10 @@
 """Session routes: start session, submit answer, end session, get status."""
+import asyncio
 import logging
+import time
 import uuid
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from models.session import (
     SessionStart,
     SessionStartResponse,
@@ -11,7 +14,7 @@ from models.session import (
     Tone,
 )
 from models.user import SessionState, SessionEndResponse, SessionFeedbackReport
-from services import claims, modulate, yutori, fastino, orchestrator, memory, vision
+from services import claims, company_brief, factcheck_worker, modulate, yutori, fastino, orchestrator, memory, vision, pipeline, utterances, voice_events
 
 logger = logging.getLogger(__name__)
 
@@ -79,32 +82,31 @@ async def start_session(body: SessionStart):
     )
     sessions[session_id] = state
 
-    # Kick off Yutori Browsing in the background so that by the time
-    # we ask the 2nd question, company expectations are available
-    # to the orchestrator via `company_brief`.
-    try:
-        import asyncio
-
-        async def _prime_company_brief() -> None:
-            brief = await yutori.run_company_brief_browsing(body.role, body.company)
-            summary_parts: list[str] = []
-            if brief.get("expectations"):
-                summary_parts.append("Company/role expectations: " + "; ".join(brief["expectations"][:3]))
-            if brief.get("hints"):
-                summary_parts.append("Hints for candidates: " + "; ".join(brief["hints"][:3]))
-            summary = " ".join(summary_parts) if summary_parts else None
-            if not summary:
-                return
-            # Attach to in-memory session state if it still exists.
-            if session_id in sessions:
-                s = sessions[session_id]
-                s.company_brief = summary
-                sessions[session_id] = s
-
-        asyncio.create_task(_prime_company_brief())
-    except Exception:
-        # Background priming failure should never break session start.
-        pass
+    # The company brief is shared across sessions (services.company_brief). On a cache hit it is
+    # attached right away; otherwise Yutori Browsing runs (or is joined) in the background so
+    # that by the time we ask the 2nd question, company expectations are available to the
+    # orchestrator via `company_brief`.
+    cached = company_brief.cached_brief(body.role, body.company)
+    if cached is not None:
+        state.company_brief = company_brief.summarize_company_brief(cached)
+    else:
+        try:
+            async def _prime_company_brief() -> None:
+                summary = company_brief.summarize_company_brief(
+                    await company_brief.get_company_brief(body.role, body.company)
+                )
+                if not summary:
+                    return
+                # Attach to in-memory session state if it still exists.
+                if session_id in sessions:
+                    s = sessions[session_id]
+                    s.company_brief = summary
+                    sessions[session_id] = s
+
+            asyncio.create_task(_prime_company_brief())
+        except Exception:
+            # Background priming failure should never break session start.
+            pass
     return SessionStartResponse(
         session_id=session_id,
         first_question=first_q,
@@ -123,19 +125,10 @@ async def end_session(session_id: str):
     state.ended = True
     sessions[session_id] = state
 
-    fastino_ctx = await memory.get_user_context(
-        state.user_id,
-        "Summarize this learner's interview performance: strengths, weak topics, and stress/confidence patterns.",
-    )
-    rag_snippets = await memory.get_rag_context(
-        state.user_id,
-        [{"role": "user", "content": "Session summary and key takeaways from past answers."}],
-    )
-    report = await orchestrator.generate_session_report(
+    # Memoized per question count; the report flushes pending graph writes before reading answers back.
+    report = await orchestrator.get_session_report(
         session_id=session_id,
         user_id=state.user_id,
-        fastino_context=fastino_ctx,
-        rag_snippets=rag_snippets,
         session_state=state.model_dump(),
     )
     return SessionEndResponse(
@@ -156,6 +149,8 @@ async def get_session_status(session_id: str):
         "question_count": state.question_count,
         "current_question": state.current_question,
         "topics_covered": state.topics_covered,
+        # Background fact-checks finished so far, by question number.
+        "fact_checks": {q: r.model_dump() for q, r in factcheck_worker.results(session_id).items()},
     }
 
 
@@ -182,20 +177,77 @@ async def get_scout_updates(session_id: str):
     return {"updates": updates, "scout_status": "live"}
 
 
+def _graph_etag(version: int, since: int | None) -> str:
+    return f'"g{version}"' if since is None else f'"g{version}-s{since}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in (t[2:] if t.startswith("W/") else t for t in tags)
+
+
 @router.get("/{session_id}/graph")
-async def get_session_graph(session_id: str):
-    """Return Neo4j session subgraph (nodes and edges) for the current session. Shows context graph is working."""
+async def get_session_graph(
+    session_id: str,
+    request: Request,
+    since: int | None = Query(None, ge=0, description="Graph version the client has; return only what was added after it"),
+):
+    """
+    Return Neo4j session subgraph (nodes and edges) for the current session. Shows context graph is working.
+    Carries a monotonically increasing `version`; `since=<version>` returns only added/changed nodes and edges.
+    Responses have an ETag, so polling with If-None-Match gets a 304 (no Neo4j query) while the graph is unchanged.
+    """
     if session_id not in sessions:
         raise HTTPException(status_code=404, detail="Session not found")
-    data = await memory.get_session_graph(session_id)
-    data["neo4j_configured"] = memory.is_neo4j_configured()
+    # The version only moves when a write batch commits, so the 304 check needs no flush; queued
+    # writes show up on a later poll once their batch lands.
+    etag = _graph_etag(memory.session_graph_version(session_id), since)
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    await memory.flush_writes()
+    data = await memory.get_session_graph(session_id, since=since)
+    data["neo4j_configured"] = memory.is_enabled()
+    data["memory_backend"] = memory.backend()
     node_count = len(data.get("nodes") or [])
     logger.info("get_session_graph: session_id=%s nodes=%s neo4j_configured=%s", session_id, node_count, data.get("neo4j_configured"))
-    return data
+    # Tagged with the version the body shows, in case a write committed while it was read.
+    return JSONResponse(content=data, headers={"ETag": _graph_etag(data["version"], since), "Cache-Control": "no-cache"})
+
+
+@router.get("/{session_id}/answers/{question_number}/utterances")
+async def get_answer_utterances(
+    session_id: str,
+    question_number: int,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+):
+    """Raw per-utterance detail for one answer, paginated. Answer responses only carry a summary."""
+    if session_id not in sessions:
+        raise HTTPException(status_code=404, detail="Session not found")
+    store = utterances.get(session_id, question_number)
+    if store is None:
+        raise HTTPException(status_code=404, detail="No utterances stored for this answer")
+    items = store.page(offset, limit)
+    next_offset = offset + len(items)
+    return {
+        "session_id": session_id,
+        "question_number": question_number,
+        "total": len(store),
+        "offset": offset,
+        "limit": limit,
+        "next_offset": next_offset if next_offset < len(store) else None,
+        "items": items,
+    }
+
+
+def _transcript_of(modulate_result: ModulateResult) -> str:
+    return modulate_result.transcript or "(no transcript)"
 
 
 def _deferred_fact_check(claim: str) -> FactCheckResult:
-    """Stub used when fact-check is deferred to session report (avoids per-answer Yutori call)."""
+    """Placeholder returned with the answer; the real check runs in the background (factcheck_worker) for the report."""
     return FactCheckResult(
         claim=claim or "",
         correct=True,
@@ -225,6 +277,7 @@ async def demo_answer(session_id: str = Form(...)):
         hesitation_count=1,
     )
     stub_fact = _deferred_fact_check("Stripe role")
+    factcheck_worker.submit(session_id, q_num, stub_modulate.transcript)
     await memory.ingest_answer(
         user_id=state.user_id,
         session_id=session_id,
@@ -306,86 +359,353 @@ async def analyze_vision(session_id: str, image_base64: str = Form(...)):
     return {"feedback": feedback}
 
 
+@router.post("/{session_id}/prewarm")
+async def prewarm_transcription(session_id: str):
+    """
+    Call when the candidate presses record: opens the Velma-2 streaming socket now so the
+    handshake is off the critical path of the upcoming answer (parked for ~30s).
+    """
+    if session_id not in sessions:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return {"prewarmed": await modulate.prewarm_stream(session_id)}
+
+
+# Max audio per answer (~8 MB), for uploads and live streams alike.
+AUDIO_MAX_BYTES = 8 * 1024 * 1024
+# Multipart framing + form fields on top of the audio part.
+ANSWER_FORM_OVERHEAD_BYTES = 64 * 1024
+
+
+async def limit_answer_upload_size(request: Request, call_next):
+    """
+    HTTP middleware: reject oversized POST /session/answer bodies from Content-Length,
+    before the multipart body is read and spooled.
+    """
+    if request.method == "POST" and request.url.path.endswith("/session/answer"):
+        try:
+            length = int(request.headers.get("content-length") or 0)
+        except ValueError:
+            length = 0
+        if length > AUDIO_MAX_BYTES + ANSWER_FORM_OVERHEAD_BYTES:
+            return JSONResponse(status_code=413, content={"detail": "Audio file too large"})
+    return await call_next(request)
+
+# live_id -> {"session_id", "created", "modulate", "entities"}; consumed by POST /session/answer.
+_live_results: dict[str, dict] = {}
+LIVE_RESULT_TTL_SECONDS = 600
+
+
+def _prune_live_results() -> None:
+    cutoff = time.monotonic() - LIVE_RESULT_TTL_SECONDS
+    for live_id in [k for k, v in _live_results.items() if v["created"] < cutoff]:
+        _live_results.pop(live_id, None)
+
+
+def _dedupe_entities(batches: list[list]) -> list[dict]:
+    seen: set[tuple] = set()
+    out: list[dict] = []
+    for batch in batches:
+        for ent in batch or []:
+            if not isinstance(ent, dict):
+                continue
+            key = (ent.get("label"), ent.get("text"))
+            if key not in seen:
+                seen.add(key)
+                out.append(ent)
+    return out
+
+
+def _voice_event(kind: str, question_number: int, result: ModulateResult, session_state: dict) -> dict:
+    """SSE payload for one voice result, with the tone the orchestrator would pick for it."""
+    tone, difficulty_delta = orchestrator.select_tone(result.stress_score, result.confidence_score, session_state)
+    return {
+        "type": kind,
+        "question_number": question_number,
+        "tone": tone.value,
+        "difficulty_delta": difficulty_delta,
+        "modulate": result.model_dump(),
+    }
+
+
+def _partial_publisher(session_id: str, state: SessionState):
+    """on_partial callback for modulate: push running stress/confidence to voice-stream subscribers."""
+    session_state = state.model_dump()
+    question_number = state.question_count
+
+    def on_partial(partial: ModulateResult) -> None:
+        voice_events.publish(session_id, _voice_event("partial", question_number, partial, session_state))
+
+    return on_partial
+
+
+@router.get("/{session_id}/voice-stream")
+async def voice_stream(session_id: str, request: Request):
+    """
+    Server-sent events for the session's voice analysis: `partial` after each streamed
+    utterance (running stress/confidence, transcript so far, pre-selected tone),
+    `transcribed` when the final transcript lands and `final` once the next question is chosen.
+    """
+    if session_id not in sessions:
+        raise HTTPException(status_code=404, detail="Session not found")
+    queue = voice_events.subscribe(session_id)
+
+    async def events():
+        try:
+            yield "retry: 2000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=voice_events.KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield voice_events.format_sse(event)
+        finally:
+            voice_events.unsubscribe(session_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/{session_id}/live")
+async def live_answer(websocket: WebSocket, session_id: str):
+    """
+    Live audio relay: the browser sends binary audio chunks while the candidate is speaking;
+    they are forwarded straight into the Velma-2 streaming socket. Each finished utterance is
+    echoed back ({"type": "utterance"}) and its entities extracted right away, so when the
+    client sends an empty text frame (end of audio) only the tail remains. The final
+    {"type": "ready", "live_id": ...} message carries the transcript; POST /session/answer
+    with that live_id (instead of an audio file) then only runs the enrich/orchestrate stages.
+    """
+    if session_id not in sessions:
+        await websocket.close(code=4404)
+        return
+    await websocket.accept()
+    state = sessions[session_id]
+    schema = fastino.default_gliner_schema(getattr(state, "role", None))
+    ner_tasks: list[asyncio.Task] = []
+
+    async def on_utterance(u: dict) -> None:
+        text = str(u.get("text") or "").strip()
+        if text:
+            ner_tasks.append(asyncio.create_task(fastino.extract_competencies(text, schema=schema)))
+        await websocket.send_json({"type": "utterance", "utterance": u})
+
+    live = modulate.LiveTranscription(
+        {"prewarm_key": session_id},
+        on_utterance=on_utterance,
+        max_bytes=AUDIO_MAX_BYTES,
+        on_partial=_partial_publisher(session_id, state),
+    )
+    await live.start()
+    try:
+        while True:
+            msg = await websocket.receive()
+            if msg.get("type") == "websocket.disconnect":
+                raise WebSocketDisconnect(code=msg.get("code", 1000))
+            if msg.get("bytes"):
+                await live.send(msg["bytes"])
+            elif msg.get("text") is not None and msg["text"].strip() in ("", '{"type": "end"}', '{"type":"end"}'):
+                break
+        modulate_result = await live.finish()
+        transcript = _transcript_of(modulate_result)
+        if not live.utterances:
+            # Fallback transcription (relay unavailable): extract entities on the full transcript.
+            ner_tasks.append(asyncio.create_task(fastino.extract_competencies(transcript, schema=schema)))
+        entities = _dedupe_entities(await asyncio.gather(*ner_tasks))
+        _prune_live_results()
+        live_id = f"live_{uuid.uuid4().hex[:12]}"
+        _live_results[live_id] = {
+            "session_id": session_id,
+            "created": time.monotonic(),
+            "modulate": modulate_result,
+            "entities": entities,
+        }
+        logger.info(
+            "live_answer: session_id=%s live_id=%s bytes=%d utterances=%d relayed=%s",
+            session_id,
+            live_id,
+            live.bytes_received,
+            len(live.utterances),
+            live.relaying,
+        )
+        await websocket.send_json({
+            "type": "ready",
+            "live_id": live_id,
+            "transcript": transcript,
+            "modulate_summary": modulate_result.model_dump(),
+            "extracted_entities": entities,
+        })
+        await websocket.close()
+    except WebSocketDisconnect:
+        logger.info("live_answer: client disconnected; session_id=%s", session_id)
+    except ValueError as exc:
+        await websocket.send_json({"type": "error", "error": str(exc)})
+        await websocket.close(code=1009)
+    finally:
+        await live.aclose()
+        for t in ner_tasks:
+            if not t.done():
+                t.cancel()
+
+
 @router.post("/answer", response_model=AnswerResponse)
 async def submit_answer(
     session_id: str = Form(...),
     current_question: str = Form(""),
     duration_seconds: int = Form(0),
-    audio: UploadFile = File(...),
+    audio: UploadFile | None = File(None),
+    live_id: str = Form(""),
 ):
     """
-    Submit audio answer. Runs Modulate -> Fastino ingest -> Orchestrator. Fact-check deferred to session report.
-    Returns next question, feedback, and emotion summary.
+    Submit audio answer. Runs Modulate -> NER / Neo4j ingest -> Orchestrator as a dependency
+    graph (see services/pipeline.py) so independent stages overlap. The fact-check runs in the background
+    (services/factcheck_worker.py) and is reported at session end.
+    Returns next question, feedback, emotion summary and per-stage timings.
+    Send either `audio` or the `live_id` returned by the /{session_id}/live relay.
     """
     if session_id not in sessions:
         raise HTTPException(status_code=404, detail="Session not found")
     state = sessions[session_id]
 
-    audio_bytes = await audio.read()
-    if not audio_bytes:
-        raise HTTPException(status_code=400, detail="No audio data")
-    # Basic safeguard: reject very large uploads (~8 MB+)
-    if len(audio_bytes) > 8 * 1024 * 1024:
-        raise HTTPException(status_code=400, detail="Audio file too large")
-
-    modulate_result = await modulate.analyze_voice(audio_bytes, {})
-    transcript = modulate_result.transcript or "(no transcript)"
-
-    claim = claims.extract_claim_simple(transcript)
-    yutori_result = _deferred_fact_check(claim)
+    live = _live_results.pop(live_id, None) if live_id else None
+    if live_id and (live is None or live["session_id"] != session_id):
+        raise HTTPException(status_code=404, detail="Live answer not found")
+    source: modulate.AudioSource | None = None
+    if live is None:
+        if audio is None:
+            raise HTTPException(status_code=400, detail="No audio data")
+        # Stream from the spooled upload instead of audio.read(): peak memory per answer is one
+        # chunk. The size is known from the spooled file; the running count in AudioSource is a
+        # backstop (the Content-Length middleware rejects oversized bodies before parsing).
+        source = modulate.AudioSource.from_upload(audio, max_bytes=AUDIO_MAX_BYTES)
+        if not source.size:
+            raise HTTPException(status_code=400, detail="No audio data")
+        # Basic safeguard: reject very large uploads (~8 MB+)
+        if source.size > AUDIO_MAX_BYTES:
+            raise HTTPException(status_code=400, detail="Audio file too large")
 
     schema = fastino.default_gliner_schema(getattr(state, "role", None))
-    entities = await fastino.extract_competencies(transcript, schema=schema)
+    company_brief = getattr(state, "company_brief", None) or state.model_dump().get("company_brief")
+    question_number = state.question_count
+    session_state = state.model_dump()
+
+    async def _transcribe(_: dict) -> ModulateResult:
+        if live is not None:
+            result = live["modulate"]
+        else:
+            result = await modulate.analyze_voice(
+                source,
+                {"prewarm_key": session_id, "on_partial": _partial_publisher(session_id, state)},
+            )
+        voice_events.publish(session_id, _voice_event("transcribed", question_number, result, session_state))
+        return result
+
+    async def _fact_check(r: dict) -> FactCheckResult:
+        # Verified in the background from here on; the report only awaits what is still running.
+        transcript = _transcript_of(r["transcribe"])
+        factcheck_worker.submit(session_id, question_number, transcript)
+        return _deferred_fact_check(claims.extract_claim_simple(transcript))
+
+    async def _entities(r: dict) -> list:
+        if live is not None:
+            return live["entities"]
+        return await fastino.extract_competencies(_transcript_of(r["transcribe"]), schema=schema)
+
+    async def _ingest_answer(r: dict) -> None:
+        modulate_result: ModulateResult = r["transcribe"]
+        await memory.ingest_answer(
+            user_id=state.user_id,
+            session_id=session_id,
+            role=state.role,
+            company=state.company,
+            question_number=question_number,
+            question=state.current_question,
+            transcript=_transcript_of(modulate_result),
+            duration_seconds=duration_seconds or 30,
+            stress=modulate_result.stress_score,
+            confidence=modulate_result.confidence_score,
+            yutori_correct=r["fact_check"].correct,
+            extracted_entities=r["entities"],
+        )
 
-    await memory.ingest_answer(
-        user_id=state.user_id,
-        session_id=session_id,
-        role=state.role,
-        company=state.company,
-        question_number=state.question_count,
-        question=state.current_question,
-        transcript=transcript,
-        duration_seconds=duration_seconds or 30,
-        stress=modulate_result.stress_score,
-        confidence=modulate_result.confidence_score,
-        yutori_correct=yutori_result.correct,
-        extracted_entities=entities,
-    )
+    async def _profile(_: dict) -> memory.ProfileContext:
+        return await memory.load_profile_context(state.user_id)
+
+    async def _rag(r: dict) -> list[str]:
+        # Past answers most relevant to this question and answer (the answer itself is excluded).
+        return await memory.get_rag_context(
+            state.user_id,
+            [
+                {"role": "assistant", "content": state.current_question},
+                {"role": "user", "content": _transcript_of(r["transcribe"])},
+            ],
+        )
 
-    fastino_ctx = await memory.get_user_context(
-        state.user_id,
-        "What behavioral or technical topics has this user struggled with?",
-    )
-    rag_snippets = await memory.get_rag_context(
-        state.user_id,
-        [{"role": "user", "content": "Generate next interview question."}],
-    )
+    async def _orchestrate(r: dict):
+        return await orchestrator.generate_next_question(
+            current_question=state.current_question,
+            transcript=_transcript_of(r["transcribe"]),
+            modulate=r["transcribe"],
+            yutori=r["fact_check"],
+            fastino_context=r["profile"].summary,
+            rag_snippets=r["rag"],
+            session_state=session_state,
+            company_brief=company_brief,
+            profile=r["profile"],
+        )
 
-    company_brief = getattr(state, "company_brief", None) or state.model_dump().get("company_brief")
-    orch_response = await orchestrator.generate_next_question(
-        current_question=state.current_question,
-        transcript=transcript,
-        modulate=modulate_result,
-        yutori=yutori_result,
-        fastino_context=fastino_ctx,
-        rag_snippets=rag_snippets,
-        session_state=state.model_dump(),
-        company_brief=company_brief,
-    )
+    async def _ingest_decision(r: dict) -> None:
+        modulate_result: ModulateResult = r["transcribe"]
+        orch = r["orchestrate"]
+        await memory.ingest_decision(
+            user_id=state.user_id,
+            session_id=session_id,
+            question_number=question_number,
+            tone=str(orch.tone),
+            difficulty_delta=int(orch.difficulty_delta or 0),
+            next_question=orch.next_question,
+            feedback_note=orch.feedback_note,
+            reasoning=getattr(orch, "reasoning", None),
+            stress=modulate_result.stress_score,
+            confidence=modulate_result.confidence_score,
+            yutori_correct=r["fact_check"].correct,
+        )
 
-    await memory.ingest_decision(
-        user_id=state.user_id,
-        session_id=session_id,
-        question_number=state.question_count,
-        tone=str(orch_response.tone),
-        difficulty_delta=int(orch_response.difficulty_delta or 0),
-        next_question=orch_response.next_question,
-        feedback_note=orch_response.feedback_note,
-        reasoning=getattr(orch_response, "reasoning", None),
-        stress=modulate_result.stress_score,
-        confidence=modulate_result.confidence_score,
-        yutori_correct=yutori_result.correct,
-    )
+    # The profile read (one Neo4j round trip) doesn't need the transcript, so it overlaps with transcription;
+    # NER, fact-check stub and the RAG search (in-process index) start as soon as the transcript lands. The decision
+    # write waits for the answer write because it links to the Answer node.
+    try:
+        run = await pipeline.run_pipeline(
+            [
+                pipeline.Stage("transcribe", _transcribe),
+                pipeline.Stage("profile", _profile),
+                pipeline.Stage("fact_check", _fact_check, deps=("transcribe",)),
+                pipeline.Stage("entities", _entities, deps=("transcribe",)),
+                pipeline.Stage("ingest_answer", _ingest_answer, deps=("transcribe", "fact_check", "entities")),
+                pipeline.Stage("rag", _rag, deps=("transcribe", "profile")),
+                pipeline.Stage("orchestrate", _orchestrate, deps=("transcribe", "fact_check", "profile", "rag")),
+                pipeline.Stage("ingest_decision", _ingest_decision, deps=("orchestrate", "ingest_answer")),
+            ],
+            label=f"submit_answer[{session_id}:q{question_number}]",
+        )
+    except modulate.AudioTooLarge:
+        raise HTTPException(status_code=400, detail="Audio file too large")
+    modulate_result: ModulateResult = run.results["transcribe"]
+    transcript = _transcript_of(modulate_result)
+    yutori_result: FactCheckResult = run.results["fact_check"]
+    entities: list = run.results["entities"]
+    orch_response = run.results["orchestrate"]
+    utterances.save(session_id, question_number, modulate_result.utterances)
+    voice_events.publish(session_id, {
+        "type": "final",
+        "question_number": question_number,
+        "tone": orch_response.tone.value,
+        "next_question": orch_response.next_question,
+        "modulate": modulate_result.model_dump(),
+    })
 
     state.question_count += 1
     state.current_question = orch_response.next_question
@@ -418,4 +738,5 @@ async def submit_answer(
         voice_coaching_tip=voice_tip,
         voice_pacing_score=pacing_score,
         metrics_source="modulate",
+        pipeline_timings=run.summary(),
     )
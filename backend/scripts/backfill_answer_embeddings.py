@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Backfill Answer.embedding (the vector RAG search scores against) for
+answers written before embeddings were stored. Neo4j only; the SQLite backend indexes in-process.
+Run from backend dir with NEO4J_URI / NEO4J_USERNAME / NEO4J_PASSWORD set (e.g. in .env):
+  cd backend && python scripts/backfill_answer_embeddings.py
+  python scripts/backfill_answer_embeddings.py --batch 200
+Safe to re-run: only answers without an embedding are read, in answer_id order.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+backend = Path(__file__).resolve().parent.parent
+if str(backend) not in sys.path:
+    sys.path.insert(0, str(backend))
+
+# Load .env if present
+try:
+    from dotenv import load_dotenv
+    load_dotenv(backend / ".env")
+except ImportError:
+    pass
+
+_PENDING = """
+MATCH (a:Answer)
+WHERE a.answer_id > $after AND a.embedding IS NULL
+RETURN a.answer_id AS answer_id, a.transcript AS transcript
+ORDER BY a.answer_id
+LIMIT $batch
+"""
+
+_SET_EMBEDDINGS = """
+UNWIND $rows AS row
+MATCH (a:Answer {answer_id: row.answer_id})
+SET a.embedding = row.embedding
+"""
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch", type=int, default=500, help="Answers per transaction")
+    args = parser.parse_args()
+
+    os.environ["MEMORY_BACKEND"] = "neo4j"
+    from services import memory
+
+    if not memory.is_neo4j_configured():
+        print("Neo4j is not configured. Set NEO4J_URI / NEO4J_USERNAME / NEO4J_PASSWORD.")
+        sys.exit(1)
+    driver = memory._get_driver()
+    after, written, skipped = "", 0, 0
+    t0 = time.perf_counter()
+    try:
+        async with driver.session(database=memory._env("NEO4J_DATABASE")) as session:
+            while True:
+                res = await session.run(_PENDING, after=after, batch=max(1, args.batch))
+                pending = await res.data()
+                if not pending:
+                    break
+                after = pending[-1]["answer_id"]
+
+                async def _tx(tx, rows: list[dict]) -> None:
+                    await (await tx.run(_SET_EMBEDDINGS, rows=rows)).consume()
+
+                def _rows() -> list[dict]:
+                    rows = [{"answer_id": r["answer_id"], "embedding": memory._embedding_param(r["transcript"])} for r in pending]
+                    return [r for r in rows if r["embedding"] is not None]
+
+                rows = _rows()
+                # Empty transcripts have nothing to embed; they stay without one.
+                skipped += len(pending) - len(rows)
+                if rows:
+                    await memory._execute_write_with_embeddings(session, _tx, _rows)
+                    written += len(rows)
+                print(f"  {written} embedded, {skipped} skipped (up to {after})")
+        print(f"Done in {time.perf_counter() - t0:.1f}s.")
+    finally:
+        await memory.close_driver()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
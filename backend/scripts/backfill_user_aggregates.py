@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Backfill the running per-user aggregates (answer count, stress/confidence sums and sums of
+squares, per-label entity counters) for users ingested before they were maintained at write time.
+Run from backend dir with NEO4J_URI / NEO4J_USERNAME / NEO4J_PASSWORD set (e.g. in .env), or
+MEMORY_BACKEND=sqlite for the embedded store:
+  cd backend && python scripts/backfill_user_aggregates.py            # users without aggregates
+  python scripts/backfill_user_aggregates.py --all                    # recompute every user
+  python scripts/backfill_user_aggregates.py --user alice --user bob
+Safe to re-run: each user's aggregates are recomputed from their history in one transaction.
+Users that are read before being backfilled are backfilled on first read as well.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+backend = Path(__file__).resolve().parent.parent
+if str(backend) not in sys.path:
+    sys.path.insert(0, str(backend))
+
+# Load .env if present
+try:
+    from dotenv import load_dotenv
+    load_dotenv(backend / ".env")
+except ImportError:
+    pass
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--user", action="append", default=[], help="Backfill only this user (repeatable)")
+    parser.add_argument("--all", action="store_true", help="Recompute every user, not only stale ones")
+    args = parser.parse_args()
+
+    from services import memory
+
+    if not memory.is_enabled():
+        print("No memory backend. Set NEO4J_URI / NEO4J_USERNAME / NEO4J_PASSWORD or MEMORY_BACKEND=sqlite.")
+        sys.exit(1)
+    try:
+        user_ids = args.user or await memory.list_user_ids(only_stale=not args.all)
+        print(f"Backfilling aggregates for {len(user_ids)} user(s)…")
+        t0 = time.perf_counter()
+        for i, user_id in enumerate(user_ids, 1):
+            n = await memory.backfill_user_aggregates(user_id)
+            print(f"  [{i}/{len(user_ids)}] {user_id}: {n if n is not None else 'not found'} answers")
+        print(f"Done in {time.perf_counter() - t0:.1f}s.")
+    finally:
+        await memory.close_driver()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark the graph-write journal (services.graph_journal): append throughput with batched
+fsync, replay throughput after a simulated Neo4j outage, and compaction.
+
+  cd backend && python scripts/bench_graph_journal.py
+  python scripts/bench_graph_journal.py --rows 50000 --write-ms 20 --batch-size 200
+  python scripts/bench_graph_journal.py --neo4j      # replay into the configured Neo4j
+
+Without --neo4j, each replayed batch costs --write-ms (a stand-in for one UNWIND transaction),
+so the numbers isolate journal overhead plus batching. The journal lives in a temp directory.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+backend = Path(__file__).resolve().parent.parent
+if str(backend) not in sys.path:
+    sys.path.insert(0, str(backend))
+
+from services.graph_journal import GraphJournal
+from services.graph_writer import GraphWriter
+
+
+def _answer_row(i: int) -> dict:
+    session_id = f"bench_{i // 10}"
+    return {
+        "user_id": "bench_user",
+        "session_id": session_id,
+        "role": "Backend Engineer",
+        "company": "Acme",
+        "answer_id": f"{session_id}:q{i % 10 + 1}",
+        "question_number": i % 10 + 1,
+        "question": "Tell me about a system you scaled.",
+        "transcript": "We moved the ingest path to a queue and cut p99 latency by half. " * 4,
+        "duration_seconds": 45,
+        "stress": 0.3,
+        "confidence": 0.7,
+        "yutori_correct": True,
+        "entities": [{"label": "skill", "text": "queueing"}, {"label": "metric", "text": "p99 latency"}],
+        "now": "2026-01-01T00:00:00+00:00",
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--fsync-ms", type=int, default=100)
+    parser.add_argument("--write-ms", type=float, default=5.0, help="Simulated cost per UNWIND batch")
+    parser.add_argument("--neo4j", action="store_true", help="Replay into the configured Neo4j instead")
+    args = parser.parse_args()
+
+    write_batch = None
+    if args.neo4j:
+        from services import memory
+
+        if not memory.is_neo4j_configured():
+            sys.exit("--neo4j needs NEO4J_URI / NEO4J_USERNAME / NEO4J_PASSWORD")
+        write_batch = memory.write_batch
+    else:
+        async def write_batch(answers: list[dict], decisions: list[dict]) -> None:
+            await asyncio.sleep(args.write_ms / 1000.0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "graph_journal.jsonl"
+
+        # 1. Append during an "outage": nothing is acked.
+        journal = GraphJournal(path, fsync_ms=args.fsync_ms)
+        journal.open()
+        journal.start_sync()
+        t0 = time.perf_counter()
+        for i in range(args.rows):
+            journal.append("answer", _answer_row(i))
+            if i % 500 == 0:
+                await asyncio.sleep(0)  # let the fsync loop run, as it would between requests
+        append_s = time.perf_counter() - t0
+        t1 = time.perf_counter()
+        await journal.close()
+        close_s = time.perf_counter() - t1
+        size = path.stat().st_size
+        print(
+            f"append   {args.rows:>7} rows  {args.rows / append_s:>10.0f} rows/s  "
+            f"({append_s * 1e6 / args.rows:.1f} us/row, {journal.fsyncs} fsyncs, final sync {close_s * 1000:.0f} ms, "
+            f"{size / 1024 / 1024:.1f} MiB)"
+        )
+
+        # 2. Restart: load unacked rows and replay them.
+        journal = GraphJournal(path, fsync_ms=args.fsync_ms)
+        writer = GraphWriter(batch_size=args.batch_size, journal=journal, write_batch=write_batch)
+        t0 = time.perf_counter()
+        await writer.start()
+        load_s = time.perf_counter() - t0
+        t1 = time.perf_counter()
+        replayed = await writer.replay_deferred()
+        replay_s = time.perf_counter() - t1
+        print(
+            f"replay   {replayed:>7} rows  {replayed / replay_s if replay_s else 0:>10.0f} rows/s  "
+            f"(load {load_s * 1000:.0f} ms, {-(-replayed // args.batch_size)} batches of {args.batch_size})"
+        )
+
+        # 3. Compaction: everything is acked, so the rewrite leaves an empty journal.
+        before = path.stat().st_size
+        t0 = time.perf_counter()
+        await journal.compact()
+        compact_s = time.perf_counter() - t0
+        print(
+            f"compact  {before / 1024 / 1024:>7.1f} MiB -> {path.stat().st_size} bytes in {compact_s * 1000:.0f} ms"
+        )
+        await writer.close()
+
+        # 4. Idempotency: a second restart has nothing left to replay.
+        journal = GraphJournal(path)
+        print(f"restart  {len(journal.open())} rows pending after replay")
+        await journal.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark time-to-transcript for the Modulate streaming send modes (realtime / burst / adaptive).
+
+Starts the local Velma-2 stand-in (scripts/velma_standin.py; no API key or network needed),
+points services.modulate at it and streams synthetic recordings of several lengths:
+  cd backend && python scripts/bench_modulate_send.py
+  python scripts/bench_modulate_send.py --lengths 5,30,60 --modes burst,adaptive
+Recording size assumes the quickstart's nominal 4000 bytes per second of audio.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+backend = Path(__file__).resolve().parent.parent
+if str(backend) not in sys.path:
+    sys.path.insert(0, str(backend))
+scripts = Path(__file__).resolve().parent
+if str(scripts) not in sys.path:
+    sys.path.insert(0, str(scripts))
+
+import velma_standin
+
+BYTES_PER_SECOND = 4000
+# Stand-in "transcribes" this many times faster than realtime.
+SERVER_SPEEDUP = 50.0
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lengths", default="5,15,30", help="Recording lengths in seconds (comma separated)")
+    parser.add_argument("--modes", default="burst,adaptive,realtime", help="Send modes to compare")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    cfg = velma_standin.StandinConfig(
+        latency_ms=0.0,
+        speedup=SERVER_SPEEDUP,
+        bytes_per_second=BYTES_PER_SECOND,
+        emotions=("Confident",),
+    )
+    runner = await velma_standin.start(cfg, port=args.port)
+
+    os.environ["MODULATE_API_KEY"] = "bench"
+    os.environ["MODULATE_STREAMING_URL"] = f"ws://127.0.0.1:{args.port}/api/velma-2-stt-streaming"
+    from services import modulate
+
+    lengths = [int(x) for x in args.lengths.split(",") if x.strip()]
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    print(f"{'seconds':>8} {'bytes':>9} " + " ".join(f"{m + '_ms':>12}" for m in modes))
+    try:
+        for seconds in lengths:
+            audio = os.urandom(seconds * BYTES_PER_SECOND)
+            row = []
+            for mode in modes:
+                t0 = time.perf_counter()
+                result = await modulate.analyze_voice(audio, {"send_mode": mode, "cache": False})
+                elapsed = (time.perf_counter() - t0) * 1000
+                if "[Stub]" in result.transcript:
+                    row.append(f"{'failed':>12}")
+                else:
+                    row.append(f"{elapsed:>12.0f}")
+            print(f"{seconds:>8} {len(audio):>9} " + " ".join(row))
+    finally:
+        await modulate.close_client()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Time-to-transcript and memory benchmark for services.modulate.analyze_voice, driven through
+the local Velma-2 stand-in (scripts/velma_standin.py) at several concurrency levels:
+
+  cd backend && python scripts/bench_transcription.py
+  python scripts/bench_transcription.py --concurrency 1,10,100 --seconds 20 --backend batch
+  python scripts/bench_transcription.py --backend vfast     # transcript-only, .opus upload
+  python scripts/bench_transcription.py --standin-url http://127.0.0.1:8790   # external stand-in
+
+Each level runs `--rounds` waves of N concurrent answers (distinct random audio, transcription
+cache bypassed) and reports p50/p95/p99 latency plus tracemalloc peak per in-flight request.
+With the embedded stand-in its allocations are included in the memory column; use
+--standin-url with a separately started stand-in for client-only memory numbers.
+"""
+import argparse
+import asyncio
+import logging
+import math
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+backend = Path(__file__).resolve().parent.parent
+if str(backend) not in sys.path:
+    sys.path.insert(0, str(backend))
+scripts = Path(__file__).resolve().parent
+if str(scripts) not in sys.path:
+    sys.path.insert(0, str(scripts))
+
+import velma_standin
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return float("nan")
+    rank = max(1, min(len(sorted_values), math.ceil(pct / 100.0 * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+
+async def _one(modulate, audio: bytes, ctx: dict) -> tuple[float, bool]:
+    t0 = time.perf_counter()
+    result = await modulate.analyze_voice(audio, ctx)
+    return (time.perf_counter() - t0) * 1000, not result.transcript.startswith("[Stub]")
+
+
+async def _level(modulate, concurrency: int, rounds: int, audio_bytes: int, ctx: dict) -> dict:
+    latencies: list[float] = []
+    failures = 0
+    peak_per_request: list[float] = []
+    for _ in range(rounds):
+        audios = [os.urandom(audio_bytes) for _ in range(concurrency)]
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        results = await asyncio.gather(*(_one(modulate, a, ctx) for a in audios))
+        _, peak = tracemalloc.get_traced_memory()
+        peak_per_request.append((peak - base) / concurrency)
+        del audios
+        for ms, ok in results:
+            latencies.append(ms)
+            failures += 0 if ok else 1
+    latencies.sort()
+    return {
+        "n": len(latencies),
+        "failed": failures,
+        "p50": _percentile(latencies, 50),
+        "p95": _percentile(latencies, 95),
+        "p99": _percentile(latencies, 99),
+        "kib_per_req": max(peak_per_request) / 1024,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", default="1,10,100", help="Concurrent answers per level (comma separated)")
+    parser.add_argument("--rounds", type=int, default=3, help="Waves per concurrency level")
+    parser.add_argument("--seconds", type=int, default=15, help="Audio length per answer")
+    parser.add_argument(
+        "--backend", default="streaming",
+        help="streaming | batch | vfast (uploads answer.opus, no emotion) | auto (router decides)",
+    )
+    parser.add_argument("--send-mode", default=None, help="Streaming send mode (default: MODULATE_SEND_MODE/burst)")
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="Embedded stand-in: delay per utterance")
+    parser.add_argument("--speedup", type=float, default=50.0, help="Embedded stand-in: audio processing speedup")
+    parser.add_argument("--port", type=int, default=8791)
+    parser.add_argument("--standin-url", default=None, help="Use an already running stand-in instead")
+    parser.add_argument("--verbose", action="store_true", help="Show fallback/retry warnings from services")
+    args = parser.parse_args()
+    # Injected failures would otherwise interleave tracebacks with the table.
+    logging.basicConfig(level=logging.WARNING if args.verbose else logging.CRITICAL)
+
+    runner = None
+    if args.standin_url:
+        base_url = args.standin_url.rstrip("/")
+    else:
+        cfg = velma_standin.StandinConfig(latency_ms=args.latency_ms, speedup=args.speedup, seed=1)
+        runner = await velma_standin.start(cfg, port=args.port)
+        base_url = f"http://127.0.0.1:{args.port}"
+
+    os.environ["MODULATE_API_KEY"] = os.getenv("MODULATE_BENCH_API_KEY") or "bench"
+    os.environ["MODULATE_BASE_URL"] = base_url
+    for name in ("MODULATE_STREAMING_URL", "MODULATE_BATCH_URL", "MODULATE_VFAST_URL"):
+        os.environ.pop(name, None)
+    from services import modulate
+
+    ctx: dict = {"cache": False}
+    if args.backend != "auto":
+        ctx["backend"] = args.backend
+    if args.backend == "vfast":
+        ctx["filename"] = "answer.opus"  # vfast rejects anything but .opus uploads
+    if args.send_mode:
+        ctx["send_mode"] = args.send_mode
+    audio_bytes = args.seconds * velma_standin.StandinConfig.bytes_per_second
+    levels = [int(x) for x in args.concurrency.split(",") if x.strip()]
+
+    print(f"backend={args.backend} audio={args.seconds}s ({audio_bytes} bytes) stand-in={base_url}")
+    print(f"{'conc':>5} {'n':>5} {'failed':>6} {'p50_ms':>8} {'p95_ms':>8} {'p99_ms':>8} {'KiB/req':>9}")
+    tracemalloc.start()
+    try:
+        # Warm the shared client (TLS context, connector) outside the measurements.
+        await _one(modulate, os.urandom(audio_bytes), ctx)
+        for n in levels:
+            r = await _level(modulate, n, args.rounds, audio_bytes, ctx)
+            print(
+                f"{n:>5} {r['n']:>5} {r['failed']:>6} {r['p50']:>8.0f} {r['p95']:>8.0f} "
+                f"{r['p99']:>8.0f} {r['kib_per_req']:>9.1f}"
+            )
+    finally:
+        tracemalloc.stop()
+        await modulate.close_client()
+        if runner is not None:
+            await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
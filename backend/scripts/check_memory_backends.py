@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Conformance check for the services.memory backends. The same scenario runs through the public
+memory API (register, ingest through the write-behind queue, replay, backfill, profile, session
+graph, transcripts, RAG context) on each backend. Each run is checked against expected values, and the
+backends are compared with each other.
+
+  cd backend && python scripts/check_memory_backends.py                  # sqlite (+ neo4j if configured)
+  python scripts/check_memory_backends.py --backends sqlite
+  python scripts/check_memory_backends.py --backends sqlite,neo4j --keep  # leave the Neo4j data
+
+SQLite runs on a temporary database file. Neo4j runs against NEO4J_URI (from the env or .env)
+with ids prefixed "conformance_", which are deleted afterwards unless --keep is given.
+"""
+import argparse
+import asyncio
+import math
+import os
+import sys
+import tempfile
+import uuid
+from pathlib import Path
+
+backend = Path(__file__).resolve().parent.parent
+if str(backend) not in sys.path:
+    sys.path.insert(0, str(backend))
+
+# Load .env if present
+try:
+    from dotenv import load_dotenv
+    load_dotenv(backend / ".env")
+except ImportError:
+    pass
+
+# Keep the scenario's rows out of the real graph-write journal and retrieval indexes.
+os.environ["GRAPH_JOURNAL_PATH"] = "off"
+os.environ["RETRIEVAL_INDEX_DIR"] = "off"
+
+ANSWERS = [
+    # (session, question_number, transcript, stress, confidence, entities)
+    ("a", 1, "I led the migration to Postgres.", 0.2, 0.8, [("TECHNICAL_SKILL", "postgres"), ("SOFT_SKILL", "leadership")]),
+    ("a", 2, "We cut p99 latency by 40 percent.", 0.4, 0.6, [("IMPACT", "p99 latency"), ("TECHNICAL_SKILL", "postgres")]),
+    ("a", 3, "", 0.6, None, []),
+    ("b", 1, "I mentored two new engineers.", None, 0.9, [("SOFT_SKILL", "mentoring"), ("SOFT_SKILL", "leadership")]),
+]
+
+
+def _expected() -> dict:
+    n = len(ANSWERS)
+    stress = [s or 0.0 for _, _, _, s, _, _ in ANSWERS]
+    conf = [c or 0.0 for _, _, _, _, c, _ in ANSWERS]
+    labels: dict[str, int] = {}
+    for *_, ents in ANSWERS:
+        for label, _ in ents:
+            labels[label] = labels.get(label, 0) + 1
+
+    def _mean_std(xs):
+        mean = sum(xs) / n
+        return mean, math.sqrt(max(0.0, sum(x * x for x in xs) / n - mean * mean))
+
+    return {
+        "answer_count": n,
+        "stress": _mean_std(stress),
+        "confidence": _mean_std(conf),
+        "label_counts": dict(sorted(labels.items(), key=lambda kv: (-kv[1], kv[0]))),
+        # Most recent first; the empty transcript is skipped.
+        "recent": [t for _, _, t, *_ in reversed(ANSWERS) if t],
+        "transcripts_a": [t for s, _, t, *_ in ANSWERS if s == "a" and t],
+    }
+
+
+async def _scenario(memory, run_id: str) -> dict:
+    user_id = f"conformance_{run_id}"
+    sessions = {name: f"{user_id}_{name}" for name in ("a", "b")}
+    await memory.register_user(user_id, {"role": "Backend Engineer", "target_company": "Acme", "level": "mid"})
+    for session, q, transcript, stress, conf, ents in ANSWERS:
+        await memory.ingest_answer(
+            user_id=user_id,
+            session_id=sessions[session],
+            role="Backend Engineer",
+            company="Acme",
+            question_number=q,
+            question=f"Question {q}",
+            transcript=transcript,
+            duration_seconds=30,
+            stress=stress,
+            confidence=conf,
+            yutori_correct=True,
+            extracted_entities=[{"label": label, "text": text} for label, text in ents],
+        )
+        await memory.ingest_decision(
+            user_id=user_id,
+            session_id=sessions[session],
+            question_number=q,
+            tone="neutral",
+            difficulty_delta=0,
+            next_question=f"Follow-up to {q}",
+            feedback_note="ok",
+            reasoning=None,
+            stress=stress,
+            confidence=conf,
+            yutori_correct=True,
+        )
+        # Distinct created_at values, so "most recent" is well defined on every backend.
+        await asyncio.sleep(0.002)
+    assert await memory.flush_writes(timeout=30), "flush_writes timed out"
+    out: dict = {"user_id": user_id}
+    profile = await memory.load_profile_context(user_id)
+    out["profile"] = profile
+
+    # Journal replay / re-ingest of an answer must not double count.
+    session, q, transcript, stress, conf, ents = ANSWERS[0]
+    await memory.ingest_answer(
+        user_id=user_id, session_id=sessions[session], role="Backend Engineer", company="Acme",
+        question_number=q, question=f"Question {q}", transcript=transcript, duration_seconds=30,
+        stress=stress, confidence=conf, yutori_correct=True,
+        extracted_entities=[{"label": label, "text": text} for label, text in ents],
+    )
+    await memory.flush_writes(timeout=30)
+    out["replayed"] = await memory.load_profile_context(user_id)
+    out["backfilled_count"] = await memory.backfill_user_aggregates(user_id)
+    memory._profile_cache.clear()
+    out["backfilled"] = await memory.load_profile_context(user_id)
+    out["stale_users"] = await memory.list_user_ids(only_stale=True)
+
+    out["transcripts_a"] = await memory.get_session_transcripts(sessions["a"])
+    graph = await memory.get_session_graph(sessions["a"])
+    out["graph_nodes"] = sorted((n["id"], n["type"]) for n in graph["nodes"])
+    out["graph_edges"] = sorted((e["source"], e["type"], e["target"]) for e in graph["edges"])
+    out["graph_version"] = graph["version"]
+    delta = await memory.get_session_graph(sessions["a"], since=graph["version"])
+    out["graph_delta"] = (len(delta["nodes"]), len(delta["edges"]))
+    out["empty_graph"] = await memory.get_session_graph(f"{user_id}_missing")
+    out["unknown_summary"] = await memory.get_user_context(f"{user_id}_nobody", "")
+    out["rag"] = await memory.get_rag_context(user_id, [{"role": "user", "content": "Which database did you migrate?"}, {"role": "user", "content": "postgres"}], top_k=2)
+    return out
+
+
+def _check(name: str, out: dict, exp: dict) -> list[str]:
+    failures: list[str] = []
+
+    def check(label: str, ok: bool, detail: str = "") -> None:
+        print(f"  {'OK  ' if ok else 'FAIL'} {label}{(' — ' + detail) if detail and not ok else ''}")
+        if not ok:
+            failures.append(f"{name}: {label} {detail}")
+
+    def close(a, b) -> bool:
+        return a is not None and abs(a - b) < 1e-9
+
+    for key in ("profile", "replayed", "backfilled"):
+        p = out[key]
+        check(f"{key}: answer count", p.answer_count == exp["answer_count"], f"{p.answer_count}")
+        check(
+            f"{key}: stress/confidence mean and std",
+            close(p.stress_mean, exp["stress"][0]) and close(p.stress_std, exp["stress"][1])
+            and close(p.confidence_mean, exp["confidence"][0]) and close(p.confidence_std, exp["confidence"][1]),
+            f"{p.stress_mean},{p.stress_std},{p.confidence_mean},{p.confidence_std}",
+        )
+        check(f"{key}: label counts", p.label_counts == exp["label_counts"], f"{p.label_counts}")
+    check("recent transcripts (newest first)", out["profile"].recent_transcripts == exp["recent"][:5],
+          f"{out['profile'].recent_transcripts}")
+    check("backfill answer count", out["backfilled_count"] == exp["answer_count"], f"{out['backfilled_count']}")
+    check("user not stale after ingest", out["user_id"] not in out["stale_users"])
+    check("session transcripts in question order", out["transcripts_a"] == exp["transcripts_a"], f"{out['transcripts_a']}")
+    types = [t for _, t in out["graph_nodes"]]
+    check(
+        "session graph nodes",
+        types.count("Session") == 1 and types.count("Answer") == 3 and types.count("Decision") == 3
+        and types.count("Entity") == 3,
+        f"{out['graph_nodes']}",
+    )
+    check("session graph edges", len(out["graph_edges"]) == 3 + 3 + 4, f"{out['graph_edges']}")
+    check("graph delta since current version is empty", out["graph_delta"] == (0, 0), f"{out['graph_delta']}")
+    check("unknown session graph is empty", not out["empty_graph"]["nodes"] and not out["empty_graph"]["edges"])
+    check("unknown user summary", out["unknown_summary"] == "No history yet. This is the first answer.",
+          out["unknown_summary"])
+    # The matching (oldest) answer first, then padded with the most recent one.
+    check("rag context ranked by relevance", out["rag"] == [ANSWERS[0][2], exp["recent"][0]], f"{out['rag']}")
+    return failures
+
+
+def _comparable(out: dict) -> dict:
+    """Backend-independent view: ids are rewritten relative to the run's user id."""
+    uid = out["user_id"]
+
+    def strip(value):
+        return value.replace(uid, "<user>") if isinstance(value, str) else value
+
+    profile = out["profile"]
+    return {
+        "profile": (profile.answer_count, profile.label_counts, profile.recent_transcripts,
+                    profile.summary.split(" profile:", 1)[-1]),
+        "transcripts_a": out["transcripts_a"],
+        "rag": out["rag"],
+        "graph_nodes": [tuple(strip(v) for v in n) for n in out["graph_nodes"]],
+        "graph_edges": [tuple(strip(v) for v in e) for e in out["graph_edges"]],
+    }
+
+
+async def _cleanup_neo4j(memory, user_id: str) -> None:
+    driver = memory._get_driver()
+    async with driver.session(database=memory._env("NEO4J_DATABASE")) as session:
+        await (await session.run(
+            """
+            MATCH (u:User {user_id: $user_id})
+            OPTIONAL MATCH (u)-[:HAS_SESSION]->(s:Session)
+            OPTIONAL MATCH (s)-[:HAS_ANSWER|HAS_DECISION]->(n)
+            OPTIONAL MATCH (u)-[:HAS_LABEL_STAT]->(ls:UserLabelStat)
+            DETACH DELETE u, s, n, ls
+            """,
+            user_id=user_id,
+        )).consume()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", default=None, help="Comma separated: sqlite,neo4j (default: sqlite + neo4j if configured)")
+    parser.add_argument("--keep", action="store_true", help="Keep the Neo4j scenario data")
+    args = parser.parse_args()
+
+    from services import graph_writer, memory, memory_schema, memory_sqlite
+
+    names = [b.strip() for b in (args.backends or "").split(",") if b.strip()]
+    if not names:
+        names = ["sqlite"] + (["neo4j"] if memory.is_neo4j_configured() else [])
+    exp = _expected()
+    results: dict[str, dict] = {}
+    failures: list[str] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in names:
+            print(f"[{name}]")
+            os.environ["MEMORY_BACKEND"] = name
+            os.environ["MEMORY_SQLITE_PATH"] = str(Path(tmp) / "memory.sqlite3")
+            memory._profile_cache.clear()
+            memory._graph_snapshots.clear()
+            if name == "neo4j" and not memory.is_neo4j_configured():
+                print("  SKIP Neo4j is not configured (NEO4J_URI / NEO4J_USERNAME / NEO4J_PASSWORD)")
+                continue
+            if not await memory_schema.bootstrap():
+                failures.append(f"{name}: schema bootstrap failed")
+                print("  FAIL schema bootstrap")
+                continue
+            out = await _scenario(memory, uuid.uuid4().hex[:10])
+            failures += _check(name, out, exp)
+            results[name] = out
+            if name == "neo4j" and not args.keep:
+                await _cleanup_neo4j(memory, out["user_id"])
+        await graph_writer.close()
+        await memory.close_driver()
+        memory_sqlite.close()
+
+    if len(results) > 1:
+        print("[cross-backend]")
+        (first, a), *rest = results.items()
+        for other, b in rest:
+            for key, value in _comparable(a).items():
+                same = value == _comparable(b)[key]
+                print(f"  {'OK  ' if same else 'FAIL'} {first} == {other}: {key}")
+                if not same:
+                    failures.append(f"{first} != {other}: {key}")
+    if failures:
+        print(f"{len(failures)} conformance failure(s).")
+        sys.exit(1)
+    print("All memory backend conformance checks passed.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Query-plan regression check for every Cypher query in services/memory.py. It runs against a
+local Neo4j seeded with synthetic users (ids prefixed "plancheck_"). Each query is PROFILEd
+inside a transaction that is rolled back, so write queries leave nothing behind.
+Run from backend dir with NEO4J_URI / NEO4J_USERNAME / NEO4J_PASSWORD set (e.g. in .env):
+  cd backend && python scripts/check_query_plans.py                     # seed, migrate, check
+  python scripts/check_query_plans.py --update-baseline                 # record current plans
+  python scripts/check_query_plans.py --explain                         # plans only, no execution
+  python scripts/check_query_plans.py --cleanup                         # remove the seeded data
+
+The db-hit and index-seek rules compare against scripts/query_plans.baseline.json, which is
+recorded from a seeded Neo4j with --update-baseline and committed next to this script. Record it
+once before the first check, and again after an intended plan change.
+
+The check fails (exit 1) when any of these happens:
+  - a query uses a full scan (AllNodesScan, NodeByLabelScan, CartesianProduct) that its spec
+    does not allow
+  - an index seek recorded in the baseline disappears
+  - db hits grow more than --tolerance over the baseline (scripts/query_plans.baseline.json)
+  - a query constant in memory.py has no entry in _query_specs()
+  - the baseline file is missing, or has no entry for a query (so its db hits can't be checked)
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+backend = Path(__file__).resolve().parent.parent
+if str(backend) not in sys.path:
+    sys.path.insert(0, str(backend))
+
+# Load .env if present
+try:
+    from dotenv import load_dotenv
+    load_dotenv(backend / ".env")
+except ImportError:
+    pass
+
+PREFIX = "plancheck_"
+BASELINE = Path(__file__).resolve().parent / "query_plans.baseline.json"
+SCANS = ("AllNodesScan", "NodeByLabelScan", "CartesianProduct")
+# Absolute slack on top of --tolerance so tiny queries don't fail on a handful of hits.
+DB_HITS_SLACK = 25
+
+
+def _answer_row(u: int, s: int, q: int, now: str) -> dict:
+    session_id = f"{PREFIX}u{u}_s{s}"
+    return {
+        "user_id": f"{PREFIX}u{u}",
+        "session_id": session_id,
+        "role": "Backend Engineer",
+        "company": "Acme",
+        "answer_id": f"{session_id}:q{q}",
+        "question_number": q,
+        "question": "Tell me about a system you scaled.",
+        "transcript": f"Answer {q} of session {s}: we sharded the write path and cut p99 by half.",
+        "duration_seconds": 40,
+        "stress": 0.1 * (q % 7),
+        "confidence": 0.1 * (10 - q % 7),
+        "yutori_correct": True,
+        "entities": [
+            {"label": "TECHNICAL_SKILL", "text": f"{PREFIX}skill {q % 5}"},
+            {"label": "IMPACT", "text": f"{PREFIX}impact {u % 3}"},
+        ],
+        "now": now,
+    }
+
+
+def _decision_row(u: int, s: int, q: int, now: str) -> dict:
+    session_id = f"{PREFIX}u{u}_s{s}"
+    answer_id = f"{session_id}:q{q}"
+    return {
+        "user_id": f"{PREFIX}u{u}",
+        "session_id": session_id,
+        "answer_id": answer_id,
+        "decision_id": f"{answer_id}:decision",
+        "prev_decision_id": f"{session_id}:q{max(1, q - 1)}:decision",
+        "next_decision_id": f"{session_id}:q{q + 1}:decision",
+        "question_number": q,
+        "tone": "neutral",
+        "difficulty_delta": 0,
+        "next_question": "What would you do differently?",
+        "feedback_note": "Good structure.",
+        "reasoning": None,
+        "stress": 0.3,
+        "confidence": 0.7,
+        "yutori_correct": True,
+        "now": now,
+    }
+
+
+def _query_specs(memory) -> dict:
+    """name -> (params, allowed full scans). Params target the seeded user / session 0."""
+    now_iso = datetime.now(timezone.utc).isoformat()
+    user_id, session_id = f"{PREFIX}u0", f"{PREFIX}u0_s0"
+    agg = memory.AGGREGATES_VERSION
+    return {
+        "_REGISTER_USER": (
+            dict(user_id=user_id, now=datetime.now(timezone.utc), agg_version=agg,
+                 role="Backend Engineer", company="Acme", level="mid", difficulty="medium"),
+            (),
+        ),
+        "_WRITE_ANSWERS": (dict(rows=[_answer_row(0, 0, 1, now_iso)], agg_version=agg), ()),
+        "_WRITE_DECISIONS": (dict(rows=[_decision_row(0, 0, 2, now_iso)]), ()),
+        "_SESSION_GRAPH": (dict(session_id=session_id), ()),
+        "_SESSION_TRANSCRIPTS": (dict(session_id=session_id), ()),
+        "_LOAD_PROFILE": (dict(user_id=user_id, k=memory.PROFILE_RECENT_K), ()),
+        "_BACKFILL_AGGREGATES": (dict(user_id=user_id, now=datetime.now(timezone.utc), agg_version=agg), ()),
+        "_RAG_EXACT": (dict(user_id=user_id, embedding=memory._embedding_param("sharded write path p99"),
+                            exclude=[], k=5), ()),
+        # Admin-only (backfill script): enumerating users is a label scan by design.
+        "_LIST_USER_IDS": (dict(only_stale=False, agg_version=agg), ("NodeByLabelScan",)),
+    }
+
+
+def _memory_queries(memory) -> dict[str, str]:
+    return {
+        name: value
+        for name, value in vars(memory).items()
+        if name.startswith("_") and name[1:].isupper() and isinstance(value, str)
+        and any(kw in value for kw in ("MATCH", "MERGE", "UNWIND"))
+    }
+
+
+def _walk(plan: dict):
+    yield plan
+    for child in plan.get("children") or []:
+        yield from _walk(child)
+
+
+def _summarize(plan: dict) -> dict:
+    ops = [str(p.get("operatorType", "")).split("@")[0] for p in _walk(plan)]
+    hits = sum(int(p.get("dbHits") or 0) for p in _walk(plan))
+    return {"operators": sorted(set(ops)), "db_hits": hits}
+
+
+async def _seed(driver, db: str | None, memory, users: int, sessions: int, answers: int) -> int:
+    async with driver.session(database=db) as session:
+        res = await session.run(
+            "MATCH (u:User {user_id: $user_id}) RETURN u.agg_answer_count AS n", user_id=f"{PREFIX}u{users - 1}"
+        )
+        row = await res.single()
+    if row is not None and (row["n"] or 0) >= sessions * answers:
+        return 0
+    now = datetime.now(timezone.utc).isoformat()
+    rows, decisions, written = [], [], 0
+    for u in range(users):
+        for s in range(sessions):
+            for q in range(1, answers + 1):
+                rows.append(_answer_row(u, s, q, now))
+                decisions.append(_decision_row(u, s, q, now))
+        if len(rows) >= 500 or u == users - 1:
+            await memory.write_batch(rows, decisions)
+            written += len(rows)
+            rows, decisions = [], []
+    return written
+
+
+async def _cleanup(driver, db: str | None) -> None:
+    async with driver.session(database=db) as session:
+        await (await session.run(
+            """
+            MATCH (u:User) WHERE u.user_id STARTS WITH $prefix
+            OPTIONAL MATCH (u)-[:HAS_SESSION]->(s:Session)
+            OPTIONAL MATCH (s)-[:HAS_ANSWER|HAS_DECISION]->(n)
+            OPTIONAL MATCH (u)-[:HAS_LABEL_STAT]->(ls:UserLabelStat)
+            DETACH DELETE u, s, n, ls
+            """,
+            prefix=PREFIX,
+        )).consume()
+        await (await session.run(
+            "MATCH (e:Entity) WHERE e.text STARTS WITH $prefix DETACH DELETE e", prefix=PREFIX
+        )).consume()
+
+
+async def _plan(driver, db: str | None, query: str, params: dict, explain: bool) -> dict:
+    async with driver.session(database=db) as session:
+        tx = await session.begin_transaction()
+        try:
+            res = await tx.run(("EXPLAIN " if explain else "PROFILE ") + query, **params)
+            summary = await res.consume()
+        finally:
+            await tx.rollback()
+    plan = summary.plan if explain else summary.profile
+    return _summarize(plan or {})
+
+
+def _check(got: dict, allowed: tuple, base: dict | None, tolerance: float, explain: bool) -> list[str]:
+    problems = [f"{op} in plan" for op in got["operators"] if op in SCANS and op not in allowed]
+    if base:
+        lost = [op for op in base["operators"] if "IndexSeek" in op and op not in got["operators"]]
+        if lost:
+            problems.append("lost " + ", ".join(lost))
+        if not explain and base.get("db_hits") is not None:
+            limit = base["db_hits"] * (1 + tolerance) + DB_HITS_SLACK
+            if got["db_hits"] > limit:
+                problems.append(f"db hits {got['db_hits']} > {limit:.0f} (baseline {base['db_hits']})")
+    return problems
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--sessions", type=int, default=4, help="Sessions per seeded user")
+    parser.add_argument("--answers", type=int, default=8, help="Answers per seeded session")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed db-hit growth over baseline")
+    parser.add_argument("--explain", action="store_true", help="EXPLAIN only (operators, no db hits)")
+    parser.add_argument("--update-baseline", action="store_true", help=f"Write {BASELINE.name} and exit 0")
+    parser.add_argument("--cleanup", action="store_true", help="Delete the seeded data and exit")
+    args = parser.parse_args()
+    if args.explain and args.update_baseline:
+        parser.error("--update-baseline needs PROFILE db hits; drop --explain")
+
+    # The seed goes through memory.write_batch, which must target Neo4j here.
+    os.environ["MEMORY_BACKEND"] = "neo4j"
+    from services import memory, memory_schema
+
+    if not memory.is_neo4j_configured():
+        print("Neo4j is not configured. Set NEO4J_URI / NEO4J_USERNAME / NEO4J_PASSWORD.")
+        sys.exit(1)
+    driver = memory._get_driver()
+    db = memory._env("NEO4J_DATABASE")
+    try:
+        if args.cleanup:
+            await _cleanup(driver, db)
+            print(f"Removed {PREFIX}* data.")
+            return
+        version = await memory_schema.migrate(driver, db)
+        seeded = await _seed(driver, db, memory, args.users, args.sessions, args.answers)
+        print(f"Schema version {version}; seeded {seeded} answers ({args.users} users).")
+
+        specs = _query_specs(memory)
+        queries = _memory_queries(memory)
+        baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() and not args.update_baseline else {}
+        results: dict[str, dict] = {}
+        failed = False
+        if not baseline and not args.update_baseline:
+            print(f"FAIL no {BASELINE.name}: db hits and index seeks can't be checked. "
+                  "Record one with --update-baseline and commit it.")
+            failed = True
+        print(f"{'query':<22} {'db_hits':>8}  status")
+        for name, query in sorted(queries.items()):
+            if name not in specs:
+                print(f"{name:<22} {'-':>8}  FAIL no plan spec in scripts/check_query_plans.py")
+                failed = True
+                continue
+            params, allowed = specs[name]
+            got = await _plan(driver, db, query, params, args.explain)
+            results[name] = got
+            problems = _check(got, allowed, baseline.get(name), args.tolerance, args.explain)
+            if baseline and name not in baseline:
+                problems.append("no baseline entry (run with --update-baseline)")
+            failed = failed or bool(problems)
+            hits = "-" if args.explain else str(got["db_hits"])
+            print(f"{name:<22} {hits:>8}  {'FAIL ' + '; '.join(problems) if problems else 'OK'}")
+            print(f"{'':<22} {'':>8}  {', '.join(got['operators'])}")
+
+        if args.update_baseline:
+            BASELINE.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+            print(f"Wrote {BASELINE}")
+            return
+        if failed:
+            sys.exit(1)
+    finally:
+        await memory.close_driver()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Velma-2 STT APIs (modulate_apis_and_quickstart_guides/*.yaml), for
+load-testing services.modulate without the paid endpoint:
+
+  GET  /api/velma-2-stt-streaming            WebSocket: binary audio, "" ends, utterance/done/error messages
+  POST /api/velma-2-stt-batch                multipart upload_file -> {text, duration_ms, utterances}
+  POST /api/velma-2-stt-batch-english-vfast  multipart upload_file (.opus only) -> {text, duration_ms}
+  GET  /stats                                request/rejection counters
+
+Run it and point the backend at it:
+  cd backend && python scripts/velma_standin.py --port 8790 --latency-ms 150
+  MODULATE_API_KEY=standin MODULATE_BASE_URL=http://127.0.0.1:8790 ./run.sh
+
+Audio is not decoded: duration is derived from size at --bytes-per-second, and one synthetic
+utterance is produced per --utterance-ms of audio. Failure injection:
+  --rate-limit-rate P   reject a connection/request with 4029 (streaming) or 429 (batch)
+  --error-rate P        fail mid-stream with an error message + close 1011 (batch: 500)
+  --max-concurrent N    reject with 4029 / 429 beyond N concurrent requests
+Scripts can embed it via build_app(StandinConfig(...)).
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import uuid
+from dataclasses import dataclass, field
+
+from aiohttp import web, WSMsgType
+
+STREAMING_PATH = "/api/velma-2-stt-streaming"
+BATCH_PATH = "/api/velma-2-stt-batch"
+VFAST_PATH = "/api/velma-2-stt-batch-english-vfast"
+
+RATE_LIMIT_CLOSE_CODE = 4029
+INVALID_KEY_CLOSE_CODE = 4001
+INTERNAL_ERROR_CLOSE_CODE = 1011
+
+DEFAULT_EMOTIONS = ("Confident", "Neutral", "Interested", "Calm", "Stressed", "Anxious")
+WORDS = (
+    "we", "shipped", "the", "service", "and", "reduced", "latency", "by", "forty", "percent",
+    "I", "led", "migration", "to", "a", "new", "queue", "with", "clear", "ownership",
+)
+
+
+@dataclass
+class StandinConfig:
+    latency_ms: float = 100.0          # processing delay per utterance
+    utterance_ms: int = 3000           # audio per synthetic utterance
+    bytes_per_second: int = 4000       # nominal audio bitrate used to derive durations
+    speedup: float = 0.0               # >0: also charge audio_seconds / speedup per chunk received
+    emotions: tuple[str, ...] = DEFAULT_EMOTIONS
+    rate_limit_rate: float = 0.0
+    error_rate: float = 0.0
+    max_concurrent: int = 0            # 0 = unlimited
+    api_key: str | None = None         # None accepts any key
+    seed: int | None = None
+    stats: dict = field(default_factory=lambda: {
+        "streaming": 0, "batch": 0, "vfast": 0,
+        "rate_limited": 0, "errors": 0, "unauthorized": 0,
+        "in_flight": 0, "max_in_flight": 0,
+    })
+
+    def __post_init__(self) -> None:
+        self.rng = random.Random(self.seed)
+
+
+def _synthetic_utterance(cfg: StandinConfig, start_ms: int, duration_ms: int, params) -> dict:
+    signals = str(params.get("emotion_signal", "false")).lower() == "true"
+    accents = str(params.get("accent_signal", "false")).lower() == "true"
+    diarize = str(params.get("speaker_diarization", "true")).lower() == "true"
+    n_words = max(3, duration_ms // 400)
+    return {
+        "utterance_uuid": str(uuid.UUID(int=cfg.rng.getrandbits(128))),
+        "text": " ".join(cfg.rng.choice(WORDS) for _ in range(n_words)),
+        "start_ms": start_ms,
+        "duration_ms": duration_ms,
+        "speaker": 1 if diarize else None,
+        "language": "en",
+        "emotion": cfg.emotions[cfg.rng.randrange(len(cfg.emotions))] if signals and cfg.emotions else None,
+        "accent": "American" if accents else None,
+    }
+
+
+def _utterances_for(cfg: StandinConfig, total_ms: int, params) -> list[dict]:
+    out = []
+    start = 0
+    while start < total_ms:
+        dur = min(cfg.utterance_ms, total_ms - start)
+        out.append(_synthetic_utterance(cfg, start, dur, params))
+        start += dur
+    return out
+
+
+class _Slot:
+    """Concurrency accounting for one request; `rejected` when over max_concurrent."""
+
+    def __init__(self, cfg: StandinConfig) -> None:
+        self.cfg = cfg
+        self.rejected = bool(cfg.max_concurrent) and cfg.stats["in_flight"] >= cfg.max_concurrent
+
+    def __enter__(self) -> "_Slot":
+        if not self.rejected:
+            s = self.cfg.stats
+            s["in_flight"] += 1
+            s["max_in_flight"] = max(s["max_in_flight"], s["in_flight"])
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if not self.rejected:
+            self.cfg.stats["in_flight"] -= 1
+
+
+def _authorized(cfg: StandinConfig, key: str | None) -> bool:
+    return cfg.api_key is None or key == cfg.api_key
+
+
+async def _streaming(request: web.Request) -> web.WebSocketResponse:
+    cfg: StandinConfig = request.app["cfg"]
+    cfg.stats["streaming"] += 1
+    ws = web.WebSocketResponse()
+    await ws.prepare(request)
+
+    if not _authorized(cfg, request.query.get("api_key")):
+        cfg.stats["unauthorized"] += 1
+        await ws.close(code=INVALID_KEY_CLOSE_CODE, message=b"Invalid API key")
+        return ws
+    with _Slot(cfg) as slot:
+        if slot.rejected or cfg.rng.random() < cfg.rate_limit_rate:
+            cfg.stats["rate_limited"] += 1
+            await ws.close(code=RATE_LIMIT_CLOSE_CODE, message=b"Rate limit exceeded")
+            return ws
+
+        fail = cfg.rng.random() < cfg.error_rate
+        received = 0
+        emitted_ms = 0
+        pending: asyncio.Queue = asyncio.Queue()
+
+        async def emit() -> None:
+            # Utterances are "processed" in order, each taking latency_ms, without blocking reads.
+            while True:
+                item = await pending.get()
+                if item is None:
+                    return
+                await asyncio.sleep(cfg.latency_ms / 1000.0)
+                await ws.send_str(json.dumps({"type": "utterance", "utterance": item}))
+
+        async def fail_stream() -> web.WebSocketResponse:
+            cfg.stats["errors"] += 1
+            await ws.send_str(json.dumps({"type": "error", "error": "Internal transcription error"}))
+            await ws.close(code=INTERNAL_ERROR_CLOSE_CODE)
+            return ws
+
+        emitter = asyncio.create_task(emit())
+        try:
+            async for msg in ws:
+                if msg.type == WSMsgType.BINARY:
+                    received += len(msg.data)
+                    if cfg.speedup > 0:
+                        await asyncio.sleep(len(msg.data) / cfg.bytes_per_second / cfg.speedup)
+                    audio_ms = received * 1000 // cfg.bytes_per_second
+                    while audio_ms - emitted_ms >= cfg.utterance_ms:
+                        if fail and emitted_ms:
+                            return await fail_stream()
+                        pending.put_nowait(_synthetic_utterance(cfg, emitted_ms, cfg.utterance_ms, request.query))
+                        emitted_ms += cfg.utterance_ms
+                elif msg.type == WSMsgType.TEXT and msg.data == "":
+                    if fail:
+                        return await fail_stream()
+                    total_ms = received * 1000 // cfg.bytes_per_second
+                    if total_ms > emitted_ms:
+                        pending.put_nowait(
+                            _synthetic_utterance(cfg, emitted_ms, total_ms - emitted_ms, request.query)
+                        )
+                    pending.put_nowait(None)
+                    await emitter
+                    await ws.send_str(json.dumps({"type": "done", "duration_ms": total_ms}))
+                    break
+        finally:
+            if not emitter.done():
+                emitter.cancel()
+        await ws.close()
+        return ws
+
+
+async def _read_upload(request: web.Request) -> tuple[int, str, dict]:
+    """Drain the multipart body; return (upload size, filename, other form fields)."""
+    reader = await request.multipart()
+    size, filename, fields = 0, "", {}
+    async for part in reader:
+        if part.name == "upload_file":
+            filename = part.filename or ""
+            while True:
+                chunk = await part.read_chunk(64 * 1024)
+                if not chunk:
+                    break
+                size += len(chunk)
+        elif part.name:
+            fields[part.name] = await part.text()
+    return size, filename, fields
+
+
+def _batch_handler(kind: str):
+    async def handler(request: web.Request) -> web.Response:
+        cfg: StandinConfig = request.app["cfg"]
+        cfg.stats[kind] += 1
+        if not _authorized(cfg, request.headers.get("X-API-Key")):
+            cfg.stats["unauthorized"] += 1
+            return web.json_response({"detail": "Invalid API key."}, status=401)
+        with _Slot(cfg) as slot:
+            if slot.rejected or cfg.rng.random() < cfg.rate_limit_rate:
+                cfg.stats["rate_limited"] += 1
+                return web.json_response(
+                    {"detail": "Too many concurrent requests for this model. Please try again shortly."},
+                    status=429,
+                )
+            size, filename, fields = await _read_upload(request)
+            if not size:
+                return web.json_response({"detail": "Empty file provided."}, status=400)
+            if kind == "vfast" and not filename.lower().endswith(".opus"):
+                return web.json_response(
+                    {"detail": "Invalid file format. Only .opus files are supported."}, status=400
+                )
+            total_ms = size * 1000 // cfg.bytes_per_second
+            utterances = _utterances_for(cfg, total_ms, fields)
+            # Batch pays the per-utterance cost up front (plus audio processing when speedup is set).
+            delay = len(utterances) * cfg.latency_ms / 1000.0
+            if cfg.speedup > 0:
+                delay += total_ms / 1000.0 / cfg.speedup
+            await asyncio.sleep(delay)
+            if cfg.rng.random() < cfg.error_rate:
+                cfg.stats["errors"] += 1
+                return web.json_response({"detail": "Internal transcription error."}, status=500)
+            text = " ".join(u["text"] for u in utterances)
+            if kind == "vfast":
+                return web.json_response({"text": text, "duration_ms": total_ms})
+            return web.json_response({"text": text, "duration_ms": total_ms, "utterances": utterances})
+
+    return handler
+
+
+async def _stats(request: web.Request) -> web.Response:
+    return web.json_response(request.app["cfg"].stats)
+
+
+def build_app(cfg: StandinConfig | None = None) -> web.Application:
+    app = web.Application(client_max_size=101 * 1024 * 1024)
+    app["cfg"] = cfg or StandinConfig()
+    app.router.add_get(STREAMING_PATH, _streaming)
+    app.router.add_post(BATCH_PATH, _batch_handler("batch"))
+    app.router.add_post(VFAST_PATH, _batch_handler("vfast"))
+    app.router.add_get("/stats", _stats)
+    return app
+
+
+async def start(cfg: StandinConfig, host: str = "127.0.0.1", port: int = 8790) -> web.AppRunner:
+    """Start the stand-in in the current event loop; call `await runner.cleanup()` to stop."""
+    runner = web.AppRunner(build_app(cfg))
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+def config_from_args(argv: list[str] | None = None) -> tuple[StandinConfig, argparse.Namespace]:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8790)
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="Processing delay per utterance")
+    parser.add_argument("--utterance-ms", type=int, default=3000, help="Audio per synthetic utterance")
+    parser.add_argument("--bytes-per-second", type=int, default=4000)
+    parser.add_argument("--speedup", type=float, default=0.0, help="Charge audio_seconds/speedup per chunk (0=off)")
+    parser.add_argument("--emotions", default=",".join(DEFAULT_EMOTIONS), help="Comma-separated emotion labels")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--max-concurrent", type=int, default=0)
+    parser.add_argument("--api-key", default=None, help="Require this key (default: accept any)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+    cfg = StandinConfig(
+        latency_ms=args.latency_ms,
+        utterance_ms=args.utterance_ms,
+        bytes_per_second=args.bytes_per_second,
+        speedup=args.speedup,
+        emotions=tuple(e.strip() for e in args.emotions.split(",") if e.strip()),
+        rate_limit_rate=args.rate_limit_rate,
+        error_rate=args.error_rate,
+        max_concurrent=args.max_concurrent,
+        api_key=args.api_key,
+        seed=args.seed,
+    )
+    return cfg, args
+
+
+def main() -> None:
+    cfg, args = config_from_args()
+    print(f"Velma-2 stand-in on http://{args.host}:{args.port} (latency {cfg.latency_ms:.0f} ms/utterance)", file=sys.stderr)
+    web.run_app(build_app(cfg), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
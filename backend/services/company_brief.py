@@ -0,0 +1,192 @@
+"""Shared cache of Yutori Browsing company briefs.
+
+A brief (yutori.run_company_brief_browsing) is a browsing task of up to 40 steps that takes a
+minute or more, and its answer depends on the company and the kind of role, not on the
+candidate. Briefs are therefore cached per (role family, company): "Sr. Software Engineer II" @
+"Google, Inc." and "software engineer" @ "google" share one entry.
+
+- Fresh for COMPANY_BRIEF_TTL_SECONDS: served from memory.
+- Then stale for COMPANY_BRIEF_STALE_SECONDS: still served immediately, while one background
+  task refreshes it (stale-while-revalidate).
+- Empty briefs (task failed, stub mode) are kept only COMPANY_BRIEF_EMPTY_TTL_SECONDS, so a
+  failing task is not retried on every session start but recovers soon.
+Concurrent requests for the same key share one in-flight browsing task (SingleFlight).
+
+Env:
+  COMPANY_BRIEF_TTL_SECONDS        default 21600 (6 h)
+  COMPANY_BRIEF_STALE_SECONDS      default 86400 (served stale for up to a day after that)
+  COMPANY_BRIEF_EMPTY_TTL_SECONDS  default 300
+  COMPANY_BRIEF_CACHE_MAX_ENTRIES  default 512
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import re
+import time
+
+from services.cache import SingleFlight, TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name) or default)
+    except ValueError:
+        return default
+
+
+TTL_SECONDS = max(0, _int_env("COMPANY_BRIEF_TTL_SECONDS", 6 * 3600))
+STALE_SECONDS = max(0, _int_env("COMPANY_BRIEF_STALE_SECONDS", 24 * 3600))
+EMPTY_TTL_SECONDS = max(0, _int_env("COMPANY_BRIEF_EMPTY_TTL_SECONDS", 300))
+
+# Entries live through the stale window; freshness is judged from the fetch time kept alongside.
+_cache = TTLCache(
+    max_entries=_int_env("COMPANY_BRIEF_CACHE_MAX_ENTRIES", 512),
+    ttl_seconds=TTL_SECONDS + STALE_SECONDS,
+    name="company_brief",
+)
+_flight = SingleFlight()
+_refreshing: dict[tuple[str, str], asyncio.Task] = {}
+_stats = {"fresh": 0, "stale": 0, "fetched": 0, "revalidations": 0}
+
+_COMPANY_SUFFIXES = {"inc", "incorporated", "llc", "ltd", "limited", "corp", "corporation", "co", "company", "plc", "gmbh", "ag", "sa"}
+_SENIORITY = {
+    "senior", "sr", "junior", "jr", "staff", "principal", "lead", "head", "chief", "associate",
+    "entry", "level", "mid", "intern", "internship", "new", "grad", "graduate", "i", "ii", "iii", "iv",
+}
+# First match wins: (keywords any of which appear in the role, family).
+_ROLE_FAMILIES: list[tuple[tuple[str, ...], str]] = [
+    (("machine learning", "ml engineer", "ai engineer", "deep learning"), "machine learning engineer"),
+    (("data scien",), "data scientist"),
+    (("data engineer", "analytics engineer"), "data engineer"),
+    (("data analyst", "business analyst", "analyst"), "analyst"),
+    (("site reliability", "sre", "devops", "platform engineer", "infrastructure"), "infrastructure engineer"),
+    (("security",), "security engineer"),
+    (("frontend", "front end", "ui engineer", "web developer"), "frontend engineer"),
+    (("full stack", "fullstack"), "full stack engineer"),
+    (("backend", "back end"), "backend engineer"),
+    (("mobile", "ios", "android"), "mobile engineer"),
+    (("engineering manager",), "engineering manager"),
+    (("product manager", "product owner"), "product manager"),
+    (("designer", "ux", "product design"), "designer"),
+    (("software", "swe", "developer", "programmer", "engineer"), "software engineer"),
+]
+
+
+def _words(text: str) -> list[str]:
+    return re.findall(r"[a-z0-9+#]+", (text or "").lower())
+
+
+def normalize_company(company: str) -> str:
+    words = [w for w in _words(company) if w not in _COMPANY_SUFFIXES]
+    if words and words[0] == "the":
+        words = words[1:]
+    return " ".join(words)
+
+
+def role_family(role: str) -> str:
+    """Coarse role bucket for cache keys; unknown roles fall back to the role minus seniority words."""
+    text = " ".join(_words(role))
+    padded = f" {text} "
+    for keywords, family in _ROLE_FAMILIES:
+        if any(f" {kw}" in padded for kw in keywords):
+            return family
+    return " ".join(w for w in text.split() if w not in _SENIORITY)
+
+
+def cache_key(role: str, company: str) -> tuple[str, str]:
+    return role_family(role), normalize_company(company)
+
+
+def _is_empty(brief: dict) -> bool:
+    return not brief.get("expectations") and not brief.get("hints")
+
+
+def summarize_company_brief(brief: dict | None) -> str | None:
+    """One-line brief summary stored on the session for the orchestrator (None when empty)."""
+    if not brief:
+        return None
+    parts: list[str] = []
+    if brief.get("expectations"):
+        parts.append("Company/role expectations: " + "; ".join(brief["expectations"][:3]))
+    if brief.get("hints"):
+        parts.append("Hints for candidates: " + "; ".join(brief["hints"][:3]))
+    return " ".join(parts) if parts else None
+
+
+async def _fetch(key: tuple[str, str], role: str, company: str) -> dict:
+    from services import yutori
+
+    brief = await yutori.run_company_brief_browsing(role, company)
+    _stats["fetched"] += 1
+    if _is_empty(brief):
+        # Keep a failure only briefly, and never over a usable (stale) brief.
+        now = time.monotonic()
+        previous = _cache.get_entry(key)
+        if previous is not None and previous[0] > now and not _is_empty(previous[1][1]):
+            # Back off: the old brief counts as fresh for EMPTY_TTL_SECONDS before the next
+            # refresh, and still drops out when its original stale window ends.
+            _cache.set(key, (now - TTL_SECONDS + EMPTY_TTL_SECONDS, previous[1][1]), ttl_seconds=previous[0] - now)
+            return previous[1][1]
+        _cache.set(key, (now, brief), ttl_seconds=EMPTY_TTL_SECONDS)
+    else:
+        _cache.set(key, (time.monotonic(), brief))
+    return brief
+
+
+def _revalidate(key: tuple[str, str], role: str, company: str) -> None:
+    if key in _refreshing or _flight.in_flight(key):
+        return
+    _stats["revalidations"] += 1
+
+    async def _run() -> None:
+        try:
+            await _flight.do(key, lambda: _fetch(key, role, company))
+        except Exception:
+            logger.exception("Company brief refresh failed for %s.", key)
+        finally:
+            _refreshing.pop(key, None)
+
+    _refreshing[key] = asyncio.create_task(_run())
+
+
+def cached_brief(role: str, company: str) -> dict | None:
+    """
+    The cached brief for this role family and company without waiting on Yutori, or None on a
+    miss. A stale entry is returned as is and refreshed in the background.
+    """
+    key = cache_key(role, company)
+    hit = _cache.get(key)
+    if hit is None:
+        return None
+    fetched_at, brief = hit
+    if time.monotonic() - fetched_at > TTL_SECONDS:
+        _stats["stale"] += 1
+        _revalidate(key, role, company)
+    else:
+        _stats["fresh"] += 1
+    return brief
+
+
+async def get_company_brief(role: str, company: str) -> dict:
+    """Cached brief, or run (or join) the browsing task for it on a miss."""
+    brief = cached_brief(role, company)
+    if brief is not None:
+        return brief
+    key = cache_key(role, company)
+    return await _flight.do(key, lambda: _fetch(key, role, company))
+
+
+def stats() -> dict:
+    return {
+        **_cache.stats(),
+        **_stats,
+        "ttl_seconds": TTL_SECONDS,
+        "stale_seconds": STALE_SECONDS,
+        "single_flight": _flight.stats(),
+        "refreshing": len(_refreshing),
+    }
@@ -0,0 +1,299 @@
+"""Cache of Yutori Research fact-check results, keyed by a normalized claim fingerprint.
+
+Every report used to send each extracted claim to yutori.verify_claim, which means a research task
+and up to RESEARCH_TIMEOUT_SECONDS of polling, even when the same claim ("I grew revenue 30% at
+Stripe") had been checked in an earlier session or on the previous reload of the same report.
+Results are now looked up first by claim_fingerprint(): the claim is lowercased, whitespace and
+punctuation are dropped, numbers become canonical ("1,000" / "1k" -> 1000, "30 percent" -> 30%,
+"$2M" / "2 million dollars" -> $2000000), and company suffixes and articles are removed ("Stripe,
+Inc." -> stripe).
+
+- Verified results are kept for FACTCHECK_CACHE_TTL_SECONDS in an in-memory LRU and in an SQLite
+  file (one connection in WAL mode, used from a worker thread), so they survive restarts.
+- Failed checks (task error or timeout, i.e. a stub result although an API key is set) are cached
+  for FACTCHECK_CACHE_NEGATIVE_TTL_SECONDS, so a failing claim isn't retried on every reload.
+- Stub mode (no YUTORI_API_KEY) is never cached, so adding a key takes effect at once.
+Concurrent checks of the same fingerprint share one research task (SingleFlight), and that task
+keeps running and stores its result even if the report that started it stops waiting.
+
+Env:
+  FACTCHECK_CACHE_TTL_SECONDS           default 604800 (7 days; 0 disables the cache)
+  FACTCHECK_CACHE_NEGATIVE_TTL_SECONDS  default 600
+  FACTCHECK_CACHE_MAX_ENTRIES           default 2048 (in-memory tier)
+  FACTCHECK_CACHE_PATH                  default backend/data/factcheck.sqlite3 ("off" keeps memory only)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+
+from models.session import FactCheckResult
+from services.cache import SingleFlight, TTLCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = Path(__file__).resolve().parent.parent / "data" / "factcheck.sqlite3"
+# Bump when claim_fingerprint() changes, so old entries are simply never hit again.
+FINGERPRINT_VERSION = 1
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name) or default)
+    except ValueError:
+        return default
+
+
+def _ttl_seconds() -> int:
+    return _int_env("FACTCHECK_CACHE_TTL_SECONDS", 7 * 24 * 3600)
+
+
+def _negative_ttl_seconds() -> int:
+    return max(0, _int_env("FACTCHECK_CACHE_NEGATIVE_TTL_SECONDS", 600))
+
+
+def path_from_env() -> str | None:
+    raw = (os.getenv("FACTCHECK_CACHE_PATH") or "").strip()
+    if raw.lower() == "off":
+        return None
+    return raw or str(DEFAULT_PATH)
+
+
+_memory = TTLCache(
+    max_entries=_int_env("FACTCHECK_CACHE_MAX_ENTRIES", 2048),
+    ttl_seconds=max(1, _ttl_seconds()),
+    name="factcheck",
+)
+_inflight = SingleFlight()
+_stats = {"disk_hits": 0, "disk_writes": 0, "verified": 0, "negative_stored": 0, "negative_hits": 0, "uncached": 0}
+
+
+# --- fingerprint ---
+
+_MULTIPLIERS = {
+    "k": 1_000, "thousand": 1_000,
+    "m": 1_000_000, "mm": 1_000_000, "million": 1_000_000,
+    "b": 1_000_000_000, "bn": 1_000_000_000, "billion": 1_000_000_000,
+}
+_NUMBER = re.compile(
+    r"(?P<cur>\$)?\s*(?P<num>\d+(?:,\d{3})+(?:\.\d+)?|\d*\.\d+|\d+)"
+    r"(?:\s*(?P<pct>%|percent\b|per\s+cent\b)"
+    r"|\s*(?P<word>thousand|million|billion)\b"
+    r"|(?P<abbr>k|mm|m|bn|b)\b)?"
+    r"(?P<dollars>\s*(?:usd|dollars?)\b)?",
+    re.IGNORECASE,
+)
+_TOKEN = re.compile(r"\$?\d+(?:\.\d+)?%?|[a-z]+")
+_COMPANY_SUFFIXES = {"inc", "incorporated", "llc", "ltd", "limited", "corp", "corporation", "co", "plc", "gmbh", "ag"}
+_ARTICLES = {"a", "an", "the"}
+
+
+def _canonical_number(match: re.Match) -> str:
+    try:
+        value = Decimal(match.group("num").replace(",", ""))
+    except InvalidOperation:
+        return match.group(0)
+    scale = (match.group("word") or match.group("abbr") or "").lower()
+    value *= _MULTIPLIERS.get(scale, 1)
+    text = format(value.normalize(), "f")
+    if "." in text:
+        text = text.rstrip("0").rstrip(".")
+    if match.group("pct"):
+        text += "%"
+    if match.group("cur") or match.group("dollars"):
+        text = "$" + text
+    return f" {text} "
+
+
+def normalize_claim(claim: str) -> str:
+    """Canonical claim text behind the fingerprint (also handy when debugging cache misses)."""
+    text = unicodedata.normalize("NFKC", claim or "").lower()
+    text = _NUMBER.sub(_canonical_number, text)
+    tokens = [t for t in _TOKEN.findall(text) if t not in _COMPANY_SUFFIXES and t not in _ARTICLES]
+    return " ".join(tokens)
+
+
+def claim_fingerprint(claim: str) -> str:
+    return hashlib.sha256(f"v{FINGERPRINT_VERSION}|{normalize_claim(claim)}".encode()).hexdigest()
+
+
+# --- SQLite tier ---
+
+
+class _Store:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA busy_timeout=5000")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS factchecks (
+                    fingerprint TEXT PRIMARY KEY,
+                    result TEXT NOT NULL,
+                    negative INTEGER NOT NULL,
+                    expires_at REAL NOT NULL
+                ) WITHOUT ROWID
+                """
+            )
+            self._conn.execute("DELETE FROM factchecks WHERE expires_at < ?", (time.time(),))
+
+    def get(self, fingerprint: str) -> tuple[dict, bool, float] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, negative, expires_at FROM factchecks WHERE fingerprint = ? AND expires_at >= ?",
+                (fingerprint, time.time()),
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), bool(row[1]), row[2]
+
+    def put(self, fingerprint: str, result: dict, negative: bool, expires_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO factchecks (fingerprint, result, negative, expires_at) VALUES (?, ?, ?, ?)",
+                (fingerprint, json.dumps(result), int(negative), expires_at),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM factchecks")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_store: _Store | None = None
+
+
+def _get_store() -> _Store | None:
+    global _store
+    path = path_from_env()
+    if path is None:
+        return None
+    if _store is None or _store.path != path:
+        if _store is not None:
+            _store.close()
+        _store = _Store(path)
+    return _store
+
+
+def close() -> None:
+    global _store
+    if _store is not None:
+        _store.close()
+        _store = None
+
+
+# --- lookup / store ---
+
+
+def _disk_get(key: str) -> tuple[dict, bool, float] | None:
+    store = _get_store()
+    return store.get(key) if store is not None else None
+
+
+def _disk_put(key: str, result: FactCheckResult, negative: bool, ttl: int) -> bool:
+    store = _get_store()
+    if store is None:
+        return False
+    store.put(key, result.model_dump(), negative, time.time() + ttl)
+    return True
+
+
+async def _lookup(key: str) -> tuple[FactCheckResult, bool] | None:
+    hit = _memory.get(key)
+    if hit is not None:
+        return hit
+    try:
+        row = await asyncio.to_thread(_disk_get, key)
+    except (OSError, sqlite3.Error, ValueError):
+        logger.exception("Fact-check cache disk read failed (non-fatal).")
+        return None
+    if row is None:
+        return None
+    payload, negative, expires_at = row
+    hit = (FactCheckResult(**payload), negative)
+    _stats["disk_hits"] += 1
+    _memory.set(key, hit, ttl_seconds=max(1.0, expires_at - time.time()))
+    return hit
+
+
+async def _store_result(key: str, result: FactCheckResult, negative: bool) -> None:
+    ttl = _negative_ttl_seconds() if negative else _ttl_seconds()
+    if ttl <= 0:
+        return
+    _memory.set(key, (result, negative), ttl_seconds=ttl)
+    try:
+        if await asyncio.to_thread(_disk_put, key, result, negative, ttl):
+            _stats["disk_writes"] += 1
+    except (OSError, sqlite3.Error):
+        logger.exception("Fact-check cache disk write failed (non-fatal).")
+
+
+def _is_stub(result: FactCheckResult) -> bool:
+    return "[Stub]" in (result.summary or "")
+
+
+async def get_or_verify(claim: str) -> FactCheckResult:
+    """
+    Cached FactCheckResult for this claim, or run (or join) yutori.verify_claim for it. The
+    returned copy carries the caller's claim text, whichever phrasing was checked first.
+    """
+    from services import yutori
+
+    if _ttl_seconds() <= 0 or not yutori.YUTORI_API_KEY:
+        _stats["uncached"] += 1
+        return await yutori.verify_claim(claim)
+    key = claim_fingerprint(claim)
+    hit = await _lookup(key)
+    if hit is None:
+
+        async def _run() -> tuple[FactCheckResult, bool]:
+            result = await yutori.verify_claim(claim)
+            negative = _is_stub(result)
+            _stats["negative_stored" if negative else "verified"] += 1
+            await _store_result(key, result, negative)
+            return result, negative
+
+        hit = await _inflight.do(key, _run)
+    elif hit[1]:
+        _stats["negative_hits"] += 1
+    result, _negative = hit
+    return result.model_copy(update={"claim": claim})
+
+
+def stats() -> dict:
+    """Hit/miss counters for the status endpoint."""
+    return {
+        **_memory.stats(),
+        **_stats,
+        "ttl_seconds": _ttl_seconds(),
+        "negative_ttl_seconds": _negative_ttl_seconds(),
+        "disk_path": path_from_env(),
+        "disk_open": _store is not None,
+        "single_flight": _inflight.stats(),
+    }
+
+
+def clear() -> None:
+    _memory.clear()
+    store = _get_store()
+    if store is not None:
+        store.clear()
@@ -0,0 +1,280 @@
+"""Background fact-checking of answers as they arrive.
+
+Claims used to be verified only when the session report was generated, all at once under one
+20 s cap, so long sessions often ended with partial results. Now each answer's claim is queued
+(submit) as soon as the answer is transcribed. A small pool of workers verifies queued claims
+through services.factcheck_cache, so a claim already checked in an earlier session costs nothing.
+Results are kept per session and per answer. At report time, collect() only waits for the
+claims that are still running, so report latency no longer grows with the number of questions.
+
+- FACTCHECK_WORKERS bounds how many research tasks run at once across all sessions.
+- Claims the report needs that were never submitted (demo answers, a restart) are queued ahead
+  of background work.
+- The queue is bounded (FACTCHECK_QUEUE_MAX). When it is full, a background submission is
+  dropped and the report checks that claim itself.
+- The same claim given twice in one session is checked once. A claim still queued as
+  background work when the report needs it is moved ahead.
+
+Env:
+  FACTCHECK_WORKERS        default 4
+  FACTCHECK_QUEUE_MAX      default 256
+  FACTCHECK_MAX_SESSIONS   default 512 sessions of results kept (6 h each)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import os
+from dataclasses import dataclass, field
+
+from models.session import FactCheckResult
+from services import claims, factcheck_cache
+from services.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+MIN_CLAIM_CHARS = 10
+SESSION_TTL_SECONDS = 6 * 3600
+# Queue priorities: claims a report is waiting on go before background work.
+PRIORITY_REPORT = 0
+PRIORITY_BACKGROUND = 1
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name) or default)
+    except ValueError:
+        return default
+
+
+def claim_of(transcript: str) -> str | None:
+    """The claim fact-checked for an answer (the report uses the same extraction)."""
+    claim = (claims.extract_claim_simple(transcript) or "").strip()
+    return claim if len(claim) >= MIN_CLAIM_CHARS else None
+
+
+@dataclass
+class _SessionChecks:
+    by_claim: dict[str, asyncio.Future] = field(default_factory=dict)
+    by_answer: dict[int, str] = field(default_factory=dict)
+
+
+def _retrieve(fut: asyncio.Future) -> None:
+    # Mark a failure as seen, so an answer nobody reports on doesn't log "never retrieved".
+    if not fut.cancelled():
+        fut.exception()
+
+
+class FactCheckWorker:
+    def __init__(self, workers: int = 4, queue_max: int = 256, max_sessions: int = 512, verify=None) -> None:
+        self.workers = max(1, workers)
+        self.queue_max = max(1, queue_max)
+        self._verify = verify  # async (claim) -> FactCheckResult; default factcheck_cache.get_or_verify
+        self._sessions = TTLCache(max_entries=max_sessions, ttl_seconds=SESSION_TTL_SECONDS, name="factcheck_sessions")
+        self._queue: asyncio.PriorityQueue | None = None
+        self._loop = None
+        self._tasks: list[asyncio.Task] = []
+        self._started: set[asyncio.Future] = set()
+        self._overflow: set[asyncio.Task] = set()
+        self._seq = itertools.count()
+        self._busy = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.report_waits = 0
+        self.report_stragglers = 0
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._tasks and self._loop is loop and not any(t.done() for t in self._tasks):
+            return
+        if self._loop is not loop:
+            # Futures from another (finished) loop can't be awaited here.
+            self._sessions.clear()
+        self._loop = loop
+        self._queue = asyncio.PriorityQueue(maxsize=self.queue_max)
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+
+    def _session(self, session_id: str) -> _SessionChecks:
+        checks = self._sessions.get(session_id)
+        if checks is None:
+            checks = _SessionChecks()
+            self._sessions.set(session_id, checks)
+        return checks
+
+    def _enqueue(self, checks: _SessionChecks, claim: str, priority: int) -> asyncio.Future | None:
+        fut = checks.by_claim.get(claim)
+        if fut is not None:
+            if priority == PRIORITY_REPORT and not fut.done() and fut not in self._started:
+                # Still queued as background work: queue it again at report priority.
+                try:
+                    self._queue.put_nowait((priority, next(self._seq), claim, fut))
+                except asyncio.QueueFull:
+                    # Behind a full queue of background work: run it now; the queued entry is skipped.
+                    self._run_overflow(claim, fut)
+            return fut
+        fut = self._loop.create_future()
+        fut.add_done_callback(_retrieve)
+        try:
+            self._queue.put_nowait((priority, next(self._seq), claim, fut))
+        except asyncio.QueueFull:
+            if priority == PRIORITY_BACKGROUND:
+                self.dropped += 1
+                return None
+            # The report can't be turned away: check this claim in its own task instead.
+            self._run_overflow(claim, fut)
+        checks.by_claim[claim] = fut
+        self.submitted += 1
+        return fut
+
+    def _run_overflow(self, claim: str, fut: asyncio.Future) -> None:
+        task = asyncio.create_task(self._check(claim, fut))
+        self._overflow.add(task)
+        task.add_done_callback(self._overflow.discard)
+
+    # --- public API ---
+
+    def submit(self, session_id: str, question_number: int, transcript: str) -> None:
+        """Queue the fact-check for one answer; returns at once (called right after transcription)."""
+        claim = claim_of(transcript)
+        if claim is None:
+            return
+        self._ensure_started()
+        checks = self._session(session_id)
+        checks.by_answer[question_number] = claim
+        self._enqueue(checks, claim, PRIORITY_BACKGROUND)
+
+    async def collect(
+        self, session_id: str, claims_to_check: list[str], timeout: float
+    ) -> list[FactCheckResult | Exception | None]:
+        """
+        Results for these claims, in order: a FactCheckResult, the exception a check failed with,
+        or None if it was still running after `timeout` seconds. Claims not yet submitted are
+        queued first, ahead of background work. Unfinished checks keep running.
+        """
+        if not claims_to_check:
+            return []
+        self._ensure_started()
+        checks = self._session(session_id)
+        futures = [self._enqueue(checks, c, PRIORITY_REPORT) for c in claims_to_check]
+        pending = [f for f in futures if not f.done()]
+        self.report_waits += 1
+        if pending:
+            self.report_stragglers += len(pending)
+            await asyncio.wait(pending, timeout=timeout)
+        out: list[FactCheckResult | Exception | None] = []
+        for fut in futures:
+            if not fut.done():
+                out.append(None)
+            elif fut.cancelled():
+                out.append(asyncio.CancelledError())
+            else:
+                out.append(fut.exception() or fut.result())
+        return out
+
+    def results(self, session_id: str) -> dict[int, FactCheckResult]:
+        """Finished fact-checks for a session, by question number."""
+        checks = self._sessions.get(session_id)
+        if checks is None:
+            return {}
+        out: dict[int, FactCheckResult] = {}
+        for question_number, claim in sorted(checks.by_answer.items()):
+            fut = checks.by_claim.get(claim)
+            if fut is not None and fut.done() and not fut.cancelled() and fut.exception() is None:
+                out[question_number] = fut.result().model_copy(update={"claim": claim})
+        return out
+
+    async def close(self) -> None:
+        """Stop the workers and give up on queued checks (FastAPI lifespan shutdown)."""
+        tasks = [*self._tasks, *self._overflow]
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        if self._queue is not None:
+            while not self._queue.empty():
+                *_, fut = self._queue.get_nowait()
+                fut.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "busy": self._busy,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "queue_max": self.queue_max,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "report_waits": self.report_waits,
+            "report_stragglers": self.report_stragglers,
+            "sessions": len(self._sessions),
+        }
+
+    # --- workers ---
+
+    async def _check(self, claim: str, fut: asyncio.Future) -> None:
+        self._started.add(fut)
+        self._busy += 1
+        try:
+            verify = self._verify or factcheck_cache.get_or_verify
+            result = await verify(claim)
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except Exception as exc:
+            self.failed += 1
+            logger.warning("Background fact-check failed for %r.", claim[:80], exc_info=True)
+            if not fut.done():
+                fut.set_exception(exc)
+        else:
+            self.completed += 1
+            if not fut.done():
+                fut.set_result(result)
+        finally:
+            self._busy -= 1
+            self._started.discard(fut)
+
+    async def _run(self) -> None:
+        while True:
+            *_, claim, fut = await self._queue.get()
+            try:
+                # A claim can be queued twice (background, then report priority); run it once.
+                if not fut.done() and fut not in self._started:
+                    await self._check(claim, fut)
+            finally:
+                self._queue.task_done()
+
+
+_worker = FactCheckWorker(
+    workers=_int_env("FACTCHECK_WORKERS", 4),
+    queue_max=_int_env("FACTCHECK_QUEUE_MAX", 256),
+    max_sessions=_int_env("FACTCHECK_MAX_SESSIONS", 512),
+)
+
+
+def submit(session_id: str, question_number: int, transcript: str) -> None:
+    _worker.submit(session_id, question_number, transcript)
+
+
+async def collect(session_id: str, claims_to_check: list[str], timeout: float) -> list[FactCheckResult | Exception | None]:
+    return await _worker.collect(session_id, claims_to_check, timeout)
+
+
+def results(session_id: str) -> dict[int, FactCheckResult]:
+    return _worker.results(session_id)
+
+
+async def close() -> None:
+    await _worker.close()
+
+
+def stats() -> dict:
+    return _worker.stats()
@@ -0,0 +1,259 @@
+"""Append-only local journal for queued Neo4j writes (see services.graph_writer).
+
+Every row submitted to the graph writer is appended here before it is queued, and an ack is
+appended once its batch commits. Rows that are never acked (Neo4j down, process killed) are
+replayed on the next start and whenever Neo4j recovers; replay is idempotent because the
+writes MERGE on answer_id / decision_id.
+
+File format: one JSON object per line.
+  {"seq": 12, "kind": "answer", "row": {...}}    a pending write
+  {"ack": [10, 12]}                               seqs 10..12 (inclusive) committed
+
+Appends are plain buffered writes (no syscall wait on the request path); fsync runs in a
+worker thread at most every GRAPH_JOURNAL_FSYNC_MS. Compaction rewrites the file with only
+unacked rows once it grows past GRAPH_JOURNAL_COMPACT_BYTES; the rewrite also runs in a worker
+thread, and the file handle is only swapped under the same lock fsync holds, so an fsync never
+lands on a closed or reused descriptor.
+
+Env:
+  GRAPH_JOURNAL_PATH           default backend/data/graph_journal.jsonl ("off" disables)
+  GRAPH_JOURNAL_FSYNC_MS       default 100
+  GRAPH_JOURNAL_COMPACT_BYTES  default 8 MiB
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = Path(__file__).resolve().parent.parent / "data" / "graph_journal.jsonl"
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name) or default)
+    except ValueError:
+        return default
+
+
+def path_from_env() -> Path | None:
+    raw = (os.getenv("GRAPH_JOURNAL_PATH") or "").strip()
+    if raw.lower() in ("off", "none", "false", "0"):
+        return None
+    return Path(raw) if raw else DEFAULT_PATH
+
+
+class GraphJournal:
+    def __init__(self, path: Path, fsync_ms: int = 100, compact_bytes: int = 8 * 1024 * 1024) -> None:
+        self.path = Path(path)
+        self.fsync_seconds = max(0, fsync_ms) / 1000.0
+        self.compact_bytes = max(4096, compact_bytes)
+        self._fh = None
+        self._next_seq = 1
+        self._pending: dict[int, tuple[str, dict]] = {}
+        self._dirty = False
+        self._acked_since_compact = 0
+        self._sync_task: asyncio.Task | None = None
+        self._compact_task: asyncio.Task | None = None
+        # Held by sync() across its fsync and by compact() across the handle swap.
+        self._io_lock = asyncio.Lock()
+        self.appended = 0
+        self.acked = 0
+        self.fsyncs = 0
+        self.compactions = 0
+
+    # --- lifecycle ---
+
+    def open(self) -> list[tuple[int, str, dict]]:
+        """Load unacked rows (in seq order), compact, and open for appending."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            with self.path.open("r", encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        # A torn final line from a crash mid-append; everything before it is intact.
+                        continue
+                    if "ack" in rec:
+                        lo, hi = rec["ack"]
+                        for seq in range(int(lo), int(hi) + 1):
+                            self._pending.pop(seq, None)
+                    elif "seq" in rec:
+                        seq = int(rec["seq"])
+                        self._pending[seq] = (rec["kind"], rec["row"])
+                        self._next_seq = max(self._next_seq, seq + 1)
+        # Startup, before anything is served: a blocking rewrite is fine here.
+        _write_compacted(self.path, self.pending())
+        self._fh = self.path.open("a", encoding="utf-8")
+        self._dirty = False
+        self._acked_since_compact = 0
+        if self._pending:
+            logger.warning("Graph journal: %d unacked writes to replay from %s", len(self._pending), self.path)
+        return self.pending()
+
+    def start_sync(self) -> None:
+        if self.fsync_seconds and (self._sync_task is None or self._sync_task.done()):
+            self._sync_task = asyncio.create_task(self._sync_loop())
+
+    async def close(self) -> None:
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            try:
+                await self._sync_task
+            except asyncio.CancelledError:
+                pass
+            self._sync_task = None
+        if self._compact_task is not None:
+            await self._compact_task
+            self._compact_task = None
+        if self._fh is not None:
+            await self.sync()
+            async with self._io_lock:
+                self._fh.close()
+                self._fh = None
+
+    # --- records ---
+
+    def append(self, kind: str, row: dict) -> int:
+        seq = self._next_seq
+        self._next_seq += 1
+        self._write_line({"seq": seq, "kind": kind, "row": row})
+        self._pending[seq] = (kind, row)
+        self.appended += 1
+        return seq
+
+    def ack(self, seqs: list[int]) -> None:
+        """Mark rows committed. `seqs` need not be contiguous; they're written as ranges."""
+        if not seqs:
+            return
+        for lo, hi in _ranges(sorted(seqs)):
+            self._write_line({"ack": [lo, hi]})
+        for seq in seqs:
+            if self._pending.pop(seq, None) is not None:
+                self.acked += 1
+                self._acked_since_compact += 1
+        self.maybe_compact()
+
+    def pending(self) -> list[tuple[int, str, dict]]:
+        return [(seq, kind, row) for seq, (kind, row) in sorted(self._pending.items())]
+
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    # --- durability ---
+
+    async def sync(self) -> None:
+        """fsync buffered appends (in a worker thread)."""
+        async with self._io_lock:
+            if self._fh is None or not self._dirty:
+                return
+            self._fh.flush()
+            self._dirty = False
+            await asyncio.to_thread(os.fsync, self._fh.fileno())
+            self.fsyncs += 1
+
+    async def _sync_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.fsync_seconds)
+            try:
+                await self.sync()
+            except OSError:
+                logger.exception("Graph journal fsync failed.")
+
+    def maybe_compact(self) -> bool:
+        """Start a rewrite with only unacked rows once the file is large and mostly acked."""
+        if self._fh is None or self._acked_since_compact <= len(self._pending):
+            return False
+        if self._compact_task is not None and not self._compact_task.done():
+            return False
+        try:
+            size = self.path.stat().st_size
+        except OSError:
+            return False
+        if size < self.compact_bytes:
+            return False
+        self._compact_task = asyncio.create_task(self.compact())
+        return True
+
+    async def compact(self) -> None:
+        """Rewrite the file with only unacked rows (in a worker thread), then swap the handle."""
+        async with self._io_lock:
+            if self._fh is None:
+                return
+            snapshot = self.pending()
+            kept = {seq for seq, _, _ in snapshot}
+            self._acked_since_compact = 0
+            try:
+                await asyncio.to_thread(_write_compacted, self.path, snapshot)
+            except OSError:
+                logger.exception("Graph journal compaction failed; keeping the current file.")
+                return
+            # Back on the event loop, so no append or ack can interleave with the swap. Lines
+            # written to the old file while the rewrite ran are written again to the new one.
+            self._fh.close()
+            self._fh = self.path.open("a", encoding="utf-8")
+            self._dirty = False
+            for seq, kind, row in self.pending():
+                if seq not in kept:
+                    self._write_line({"seq": seq, "kind": kind, "row": row})
+            acked = sorted(kept.difference(self._pending))
+            if acked:
+                for lo, hi in _ranges(acked):
+                    self._write_line({"ack": [lo, hi]})
+            self.compactions += 1
+
+    def _write_line(self, rec: dict) -> None:
+        self._fh.write(json.dumps(rec, separators=(",", ":")) + "\n")
+        self._dirty = True
+
+    def stats(self) -> dict:
+        try:
+            size = self.path.stat().st_size
+        except OSError:
+            size = 0
+        return {
+            "path": str(self.path),
+            "bytes": size,
+            "pending": len(self._pending),
+            "appended": self.appended,
+            "acked": self.acked,
+            "fsyncs": self.fsyncs,
+            "compactions": self.compactions,
+        }
+
+
+def _write_compacted(path: Path, rows: list[tuple[int, str, dict]]) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("w", encoding="utf-8") as fh:
+        for seq, kind, row in rows:
+            fh.write(json.dumps({"seq": seq, "kind": kind, "row": row}, separators=(",", ":")) + "\n")
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
+def _ranges(seqs: list[int]):
+    lo = prev = seqs[0]
+    for seq in seqs[1:]:
+        if seq != prev + 1:
+            yield lo, prev
+            lo = seq
+        prev = seq
+    yield lo, prev
+
+
+def from_env() -> GraphJournal | None:
+    path = path_from_env()
+    if path is None:
+        return None
+    return GraphJournal(
+        path,
+        fsync_ms=_int_env("GRAPH_JOURNAL_FSYNC_MS", 100),
+        compact_bytes=_int_env("GRAPH_JOURNAL_COMPACT_BYTES", 8 * 1024 * 1024),
+    )
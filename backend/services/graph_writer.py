@@ -0,0 +1,314 @@
+"""Write-behind queue for Neo4j memory writes.
+
+memory.ingest_answer / ingest_decision enqueue a row and return; one background worker drains
+the queue and writes everything pending — across all sessions — with one UNWIND transaction
+per batch (memory.write_batch). A batch is written when it reaches GRAPH_WRITE_BATCH_SIZE rows
+or GRAPH_WRITE_FLUSH_MS after its first row, whichever comes first.
+
+- Backpressure: the queue is bounded (GRAPH_WRITE_QUEUE_MAX); submit() waits for room.
+- Retries: a failed batch is retried GRAPH_WRITE_MAX_RETRIES times with exponential backoff.
+- Durability: rows are appended to services.graph_journal before being queued and acked once
+  committed. A batch that still fails is deferred (kept in the journal) and replayed every
+  GRAPH_WRITE_REPLAY_SECONDS until Neo4j is back; unacked rows from a previous run are
+  replayed at startup. With the journal disabled, such batches are dropped and counted.
+- flush(): waits until everything submitted before the call is written or dropped. end_session,
+  report generation and the session graph endpoint call it before reading the graph back.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+
+from services import graph_journal
+
+logger = logging.getLogger(__name__)
+
+RETRY_BACKOFF_SECONDS = 0.5
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name) or default)
+    except ValueError:
+        return default
+
+
+class GraphWriter:
+    def __init__(
+        self,
+        batch_size: int = 100,
+        flush_ms: int = 200,
+        queue_max: int = 2000,
+        max_retries: int = 3,
+        journal=None,
+        replay_seconds: float = 30.0,
+        write_batch=None,
+    ) -> None:
+        self.batch_size = max(1, batch_size)
+        self.flush_seconds = max(0, flush_ms) / 1000.0
+        self.queue_max = max(1, queue_max)
+        self.max_retries = max(0, max_retries)
+        self.journal = journal  # services.graph_journal.GraphJournal or None
+        self.replay_seconds = max(1.0, replay_seconds)
+        self._write_batch = write_batch  # async (answers, decisions) -> None; default memory.write_batch
+        self._journal_open = False
+        self._deferred: set[int] = set()
+        self._replayer: asyncio.Task | None = None
+        self._replay_lock = asyncio.Lock()
+        self._queue: asyncio.Queue | None = None
+        self._loop = None
+        self._worker: asyncio.Task | None = None
+        self._flush_now: asyncio.Event | None = None
+        self._progress: asyncio.Condition | None = None
+        self._submitted = 0
+        self._completed = 0  # rows written or dropped, in submission order
+        self.batches = 0
+        self.rows_written = 0
+        self.dropped_rows = 0
+        self.replayed_rows = 0
+        self.retries = 0
+        self.last_batch_ms: float | None = None
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._worker is not None and self._loop is loop and not self._worker.done():
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.queue_max)
+        self._flush_now = asyncio.Event()
+        self._progress = asyncio.Condition()
+        self._submitted = self._completed = 0
+        if self.journal is not None:
+            if not self._journal_open:
+                self._deferred.update(seq for seq, _, _ in self.journal.open())
+                self._journal_open = True
+            self.journal.start_sync()
+            self._replayer = asyncio.create_task(self._replay_loop())
+        self._worker = asyncio.create_task(self._run())
+
+    async def start(self) -> None:
+        """Open the journal and start the worker + replay of unacked rows (FastAPI lifespan)."""
+        self._ensure_started()
+
+    async def submit(self, kind: str, row: dict) -> None:
+        """Journal and queue one row ("answer" or "decision"); waits while the queue is full."""
+        self._ensure_started()
+        seq = self.journal.append(kind, row) if self.journal is not None else None
+        await self._queue.put((seq, kind, row))
+        self._submitted += 1
+
+    async def flush(self, timeout: float | None = 30.0) -> bool:
+        """Wait for every row submitted so far. Returns False on timeout."""
+        if self._worker is None or self._loop is not asyncio.get_running_loop():
+            return True
+        target = self._submitted
+        if self._completed >= target:
+            return True
+        self._flush_now.set()
+
+        async def _wait() -> None:
+            async with self._progress:
+                await self._progress.wait_for(lambda: self._completed >= target)
+
+        try:
+            await asyncio.wait_for(_wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning("Graph write flush timed out with %d rows pending.", target - self._completed)
+            return False
+
+    async def _next_batch(self) -> list[tuple[int | None, str, dict]]:
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.flush_seconds
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._flush_now.is_set():
+                break
+            get = asyncio.ensure_future(self._queue.get())
+            flush = asyncio.ensure_future(self._flush_now.wait())
+            done, _ = await asyncio.wait({get, flush}, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            flush.cancel()
+            if get in done:
+                batch.append(get.result())
+            else:
+                get.cancel()
+                break
+        if self._queue.empty():
+            self._flush_now.clear()
+        return batch
+
+    def _writer_fn(self):
+        if self._write_batch is not None:
+            return self._write_batch
+        from services import memory
+
+        return memory.write_batch
+
+    async def _write(self, batch: list[tuple[int | None, str, dict]]) -> None:
+        write_batch = self._writer_fn()
+        answers = [row for _, kind, row in batch if kind == "answer"]
+        decisions = [row for _, kind, row in batch if kind == "decision"]
+        seqs = [seq for seq, _, _ in batch if seq is not None]
+        for attempt in range(self.max_retries + 1):
+            t0 = time.perf_counter()
+            try:
+                await write_batch(answers, decisions)
+                if self.journal is not None:
+                    self.journal.ack(seqs)
+                self.batches += 1
+                self.rows_written += len(batch)
+                self.last_batch_ms = round((time.perf_counter() - t0) * 1000, 1)
+                logger.info(
+                    "Graph write batch: answers=%d decisions=%d in %.0fms",
+                    len(answers),
+                    len(decisions),
+                    self.last_batch_ms,
+                )
+                return
+            except Exception as exc:
+                if attempt >= self.max_retries:
+                    if self.journal is not None:
+                        self._deferred.update(seqs)
+                        outcome = "deferred to journal replay"
+                    else:
+                        self.dropped_rows += len(batch)
+                        outcome = "dropped"
+                    logger.error(
+                        "Graph write batch %s after %d attempts (%s): answers=%d decisions=%d",
+                        outcome,
+                        attempt + 1,
+                        type(exc).__name__,
+                        len(answers),
+                        len(decisions),
+                    )
+                    return
+                self.retries += 1
+                await asyncio.sleep(RETRY_BACKOFF_SECONDS * (2 ** attempt))
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+                async with self._progress:
+                    self._completed += len(batch)
+                    self._progress.notify_all()
+
+    async def replay_deferred(self) -> int:
+        """Write journaled rows that previous attempts (or runs) couldn't; stops at the first failure."""
+        if not self._deferred or self.journal is None:
+            return 0
+        async with self._replay_lock:
+            return await self._replay_deferred()
+
+    async def _replay_deferred(self) -> int:
+        write_batch = self._writer_fn()
+        rows = {seq: (kind, row) for seq, kind, row in self.journal.pending()}
+        todo = sorted(seq for seq in self._deferred if seq in rows)
+        self._deferred.intersection_update(todo)
+        replayed = 0
+        for i in range(0, len(todo), self.batch_size):
+            chunk = todo[i : i + self.batch_size]
+            answers = [rows[seq][1] for seq in chunk if rows[seq][0] == "answer"]
+            decisions = [rows[seq][1] for seq in chunk if rows[seq][0] == "decision"]
+            try:
+                await write_batch(answers, decisions)
+            except Exception as exc:
+                logger.info("Graph journal replay paused (%s); %d rows pending.", type(exc).__name__, len(todo) - i)
+                break
+            self.journal.ack(chunk)
+            self._deferred.difference_update(chunk)
+            replayed += len(chunk)
+        if replayed:
+            self.replayed_rows += replayed
+            logger.info("Graph journal replayed %d rows.", replayed)
+        return replayed
+
+    async def _replay_loop(self) -> None:
+        while True:
+            try:
+                await self.replay_deferred()
+            except Exception:
+                logger.exception("Graph journal replay failed.")
+            await asyncio.sleep(self.replay_seconds)
+
+    async def close(self, timeout: float | None = 30.0) -> None:
+        """Flush pending rows and stop the worker (FastAPI lifespan shutdown)."""
+        if self._worker is None:
+            return
+        try:
+            if self._loop is asyncio.get_running_loop():
+                await self.flush(timeout=timeout)
+        finally:
+            for task in (self._worker, self._replayer):
+                if task is None:
+                    continue
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+            self._worker = self._replayer = None
+            if self.journal is not None:
+                await self.journal.close()
+                self._journal_open = False
+
+    def stats(self) -> dict:
+        return {
+            "pending": (self._queue.qsize() if self._queue is not None else 0),
+            "queue_max": self.queue_max,
+            "batch_size": self.batch_size,
+            "batches": self.batches,
+            "rows_written": self.rows_written,
+            "dropped_rows": self.dropped_rows,
+            "deferred_rows": len(self._deferred),
+            "replayed_rows": self.replayed_rows,
+            "retries": self.retries,
+            "last_batch_ms": self.last_batch_ms,
+            "journal": self.journal.stats() if self.journal is not None else None,
+        }
+
+
+_writer = GraphWriter(
+    batch_size=_int_env("GRAPH_WRITE_BATCH_SIZE", 100),
+    flush_ms=_int_env("GRAPH_WRITE_FLUSH_MS", 200),
+    queue_max=_int_env("GRAPH_WRITE_QUEUE_MAX", 2000),
+    max_retries=_int_env("GRAPH_WRITE_MAX_RETRIES", 3),
+    journal=graph_journal.from_env(),
+    replay_seconds=_int_env("GRAPH_WRITE_REPLAY_SECONDS", 30),
+)
+
+
+async def start() -> None:
+    """Lifespan startup: replay journaled rows from a previous run (not in stub mode)."""
+    from services import memory
+
+    if memory.is_enabled():
+        await _writer.start()
+
+
+async def submit(kind: str, row: dict) -> None:
+    await _writer.submit(kind, row)
+
+
+async def flush(timeout: float | None = 30.0) -> bool:
+    return await _writer.flush(timeout=timeout)
+
+
+async def close() -> None:
+    await _writer.close()
+
+
+def stats() -> dict:
+    return _writer.stats()
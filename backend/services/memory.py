@@ -1,17 +1,24 @@
 """Neo4j-backed memory/profile store (hackathon demo friendly).
 
 Fastino is used for GLiNER/Pioneer in this repo; Neo4j stores longitudinal user/session data.
-If Neo4j env vars are missing, this module runs in stub mode (no-op writes, empty reads).
+MEMORY_BACKEND=sqlite swaps in the embedded store in services.memory_sqlite (same functions,
+same semantics; no server needed). If Neo4j env vars are missing and no backend is chosen,
+this module runs in stub mode (no-op writes, empty reads).
 """
 
 from __future__ import annotations
 
 import logging
 import os
+import time
 from collections import Counter
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any
 
+from services import memory_sqlite, retrieval
+from services.cache import SingleFlight, TTLCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,21 +27,51 @@ def _env(name: str) -> str | None:
     return v.strip() if v and v.strip() else None
 
 
-def _neo4j_enabled() -> bool:
-    enabled = bool(_env("NEO4J_URI") and _env("NEO4J_USERNAME") and _env("NEO4J_PASSWORD"))
-    if not enabled:
-        # This will run often, so keep it to info-level only.
-        logger.info("Neo4j stub: required env vars missing; memory/profile features will use stub responses.")
-    return enabled
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name) or default)
+    except ValueError:
+        return default
+
+
+def _neo4j_configured() -> bool:
+    return bool(_env("NEO4J_URI") and _env("NEO4J_USERNAME") and _env("NEO4J_PASSWORD"))
+
+
+def backend() -> str | None:
+    """"neo4j", "sqlite", or None (stub mode). MEMORY_BACKEND picks; default is Neo4j when configured."""
+    choice = (_env("MEMORY_BACKEND") or "").lower()
+    if choice == "sqlite":
+        return "sqlite"
+    if choice not in ("stub", "off", "none") and _neo4j_configured():
+        return "neo4j"
+    # This will run often, so keep it to info-level only.
+    logger.info("Memory stub: no backend configured; memory/profile features will use stub responses.")
+    return None
+
+
+def _enabled() -> bool:
+    return backend() is not None
+
+
+def is_enabled() -> bool:
+    """Public check for UI: whether a memory backend is configured so the context graph can be persisted and shown."""
+    return _enabled()
 
 
 def is_neo4j_configured() -> bool:
-    """Public check for UI: whether Neo4j is configured so the context graph can be persisted and shown."""
-    return _neo4j_enabled()
+    """Whether Neo4j connection env vars are set (schema migrations, Neo4j-only scripts)."""
+    return _neo4j_configured()
+
+
+def _now() -> datetime:
+    """UTC now; the driver sends aware datetimes as native DateTime values."""
+    return datetime.now(timezone.utc)
 
 
 def _now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat()
+    """For queued rows, which must stay JSON (graph journal); queries apply datetime(row.now)."""
+    return _now().isoformat()
 
 
 _driver = None
@@ -44,14 +81,18 @@ def _get_driver():
     global _driver
     if _driver is not None:
         return _driver
-    if not _neo4j_enabled():
+    if not _neo4j_configured():
         return None
     try:
         from neo4j import AsyncGraphDatabase
 
+        # Schema (constraints) is applied once at startup by services.memory_schema. Relationship
+        # types that don't exist yet (fresh database) only produce UNRECOGNIZED notifications,
+        # which are disabled here rather than pre-created with placeholder nodes.
         _driver = AsyncGraphDatabase.driver(
             _env("NEO4J_URI"),
             auth=(_env("NEO4J_USERNAME"), _env("NEO4J_PASSWORD")),
+            notifications_disabled_classifications=["UNRECOGNIZED"],
         )
         return _driver
     except Exception:
@@ -59,72 +100,56 @@ def _get_driver():
         return None
 
 
-async def _ensure_schema() -> None:
-    """Best-effort constraints; safe to call repeatedly."""
-    driver = _get_driver()
-    if driver is None:
-        return
-    db = _env("NEO4J_DATABASE")
-    try:
-        async with driver.session(database=db) as session:
-            # Neo4j editions vary; constraints may fail harmlessly.
-            await session.run("CREATE CONSTRAINT user_id IF NOT EXISTS FOR (u:User) REQUIRE u.user_id IS UNIQUE")
-            await session.run("CREATE CONSTRAINT session_id IF NOT EXISTS FOR (s:Session) REQUIRE s.session_id IS UNIQUE")
-            await session.run("CREATE CONSTRAINT answer_id IF NOT EXISTS FOR (a:Answer) REQUIRE a.answer_id IS UNIQUE")
-            await session.run(
-                "CREATE CONSTRAINT decision_id IF NOT EXISTS FOR (d:Decision) REQUIRE d.decision_id IS UNIQUE"
-            )
-            await session.run(
-                "CREATE CONSTRAINT entity_key IF NOT EXISTS FOR (e:Entity) REQUIRE (e.label, e.text) IS UNIQUE"
-            )
-            # Pre-create relationship types we use so Neo4j doesn't warn
-            # about unknown types on first queries.
-            await session.run(
-                """
-                MERGE (a:__SchemaDummy {id: 1})
-                MERGE (b:__SchemaDummy {id: 2})
-                MERGE (a)-[:MENTIONS]->(b)
-                MERGE (a)-[:HAS_SESSION]->(b)
-                MERGE (a)-[:HAS_ANSWER]->(b)
-                MERGE (a)-[:HAS_DECISION]->(b)
-                MERGE (a)-[:LED_TO]->(b)
-                MERGE (a)-[:PRECEDENT_FOR]->(b)
-                """
-            )
-    except Exception:
-        logger.exception("Neo4j constraints creation failed (non-fatal)")
+async def close_driver() -> None:
+    """Close the shared driver and the SQLite store, if open (FastAPI lifespan shutdown)."""
+    global _driver
+    memory_sqlite.close()
+    if _driver is not None:
+        try:
+            await _driver.close()
+        finally:
+            _driver = None
+
+
+_REGISTER_USER = """
+MERGE (u:User {user_id: $user_id})
+ON CREATE SET u.agg_version = $agg_version
+SET u.updated_at = $now,
+    u.role = coalesce($role, u.role),
+    u.company = coalesce($company, u.company),
+    u.level = coalesce($level, u.level),
+    u.difficulty = coalesce($difficulty, u.difficulty)
+"""
 
 
 async def register_user(user_id: str, metadata: dict[str, Any]) -> bool:
     """Upsert user node with basic metadata."""
-    if not _neo4j_enabled():
+    if not _enabled():
         return True
-    await _ensure_schema()
-    driver = _get_driver()
-    if driver is None:
-        return True
-    db = _env("NEO4J_DATABASE")
+    params = {
+        "role": metadata.get("role"),
+        "company": metadata.get("target_company") or metadata.get("company"),
+        "level": str(metadata.get("level")) if metadata.get("level") is not None else None,
+        "difficulty": str(metadata.get("difficulty")) if metadata.get("difficulty") is not None else None,
+    }
     try:
-        async with driver.session(database=db) as session:
+        if backend() == "sqlite":
+            await memory_sqlite.register_user(user_id, _now(), AGGREGATES_VERSION, **params)
+            return True
+        driver = _get_driver()
+        if driver is None:
+            return True
+        async with driver.session(database=_env("NEO4J_DATABASE")) as session:
             await session.run(
-                """
-                MERGE (u:User {user_id: $user_id})
-                SET u.updated_at = $now,
-                    u.role = coalesce($role, u.role),
-                    u.company = coalesce($company, u.company),
-                    u.level = coalesce($level, u.level),
-                    u.difficulty = coalesce($difficulty, u.difficulty)
-                """,
+                _REGISTER_USER,
                 user_id=user_id,
-                now=_now_iso(),
-                role=metadata.get("role"),
-                company=metadata.get("target_company") or metadata.get("company"),
-                level=str(metadata.get("level")) if metadata.get("level") is not None else None,
-                difficulty=str(metadata.get("difficulty")) if metadata.get("difficulty") is not None else None,
+                now=_now(),
+                agg_version=AGGREGATES_VERSION,
+                **params,
             )
         return True
     except Exception:
-        logger.exception("Neo4j register_user failed")
+        logger.exception("Memory register_user failed (%s)", backend())
         return True
 
 
@@ -143,64 +168,34 @@ async def ingest_answer(
     yutori_correct: bool | None,
     extracted_entities: list[dict] | None = None,
 ) -> None:
-    """Persist answer + entities for later retrieval/summaries."""
-    if not _neo4j_enabled():
-        return
-    await _ensure_schema()
-    driver = _get_driver()
-    if driver is None:
+    """
+    Persist answer + entities for later retrieval/summaries.
+    Queued write-behind (services.graph_writer); call flush_writes() before reading it back.
+    """
+    if not _enabled():
         return
-    db = _env("NEO4J_DATABASE")
-    try:
-        answer_id = f"{session_id}:q{question_number}"
-        entities = extracted_entities or []
-        async with driver.session(database=db) as session:
-            await session.run(
-                """
-                MERGE (u:User {user_id: $user_id})
-                SET u.updated_at = $now
-                MERGE (s:Session {session_id: $session_id})
-                SET s.user_id = $user_id,
-                    s.role = $role,
-                    s.company = $company,
-                    s.updated_at = $now
-                MERGE (u)-[:HAS_SESSION]->(s)
-                MERGE (a:Answer {answer_id: $answer_id})
-                SET a.session_id = $session_id,
-                    a.question_number = $question_number,
-                    a.question = $question,
-                    a.transcript = $transcript,
-                    a.duration_seconds = $duration_seconds,
-                    a.stress = $stress,
-                    a.confidence = $confidence,
-                    a.yutori_correct = $yutori_correct,
-                    a.created_at = coalesce(a.created_at, $now),
-                    a.updated_at = $now
-                MERGE (s)-[:HAS_ANSWER]->(a)
-                WITH a
-                UNWIND $entities AS ent
-                WITH a, ent
-                WHERE ent IS NOT NULL AND ent.text IS NOT NULL AND ent.label IS NOT NULL
-                MERGE (e:Entity {label: ent.label, text: ent.text})
-                MERGE (a)-[:MENTIONS]->(e)
-                """,
-                user_id=user_id,
-                session_id=session_id,
-                role=role,
-                company=company,
-                answer_id=answer_id,
-                question_number=question_number,
-                question=question[:400],
-                transcript=(transcript or "")[:4000],
-                duration_seconds=int(duration_seconds or 0),
-                stress=float(stress) if stress is not None else None,
-                confidence=float(confidence) if confidence is not None else None,
-                yutori_correct=bool(yutori_correct) if yutori_correct is not None else None,
-                entities=[{"label": e.get("label"), "text": e.get("text")} for e in entities if isinstance(e, dict)],
-                now=_now_iso(),
-            )
-    except Exception:
-        logger.exception("Neo4j ingest_answer failed.")
+    from services import graph_writer
+
+    entities = extracted_entities or []
+    await graph_writer.submit(
+        "answer",
+        {
+            "user_id": user_id,
+            "session_id": session_id,
+            "role": role,
+            "company": company,
+            "answer_id": f"{session_id}:q{question_number}",
+            "question_number": question_number,
+            "question": question[:400],
+            "transcript": (transcript or "")[:4000],
+            "duration_seconds": int(duration_seconds or 0),
+            "stress": float(stress) if stress is not None else None,
+            "confidence": float(confidence) if confidence is not None else None,
+            "yutori_correct": bool(yutori_correct) if yutori_correct is not None else None,
+            "entities": [{"label": e.get("label"), "text": e.get("text")} for e in entities if isinstance(e, dict)],
+            "now": _now_iso(),
+        },
+    )
 
 
 async def ingest_decision(
@@ -222,99 +217,255 @@ async def ingest_decision(
 
     This is the core of a context graph: Decisions are first-class nodes, linked to
     the Answer they were based on and chained to prior decisions as precedents.
+    Queued write-behind like ingest_answer.
     """
-    if not _neo4j_enabled():
+    if not _enabled():
         return
-    await _ensure_schema()
-    driver = _get_driver()
-    if driver is None:
+    from services import graph_writer
+
+    answer_id = f"{session_id}:q{question_number}"
+    await graph_writer.submit(
+        "decision",
+        {
+            "user_id": user_id,
+            "session_id": session_id,
+            "answer_id": answer_id,
+            "decision_id": f"{answer_id}:decision",
+            "prev_decision_id": f"{session_id}:q{max(1, question_number - 1)}:decision",
+            "next_decision_id": f"{session_id}:q{question_number + 1}:decision",
+            "question_number": int(question_number),
+            "tone": (tone or "")[:40],
+            "difficulty_delta": int(difficulty_delta or 0),
+            "next_question": (next_question or "")[:500],
+            "feedback_note": (feedback_note or "")[:500],
+            "reasoning": (reasoning or "")[:800] or None,
+            "stress": float(stress) if stress is not None else None,
+            "confidence": float(confidence) if confidence is not None else None,
+            "yutori_correct": bool(yutori_correct) if yutori_correct is not None else None,
+            "now": _now_iso(),
+        },
+    )
+
+
+# Running per-user aggregates, maintained at ingest so profile reads don't scan history:
+#   User.agg_answer_count, agg_stress_sum, agg_stress_sumsq, agg_conf_sum, agg_conf_sumsq
+#   (:UserLabelStat {user_id, label, count}) per entity label, linked via HAS_LABEL_STAT
+# Each Answer / MENTIONS edge is counted once (aggregated_at / counted_at markers), so journal
+# replay and re-ingest never double count. agg_version marks users whose aggregates are complete;
+# older users are backfilled (backfill_user_aggregates, scripts/backfill_user_aggregates.py).
+AGGREGATES_VERSION = 1
+
+_WRITE_ANSWERS = """
+UNWIND $rows AS row
+WITH row, datetime(row.now) AS now
+MERGE (u:User {user_id: row.user_id})
+ON CREATE SET u.agg_version = $agg_version
+SET u.updated_at = now
+MERGE (s:Session {session_id: row.session_id})
+SET s.user_id = row.user_id,
+    s.role = row.role,
+    s.company = row.company,
+    s.updated_at = now
+MERGE (u)-[:HAS_SESSION]->(s)
+MERGE (a:Answer {answer_id: row.answer_id})
+WITH u, s, a, row, now, a.aggregated_at IS NULL AS fresh
+SET a.user_id = row.user_id,
+    a.session_id = row.session_id,
+    a.question_number = row.question_number,
+    a.question = row.question,
+    a.transcript = row.transcript,
+    a.duration_seconds = row.duration_seconds,
+    a.stress = row.stress,
+    a.confidence = row.confidence,
+    a.yutori_correct = row.yutori_correct,
+    a.embedding = row.embedding,
+    a.created_at = coalesce(a.created_at, now),
+    a.updated_at = now,
+    a.aggregated_at = coalesce(a.aggregated_at, now)
+FOREACH (_ IN CASE WHEN fresh THEN [1] ELSE [] END |
+  SET u.agg_answer_count = coalesce(u.agg_answer_count, 0) + 1,
+      u.agg_stress_sum = coalesce(u.agg_stress_sum, 0.0) + coalesce(row.stress, 0.0),
+      u.agg_stress_sumsq = coalesce(u.agg_stress_sumsq, 0.0) + coalesce(row.stress, 0.0) ^ 2,
+      u.agg_conf_sum = coalesce(u.agg_conf_sum, 0.0) + coalesce(row.confidence, 0.0),
+      u.agg_conf_sumsq = coalesce(u.agg_conf_sumsq, 0.0) + coalesce(row.confidence, 0.0) ^ 2
+)
+MERGE (s)-[:HAS_ANSWER]->(a)
+WITH u, a, row, now
+UNWIND row.entities AS ent
+WITH u, a, row, now, ent
+WHERE ent IS NOT NULL AND ent.text IS NOT NULL AND ent.label IS NOT NULL
+MERGE (e:Entity {label: ent.label, text: ent.text})
+MERGE (a)-[m:MENTIONS]->(e)
+FOREACH (_ IN CASE WHEN m.counted_at IS NULL THEN [1] ELSE [] END |
+  SET m.counted_at = now
+  MERGE (ls:UserLabelStat {user_id: row.user_id, label: ent.label})
+  SET ls.count = coalesce(ls.count, 0) + 1
+  MERGE (u)-[:HAS_LABEL_STAT]->(ls)
+)
+"""
+
+# Precedent edges are merged from both ends: a decision deferred by the graph journal and replayed
+# after the next question's decision committed still gets linked, through next_decision_id.
+_WRITE_DECISIONS = """
+UNWIND $rows AS row
+WITH row, datetime(row.now) AS now
+MERGE (u:User {user_id: row.user_id})
+MERGE (s:Session {session_id: row.session_id})
+MERGE (u)-[:HAS_SESSION]->(s)
+MERGE (a:Answer {answer_id: row.answer_id})
+MERGE (d:Decision {decision_id: row.decision_id})
+SET d.session_id = row.session_id,
+    d.question_number = row.question_number,
+    d.tone = row.tone,
+    d.difficulty_delta = row.difficulty_delta,
+    d.next_question = row.next_question,
+    d.feedback_note = row.feedback_note,
+    d.reasoning = row.reasoning,
+    d.stress = row.stress,
+    d.confidence = row.confidence,
+    d.yutori_correct = row.yutori_correct,
+    d.created_at = coalesce(d.created_at, now),
+    d.updated_at = now
+MERGE (s)-[:HAS_DECISION]->(d)
+MERGE (a)-[:LED_TO]->(d)
+WITH d, row
+OPTIONAL MATCH (prev:Decision {decision_id: row.prev_decision_id})
+FOREACH (_ IN CASE WHEN prev IS NULL OR row.question_number <= 1 THEN [] ELSE [1] END |
+  MERGE (prev)-[:PRECEDENT_FOR]->(d)
+)
+WITH d, row
+OPTIONAL MATCH (next:Decision {decision_id: row.next_decision_id})
+FOREACH (_ IN CASE WHEN next IS NULL THEN [] ELSE [1] END |
+  MERGE (d)-[:PRECEDENT_FOR]->(next)
+)
+"""
+
+
+# None until the first write: whether the server takes packed VECTOR values (Bolt 6+). Older
+# servers (or a driver without neo4j.vector) get plain float lists, which
+# vector.similarity.cosine accepts as well.
+_vector_values: bool | None = None
+
+
+def _embedding_param(text: str | None):
+    """Transcript embedding as a Neo4j query parameter (Vector when supported), or None."""
+    vec = retrieval.embed_dense(text or "")
+    if vec is None:
+        return None
+    global _vector_values
+    if _vector_values is False:
+        return vec.tolist()
+    try:
+        from neo4j.vector import Vector
+    except ImportError:
+        # neo4j < 6 has no VECTOR type; float lists work with vector.similarity.cosine too.
+        _vector_values = False
+        logger.warning("neo4j driver has no neo4j.vector (driver < 6); storing embeddings as float lists.")
+        return vec.tolist()
+    return Vector.from_numpy(vec)
+
+
+async def _execute_write_with_embeddings(session, work, build) -> None:
+    """
+    session.execute_write(work, build()); when the server is too old for VECTOR values, rebuild
+    the parameters with float lists and run it again.
+    """
+    global _vector_values
+    from neo4j.exceptions import ConfigurationError
+
+    try:
+        await session.execute_write(work, build())
+        _vector_values = _vector_values is not False
+    except ConfigurationError:
+        if _vector_values is False:
+            raise
+        _vector_values = False
+        logger.warning("Neo4j server does not accept VECTOR values (Bolt < 6); storing embeddings as float lists.")
+        await session.execute_write(work, build())
+
+
+async def write_batch(answers: list[dict], decisions: list[dict]) -> None:
+    """
+    Write queued answers and decisions in one transaction (one UNWIND per kind).
+    Called by services.graph_writer; raises so the writer can retry.
+    """
+    # Precedent links need the previous decision first.
+    decisions = sorted(decisions, key=lambda r: (r["session_id"], r["question_number"]))
+    if backend() == "sqlite":
+        await memory_sqlite.write_batch(answers, decisions, AGGREGATES_VERSION)
+    else:
+        driver = _get_driver()
+        if driver is None:
+            # Not a silent no-op: the writer must keep (journal) these rows, not ack them.
+            raise RuntimeError("Neo4j driver unavailable")
+
+        async def _tx(tx, rows: list[dict]) -> None:
+            if rows:
+                await (await tx.run(_WRITE_ANSWERS, rows=rows, agg_version=AGGREGATES_VERSION)).consume()
+            if decisions:
+                await (await tx.run(_WRITE_DECISIONS, rows=decisions)).consume()
+
+        # Embeddings are attached here rather than in ingest_answer: queued rows are journaled as JSON.
+        def _rows() -> list[dict]:
+            return [{**row, "embedding": _embedding_param(row.get("transcript"))} for row in answers]
+
+        async with driver.session(database=_env("NEO4J_DATABASE")) as session:
+            await _execute_write_with_embeddings(session, _tx, _rows)
+    for user_id in {row["user_id"] for row in answers}:
+        _bump_profile_version(user_id)
+    _bump_session_graphs({row["session_id"] for row in answers} | {row["session_id"] for row in decisions})
+    if backend() == "neo4j":
+        # Neo4j scores the stored embeddings itself (get_rag_context).
         return
-    db = _env("NEO4J_DATABASE")
     try:
-        answer_id = f"{session_id}:q{question_number}"
-        decision_id = f"{answer_id}:decision"
-        prev_decision_id = f"{session_id}:q{max(1, question_number - 1)}:decision"
-        async with driver.session(database=db) as session:
-            await session.run(
-                """
-                MERGE (u:User {user_id: $user_id})
-                MERGE (s:Session {session_id: $session_id})
-                MERGE (u)-[:HAS_SESSION]->(s)
-                MERGE (a:Answer {answer_id: $answer_id})
-                MERGE (d:Decision {decision_id: $decision_id})
-                SET d.session_id = $session_id,
-                    d.question_number = $question_number,
-                    d.tone = $tone,
-                    d.difficulty_delta = $difficulty_delta,
-                    d.next_question = $next_question,
-                    d.feedback_note = $feedback_note,
-                    d.reasoning = $reasoning,
-                    d.stress = $stress,
-                    d.confidence = $confidence,
-                    d.yutori_correct = $yutori_correct,
-                    d.created_at = coalesce(d.created_at, $now),
-                    d.updated_at = $now
-                MERGE (s)-[:HAS_DECISION]->(d)
-                MERGE (a)-[:LED_TO]->(d)
-                WITH d
-                OPTIONAL MATCH (prev:Decision {decision_id: $prev_decision_id})
-                FOREACH (_ IN CASE WHEN prev IS NULL OR $question_number <= 1 THEN [] ELSE [1] END |
-                  MERGE (prev)-[:PRECEDENT_FOR]->(d)
-                )
-                """,
-                user_id=user_id,
-                session_id=session_id,
-                answer_id=answer_id,
-                decision_id=decision_id,
-                prev_decision_id=prev_decision_id,
-                question_number=int(question_number),
-                tone=(tone or "")[:40],
-                difficulty_delta=int(difficulty_delta or 0),
-                next_question=(next_question or "")[:500],
-                feedback_note=(feedback_note or "")[:500],
-                reasoning=(reasoning or "")[:800] or None,
-                stress=float(stress) if stress is not None else None,
-                confidence=float(confidence) if confidence is not None else None,
-                yutori_correct=bool(yutori_correct) if yutori_correct is not None else None,
-                now=_now_iso(),
-            )
+        await retrieval.add_answers(answers)
     except Exception:
-        logger.exception("Neo4j ingest_decision failed.")
+        # Derived data: the batch is committed, so never fail (and retry) it over the index.
+        logger.exception("Retrieval indexing failed for %d answers.", len(answers))
+
+
+async def flush_writes(timeout: float | None = 30.0) -> bool:
+    """Wait until every queued graph write so far has been committed (or given up on)."""
+    from services import graph_writer
+
+    return await graph_writer.flush(timeout=timeout)
+
+
+_SESSION_GRAPH = """
+MATCH (s:Session {session_id: $session_id})
+OPTIONAL MATCH (s)-[:HAS_ANSWER]->(a:Answer)
+WITH s, a ORDER BY a.question_number ASC
+OPTIONAL MATCH (a)-[:MENTIONS]->(e:Entity)
+WITH s, a, collect(DISTINCT e {.label, .text}) AS entity_list
+OPTIONAL MATCH (a)-[:LED_TO]->(d:Decision)
+RETURN s.session_id AS sid, s.role AS role, s.company AS company,
+       a.answer_id AS aid, a.question_number AS qnum, a.transcript AS transcript,
+       entity_list,
+       d.decision_id AS did, d.next_question AS next_q
+"""
 
 
-async def get_session_graph(session_id: str) -> dict[str, Any]:
-    """Return session subgraph for UI: nodes (Session, Answer, Entity, Decision) and edges. Stub when Neo4j disabled."""
+async def _fetch_session_graph(session_id: str) -> dict[str, Any] | None:
+    """Build the session subgraph from the memory backend. None when it can't be read (not cached)."""
     empty = {"nodes": [], "edges": [], "session_id": session_id}
-    if not _neo4j_enabled():
-        logger.info("get_session_graph: Neo4j disabled (missing env); session_id=%s", session_id)
-        return empty
-    driver = _get_driver()
-    if driver is None:
-        logger.info("get_session_graph: Neo4j driver not available; session_id=%s", session_id)
-        return empty
-    db = _env("NEO4J_DATABASE")
     try:
-        async with driver.session(database=db) as session:
-            # Session and answers
-            res = await session.run(
-                """
-                MATCH (s:Session {session_id: $session_id})
-                OPTIONAL MATCH (s)-[:HAS_ANSWER]->(a:Answer)
-                WITH s, a ORDER BY a.question_number ASC
-                OPTIONAL MATCH (a)-[:MENTIONS]->(e:Entity)
-                WITH s, a, collect(DISTINCT e) AS entity_list
-                OPTIONAL MATCH (a)-[:LED_TO]->(d:Decision)
-                RETURN s.session_id AS sid, s.role AS role, s.company AS company,
-                       a.answer_id AS aid, a.question_number AS qnum, a.transcript AS transcript,
-                       entity_list,
-                       d.decision_id AS did, d.next_question AS next_q
-                """,
-                session_id=session_id,
-            )
-            rows = await res.data()
+        if backend() == "sqlite":
+            rows = await memory_sqlite.session_graph_rows(session_id)
+        else:
+            driver = _get_driver()
+            if driver is None:
+                logger.info("get_session_graph: Neo4j driver not available; session_id=%s", session_id)
+                return None
+            async with driver.session(database=_env("NEO4J_DATABASE")) as session:
+                # Session and answers
+                res = await session.run(
+                    _SESSION_GRAPH,
+                    session_id=session_id,
+                )
+                rows = await res.data()
         if not rows:
-            logger.info("get_session_graph: Cypher returned 0 rows (no Session or Answers); session_id=%s", session_id)
-            return {"nodes": [], "edges": [], "session_id": session_id}
+            logger.info("get_session_graph: 0 rows (no Session or Answers); session_id=%s", session_id)
+            return empty
 
         nodes: list[dict[str, Any]] = []
         edges: list[dict[str, str]] = []
@@ -381,122 +532,476 @@ async def get_session_graph(session_id: str) -> dict[str, Any]:
                     add_edge(aid, did, "LED_TO")
         return {"nodes": nodes, "edges": edges, "session_id": session_id}
     except Exception:
-        logger.exception("Neo4j get_session_graph failed.")
-        return empty
+        logger.exception("Memory get_session_graph failed (%s).", backend())
+        return None
+
+
+# Seeks the (session_id, question_number) index and reads answers already in question order.
+_SESSION_TRANSCRIPTS = """
+MATCH (a:Answer {session_id: $session_id})
+WHERE a.question_number IS NOT NULL AND a.transcript IS NOT NULL AND a.transcript <> ""
+RETURN a.transcript AS transcript
+ORDER BY a.question_number ASC
+"""
+
+
+# Session graph versions come from one process-wide clock (epoch ms at startup, +1 per committed
+# write batch), so they only increase, even across restarts. The built graph is cached per
+# session and only re-queried when a write for that session has committed since; each node and
+# edge remembers the version it was added (or last changed) at, which is what `since` filters on.
+_graph_clock = int(time.time() * 1000)
+_session_graph_versions: dict[str, int] = {}
+_graph_snapshots = TTLCache(
+    max_entries=_int_env("SESSION_GRAPH_CACHE_MAX_ENTRIES", 256),
+    ttl_seconds=_int_env("SESSION_GRAPH_CACHE_TTL_SECONDS", 3600),
+    name="session_graph",
+)
+_graph_flight = SingleFlight()
+
+
+def _bump_session_graphs(session_ids: set[str]) -> None:
+    global _graph_clock
+    if not session_ids:
+        return
+    _graph_clock = max(_graph_clock + 1, int(time.time() * 1000))
+    for session_id in session_ids:
+        _session_graph_versions[session_id] = _graph_clock
+
+
+def session_graph_version(session_id: str) -> int:
+    """Current graph version of a session (0 in stub mode). Never needs a database round trip."""
+    if not _enabled():
+        return 0
+    return _session_graph_versions.setdefault(session_id, _graph_clock)
+
+
+def _edge_key(edge: dict) -> str:
+    return f"{edge['source']}|{edge['type']}|{edge['target']}"
+
+
+async def _refresh_session_graph(session_id: str, version: int, previous: dict | None) -> dict | None:
+    data = await _fetch_session_graph(session_id)
+    if data is None:
+        return previous
+    old_nodes = previous["nodes"] if previous else {}
+    old_edges = previous["edges"] if previous else {}
+    nodes: dict[str, tuple[dict, int]] = {}
+    for node in data["nodes"]:
+        seen = old_nodes.get(node["id"])
+        nodes[node["id"]] = seen if seen is not None and seen[0] == node else (node, version)
+    edges: dict[str, tuple[dict, int]] = {}
+    for edge in data["edges"]:
+        key = _edge_key(edge)
+        edges[key] = old_edges.get(key) or (edge, version)
+    snap = {"version": version, "nodes": nodes, "edges": edges}
+    _graph_snapshots.set(session_id, snap)
+    return snap
+
+
+async def get_session_graph(session_id: str, since: int | None = None) -> dict[str, Any]:
+    """
+    Return session subgraph for UI: nodes (Session, Answer, Entity, Decision) and edges, plus the
+    graph `version`. With `since`, only nodes/edges added or changed after that version are
+    returned (and `since` is echoed; without it the response is a full snapshot). Stub when Neo4j disabled.
+    """
+    if not _enabled():
+        logger.info("get_session_graph: memory disabled (stub mode); session_id=%s", session_id)
+        return {"nodes": [], "edges": [], "session_id": session_id, "version": 0}
+    version = session_graph_version(session_id)
+    snap = _graph_snapshots.get(session_id)
+    if snap is None or snap["version"] != version:
+        previous = snap
+        snap = await _graph_flight.do(
+            (session_id, version),
+            lambda: _refresh_session_graph(session_id, version, previous),
+        )
+    if snap is None:
+        return {"nodes": [], "edges": [], "session_id": session_id, "version": version}
+    delta = since is not None and since <= snap["version"]
+    cutoff = since if delta else -1
+    data: dict[str, Any] = {
+        "nodes": [node for node, added in snap["nodes"].values() if added > cutoff],
+        "edges": [edge for edge, added in snap["edges"].values() if added > cutoff],
+        "session_id": session_id,
+        "version": snap["version"],
+    }
+    if delta:
+        data["since"] = since
+    return data
+
+
+def session_graph_cache_stats() -> dict:
+    return {**_graph_snapshots.stats(), "single_flight": _graph_flight.stats()}
 
 
 async def get_session_transcripts(session_id: str) -> list[str]:
     """Return transcripts for all answers in this session, ordered by question_number. Used for report-time fact-check."""
-    if not _neo4j_enabled():
+    if not _enabled():
         return []
-    driver = _get_driver()
-    if driver is None:
-        return []
-    db = _env("NEO4J_DATABASE")
     try:
-        async with driver.session(database=db) as session:
+        if backend() == "sqlite":
+            return await memory_sqlite.session_transcripts(session_id)
+        driver = _get_driver()
+        if driver is None:
+            return []
+        async with driver.session(database=_env("NEO4J_DATABASE")) as session:
             res = await session.run(
-                """
-                MATCH (s:Session {session_id: $session_id})-[:HAS_ANSWER]->(a:Answer)
-                WHERE a.transcript IS NOT NULL AND a.transcript <> ""
-                RETURN a.transcript AS transcript
-                ORDER BY a.question_number ASC
-                """,
+                _SESSION_TRANSCRIPTS,
                 session_id=session_id,
             )
             rows = await res.data()
             return [r.get("transcript", "") for r in rows if r.get("transcript")]
     except Exception:
-        logger.exception("Neo4j get_session_transcripts failed.")
+        logger.exception("Memory get_session_transcripts failed (%s).", backend())
         return []
 
 
-async def get_rag_context(user_id: str, conversation: list, top_k: int = 5) -> list[str]:
-    """Return last K answer transcripts (simple RAG substitute for demo)."""
-    if not _neo4j_enabled():
-        return []
+def _conversation_text(conversation: list) -> tuple[str, set[str]]:
+    """Query text from {"role", "content"} turns (or plain strings); user turns are also excluded from results."""
+    parts: list[str] = []
+    own: set[str] = set()
+    for turn in conversation or []:
+        content = turn.get("content") if isinstance(turn, dict) else turn
+        if not isinstance(content, str) or not content.strip():
+            continue
+        parts.append(content)
+        if not isinstance(turn, dict) or turn.get("role") == "user":
+            own.add(content.strip())
+    return " ".join(parts), own
+
+
+# Exact cosine over the user's own answers, found through the (user_id, created_at) index. A
+# global ANN index (db.index.vector.queryNodes) ranks across all users before the user filter,
+# so a user whose answers are outranked by everyone else's would get nothing back; the per-user
+# scan stays cheap at the few thousand answers one user accumulates.
+# vector.similarity.cosine scores are (1 + cosine) / 2, so > 0.5 keeps answers that share at
+# least something with the query (cosine > 0), as the in-process index does.
+_RAG_EXACT = """
+MATCH (a:Answer {user_id: $user_id})
+WHERE a.embedding IS NOT NULL AND NOT a.transcript IN $exclude
+WITH a.transcript AS transcript, vector.similarity.cosine(a.embedding, $embedding) AS score
+WHERE score > 0.5
+RETURN transcript, score
+ORDER BY score DESC
+LIMIT $k
+"""
+
+
+async def _vector_search(user_id: str, query: str, top_k: int, exclude: set[str]) -> list[str]:
+    global _vector_values
     driver = _get_driver()
     if driver is None:
         return []
-    db = _env("NEO4J_DATABASE")
-    try:
-        async with driver.session(database=db) as session:
-            res = await session.run(
-                """
-                MATCH (u:User {user_id: $user_id})-[:HAS_SESSION]->(:Session)-[:HAS_ANSWER]->(a:Answer)
-                WHERE a.transcript IS NOT NULL AND a.transcript <> ""
-                RETURN a.transcript AS transcript
-                ORDER BY a.created_at DESC
-                LIMIT $k
-                """,
-                user_id=user_id,
-                k=int(top_k),
-            )
-            rows = await res.data()
-            return [r.get("transcript", "") for r in rows if r.get("transcript")]
-    except Exception:
-        logger.exception("Neo4j get_rag_context failed.")
+    from neo4j.exceptions import ConfigurationError
+
+    for _attempt in range(2):
+        embedding = _embedding_param(query)
+        if embedding is None:
+            return []
+        try:
+            async with driver.session(database=_env("NEO4J_DATABASE")) as session:
+                res = await session.run(
+                    _RAG_EXACT,
+                    user_id=user_id,
+                    embedding=embedding,
+                    exclude=sorted(exclude),
+                    k=top_k,
+                )
+                return [r["transcript"] for r in await res.data() if r.get("transcript")]
+        except ConfigurationError:
+            if _vector_values is not False:
+                # Searched before any write found out: the server is too old for VECTOR values.
+                _vector_values = False
+                continue
+            logger.exception("Neo4j vector search failed; falling back to recent answers.")
+        except Exception:
+            logger.exception("Neo4j vector search failed; falling back to recent answers.")
+        break
+    return []
+
+
+async def get_rag_context(user_id: str, conversation: list, top_k: int = 5) -> list[str]:
+    """
+    Up to `top_k` past answer transcripts most relevant to `conversation`, padded with the most
+    recent ones when fewer than `top_k` match. Neo4j ranks the user's stored answer embeddings
+    server-side; other backends use the in-process services.retrieval index.
+    """
+    query, own = _conversation_text(conversation)
+    profile = await load_profile_context(user_id, recent_k=max(top_k, PROFILE_RECENT_K))
+    hits: list[str] = []
+    if query and _enabled():
+        if backend() == "neo4j":
+            hits = await _vector_search(user_id, query, top_k, own)
+        else:
+            hits = [text for _, text in await retrieval.search(user_id, query, top_k, exclude=own)]
+    if len(hits) >= top_k:
+        return hits
+    for text in profile.recent_transcripts:
+        if len(hits) >= top_k:
+            break
+        if text not in hits and text.strip() not in own:
+            hits.append(text)
+    return hits
+
+
+# One round trip for everything a profile read needs: running aggregates, label counters and the
+# most recent transcripts. Each CALL subquery returns exactly one row, so the result is one row.
+# Recent transcripts come off the (user_id, created_at) index in order instead of walking and
+# sorting the user's whole history.
+_LOAD_PROFILE = """
+MATCH (u:User {user_id: $user_id})
+CALL {
+  WITH u
+  OPTIONAL MATCH (u)-[:HAS_LABEL_STAT]->(ls:UserLabelStat)
+  WITH ls
+  ORDER BY ls.count DESC, ls.label
+  RETURN [x IN collect({label: ls.label, c: ls.count}) WHERE x.label IS NOT NULL] AS labels
+}
+CALL {
+  MATCH (a:Answer {user_id: $user_id})
+  WHERE a.created_at IS NOT NULL AND a.transcript IS NOT NULL AND a.transcript <> ""
+  WITH a
+  ORDER BY a.created_at DESC
+  LIMIT $k
+  RETURN collect(a.transcript) AS recent
+}
+RETURN u.agg_version AS agg_version,
+       u.agg_answer_count AS answer_count,
+       u.agg_stress_sum AS stress_sum,
+       u.agg_stress_sumsq AS stress_sumsq,
+       u.agg_conf_sum AS conf_sum,
+       u.agg_conf_sumsq AS conf_sumsq,
+       labels,
+       recent
+"""
+
+# Recompute one user's aggregates from their full history (idempotent; marks everything counted).
+_BACKFILL_AGGREGATES = """
+MATCH (u:User {user_id: $user_id})
+OPTIONAL MATCH (u)-[:HAS_LABEL_STAT]->(old:UserLabelStat)
+DETACH DELETE old
+WITH DISTINCT u
+OPTIONAL MATCH (u)-[:HAS_SESSION]->(:Session)-[:HAS_ANSWER]->(a:Answer)
+WITH u, collect(DISTINCT a) AS answers
+FOREACH (x IN answers | SET x.aggregated_at = coalesce(x.aggregated_at, $now))
+SET u.agg_answer_count = size(answers),
+    u.agg_stress_sum = reduce(t = 0.0, x IN answers | t + coalesce(x.stress, 0.0)),
+    u.agg_stress_sumsq = reduce(t = 0.0, x IN answers | t + coalesce(x.stress, 0.0) ^ 2),
+    u.agg_conf_sum = reduce(t = 0.0, x IN answers | t + coalesce(x.confidence, 0.0)),
+    u.agg_conf_sumsq = reduce(t = 0.0, x IN answers | t + coalesce(x.confidence, 0.0) ^ 2)
+WITH u, answers
+UNWIND (CASE WHEN size(answers) = 0 THEN [null] ELSE answers END) AS a
+OPTIONAL MATCH (a)-[m:MENTIONS]->(e:Entity)
+SET m.counted_at = coalesce(m.counted_at, $now)
+WITH u, e.label AS label, count(m) AS c
+FOREACH (_ IN CASE WHEN label IS NULL OR c = 0 THEN [] ELSE [1] END |
+  MERGE (ls:UserLabelStat {user_id: u.user_id, label: label})
+  SET ls.count = c
+  MERGE (u)-[:HAS_LABEL_STAT]->(ls)
+)
+WITH DISTINCT u
+SET u.agg_version = $agg_version
+RETURN u.agg_answer_count AS answer_count
+"""
+
+
+def _aggregate_stats(row) -> dict:
+    """Means / standard deviations and label counts from the running sums on a User."""
+    n = int(row.get("answer_count") or 0)
+
+    def _mean_std(total, total_sq):
+        if not n:
+            return None, None
+        mean = float(total or 0.0) / n
+        var = max(0.0, float(total_sq or 0.0) / n - mean * mean)
+        return mean, var ** 0.5
+
+    stress_mean, stress_std = _mean_std(row.get("stress_sum"), row.get("stress_sumsq"))
+    conf_mean, conf_std = _mean_std(row.get("conf_sum"), row.get("conf_sumsq"))
+    label_counts: dict[str, int] = {}
+    for item in row.get("labels") or []:
+        try:
+            label_counts[str(item["label"])] = int(item.get("c") or 0)
+        except (KeyError, TypeError, ValueError):
+            continue
+    return {
+        "answer_count": n,
+        "stress_mean": stress_mean,
+        "stress_std": stress_std,
+        "confidence_mean": conf_mean,
+        "confidence_std": conf_std,
+        "label_counts": label_counts,
+    }
+
+
+# Profile reads are memoized per (user, profile version). The version is bumped when a write
+# batch touching the user commits, so a cached profile is never older than this process's own
+# writes; the TTL bounds staleness from writes by other processes.
+# (Backfills don't bump it: they rebuild the same numbers the profile read already reports.)
+PROFILE_RECENT_K = max(1, _int_env("PROFILE_RECENT_K", 5))
+_profile_cache = TTLCache(
+    max_entries=_int_env("PROFILE_CACHE_MAX_ENTRIES", 512),
+    ttl_seconds=_int_env("PROFILE_CACHE_TTL_SECONDS", 60),
+    name="profile_context",
+)
+_profile_flight = SingleFlight()
+_profile_versions: dict[str, int] = {}
+
+
+@dataclass
+class ProfileContext:
+    """Everything the answer pipeline reads about a user, fetched in one round trip."""
+
+    user_id: str
+    answer_count: int = 0
+    stress_mean: float | None = None
+    stress_std: float | None = None
+    confidence_mean: float | None = None
+    confidence_std: float | None = None
+    label_counts: dict[str, int] = field(default_factory=dict)
+    recent_transcripts: list[str] = field(default_factory=list)
+    found: bool = False
+    note: str | None = None  # stub / failure text, returned as the summary
+    source: str = "Neo4j"
+
+    @property
+    def summary(self) -> str:
+        """Short profile summary string (what get_user_context returns)."""
+        if self.note:
+            return self.note
+        if not self.found:
+            return "No history yet. This is the first answer."
+        parts = [f"{self.source} profile: {self.answer_count} answers stored."]
+        if self.stress_mean is not None:
+            parts.append(f"Baseline stress≈{self.stress_mean:.2f}.")
+        if self.confidence_mean is not None:
+            parts.append(f"Baseline confidence≈{self.confidence_mean:.2f}.")
+        # Top entity labels for quick “coverage” style context.
+        labels = [f"{label}({c})" for label, c in list(self.label_counts.items())[:6]]
+        if labels:
+            parts.append("Top entities: " + ", ".join(labels) + ".")
+        return " ".join(parts)
+
+
+def _bump_profile_version(user_id: str) -> None:
+    _profile_versions[user_id] = _profile_versions.get(user_id, 0) + 1
+
+
+async def _fetch_profile(user_id: str, recent_k: int) -> ProfileContext:
+    if backend() == "sqlite":
+        source = "SQLite"
+        row = await memory_sqlite.load_profile(user_id, recent_k)
+        if row is not None and row.get("agg_version") != AGGREGATES_VERSION:
+            await backfill_user_aggregates(user_id)
+            row = await memory_sqlite.load_profile(user_id, recent_k)
+    else:
+        source = "Neo4j"
+        driver = _get_driver()
+        if driver is None:
+            return ProfileContext(user_id=user_id, note="[Stub] Neo4j unavailable.")
+        async with driver.session(database=_env("NEO4J_DATABASE")) as session:
+            res = await session.run(_LOAD_PROFILE, user_id=user_id, k=recent_k)
+            row = await res.single()
+            if row is not None and row.get("agg_version") != AGGREGATES_VERSION:
+                # Users ingested before running aggregates existed: rebuild once, then read again.
+                await backfill_user_aggregates(user_id, session=session)
+                res = await session.run(_LOAD_PROFILE, user_id=user_id, k=recent_k)
+                row = await res.single()
+    if row is None:
+        return ProfileContext(user_id=user_id, source=source)
+    agg = _aggregate_stats(row)
+    return ProfileContext(
+        user_id=user_id,
+        found=True,
+        recent_transcripts=[t for t in (row.get("recent") or []) if t],
+        source=source,
+        **agg,
+    )
+
+
+async def load_profile_context(user_id: str, recent_k: int = PROFILE_RECENT_K) -> ProfileContext:
+    """
+    Profile summary stats, entity label counts and the last `recent_k` transcripts in one Cypher
+    round trip. Memoized per profile version and single-flighted, so concurrent consumers in one
+    request (pipeline stages, orchestrator) share a single fetch.
+    """
+    if not _enabled():
+        logger.info("Memory stub: no backend in load_profile_context; returning stub profile.")
+        return ProfileContext(
+            user_id=user_id,
+            note="[Stub] No Neo4j configured. Set NEO4J_URI/USERNAME/PASSWORD for live memory.",
+        )
+    key = (user_id, int(recent_k), _profile_versions.get(user_id, 0))
+    cached = _profile_cache.get(key)
+    if cached is not None:
+        return cached
+
+    async def _load() -> ProfileContext:
+        try:
+            profile = await _fetch_profile(user_id, int(recent_k))
+        except Exception:
+            logger.exception("Memory load_profile_context failed (%s).", backend())
+            return ProfileContext(user_id=user_id, note="[Stub] Memory query failed.")
+        if profile.note is None:
+            _profile_cache.set(key, profile)
+        return profile
+
+    return await _profile_flight.do(key, _load)
+
+
+def profile_cache_stats() -> dict:
+    return {**_profile_cache.stats(), "single_flight": _profile_flight.stats()}
+
+
+async def backfill_user_aggregates(user_id: str, session=None) -> int | None:
+    """Rebuild one user's running aggregates from their history. Returns the answer count."""
+    if session is None and backend() == "sqlite":
+        return await memory_sqlite.backfill_user_aggregates(user_id, _now(), AGGREGATES_VERSION)
+    if session is None:
+        driver = _get_driver()
+        if driver is None:
+            return None
+        async with driver.session(database=_env("NEO4J_DATABASE")) as own:
+            return await backfill_user_aggregates(user_id, session=own)
+    res = await session.run(
+        _BACKFILL_AGGREGATES,
+        user_id=user_id,
+        now=_now(),
+        agg_version=AGGREGATES_VERSION,
+    )
+    row = await res.single()
+    return int(row["answer_count"] or 0) if row else None
+
+
+_LIST_USER_IDS = """
+MATCH (u:User)
+WHERE NOT $only_stale OR u.agg_version IS NULL OR u.agg_version <> $agg_version
+RETURN u.user_id AS user_id
+"""
+
+
+async def list_user_ids(only_stale: bool = True) -> list[str]:
+    """User ids (by default only those whose aggregates predate AGGREGATES_VERSION)."""
+    if backend() == "sqlite":
+        return await memory_sqlite.list_user_ids(only_stale, AGGREGATES_VERSION)
+    driver = _get_driver()
+    if driver is None:
         return []
+    async with driver.session(database=_env("NEO4J_DATABASE")) as session:
+        res = await session.run(
+            _LIST_USER_IDS,
+            only_stale=only_stale,
+            agg_version=AGGREGATES_VERSION,
+        )
+        return [r["user_id"] for r in await res.data() if r.get("user_id")]
 
 
 async def get_user_context(user_id: str, question: str) -> str:
     """Return a short profile summary string derived from stored answers."""
-    if not _neo4j_enabled():
-        logger.info("Neo4j stub: _neo4j_enabled is False in get_user_context; returning stub string.")
-        return "[Stub] No Neo4j configured. Set NEO4J_URI/USERNAME/PASSWORD for live memory."
-    driver = _get_driver()
-    if driver is None:
-        return "[Stub] Neo4j unavailable."
-    db = _env("NEO4J_DATABASE")
-    try:
-        async with driver.session(database=db) as session:
-            res = await session.run(
-                """
-                MATCH (u:User {user_id: $user_id})
-                OPTIONAL MATCH (u)-[:HAS_SESSION]->(:Session)-[:HAS_ANSWER]->(a:Answer)
-                WITH u, collect(a) AS answers
-                RETURN
-                  size(answers) AS answer_count,
-                  reduce(s = 0.0, x IN answers | s + coalesce(x.stress, 0.0)) AS stress_sum,
-                  reduce(s = 0.0, x IN answers | s + coalesce(x.confidence, 0.0)) AS conf_sum
-                """,
-                user_id=user_id,
-            )
-            row = await res.single()
-            if not row:
-                return "No history yet. This is the first answer."
-            n = int(row.get("answer_count") or 0)
-            stress_avg = (float(row.get("stress_sum") or 0.0) / n) if n else None
-            conf_avg = (float(row.get("conf_sum") or 0.0) / n) if n else None
-
-            # Top entity labels for quick “coverage” style context.
-            ent_res = await session.run(
-                """
-                MATCH (u:User {user_id: $user_id})-[:HAS_SESSION]->(:Session)-[:HAS_ANSWER]->(:Answer)-[:MENTIONS]->(e:Entity)
-                RETURN e.label AS label, count(*) AS c
-                ORDER BY c DESC
-                LIMIT 6
-                """,
-                user_id=user_id,
-            )
-            ent_rows = await ent_res.data()
-            labels = [f"{r.get('label')}({r.get('c')})" for r in ent_rows if r.get("label")]
-
-            parts = [f"Neo4j profile: {n} answers stored."]
-            if stress_avg is not None:
-                parts.append(f"Baseline stress≈{stress_avg:.2f}.")
-            if conf_avg is not None:
-                parts.append(f"Baseline confidence≈{conf_avg:.2f}.")
-            if labels:
-                parts.append("Top entities: " + ", ".join(labels) + ".")
-
-            # If caller asked for something specific, we still return the same context
-            # (router/orchestrator can add deterministic feedback on top).
-            _ = question  # kept for signature compatibility
-            return " ".join(parts)
-    except Exception:
-        logger.exception("Neo4j get_user_context failed.")
-        return "[Stub] Neo4j query failed."
+    # The question is kept for signature compatibility: every caller gets the same context
+    # (router/orchestrator add deterministic feedback on top), so they can share one fetch.
+    _ = question
+    return (await load_profile_context(user_id)).summary
 
 
 async def get_profile_snapshot(user_id: str) -> dict:
@@ -531,34 +1036,4 @@ async def get_entity_label_counts(user_id: str) -> dict[str, int]:
     Return counts of Entity labels for this user from the Neo4j context graph.
     Used by the orchestrator to understand which topics/skills are under-covered.
     """
-    if not _neo4j_enabled():
-        return {}
-    driver = _get_driver()
-    if driver is None:
-        return {}
-    db = _env("NEO4J_DATABASE")
-    try:
-        async with driver.session(database=db) as session:
-            res = await session.run(
-                """
-                MATCH (u:User {user_id: $user_id})-[:HAS_SESSION]->(:Session)-[:HAS_ANSWER]->(:Answer)-[:MENTIONS]->(e:Entity)
-                RETURN e.label AS label, count(*) AS c
-                ORDER BY c DESC
-                """,
-                user_id=user_id,
-            )
-            rows = await res.data()
-        out: dict[str, int] = {}
-        for row in rows:
-            label = row.get("label")
-            if not label:
-                continue
-            try:
-                out[str(label)] = int(row.get("c") or 0)
-            except Exception:
-                continue
-        return out
-    except Exception:
-        logger.exception("Neo4j get_entity_label_counts failed.")
-        return {}
-
+    return dict((await load_profile_context(user_id)).label_counts)
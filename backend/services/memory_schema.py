@@ -0,0 +1,186 @@
+"""Versioned Neo4j schema migrations for services.memory.
+
+Migrations run once per process from the FastAPI lifespan (not per write). The applied version
+is kept on a single marker node, (:__SchemaVersion {id: "voicecoach"}).version, so restarts only
+run migrations newer than the database. Every statement is idempotent (IF NOT EXISTS / MERGE),
+so two processes migrating at once is harmless.
+
+Readiness (GET /ready) reports ready only after migrations have applied, or immediately in stub
+mode when Neo4j is not configured. If Neo4j is unreachable at startup, migrations are retried in
+the background until they succeed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_MARKER_ID = "voicecoach"
+RETRY_SECONDS = 30.0
+
+
+def _to_datetime(pattern: str, var: str, prop: str) -> str:
+    """Convert ISO-string timestamps to native DateTime, in batches (needs an auto-commit session)."""
+    # toString(x) = x only holds for strings, so already-converted values are skipped.
+    return (
+        f"MATCH {pattern} WHERE toString({var}.{prop}) = {var}.{prop} "
+        f"CALL {{ WITH {var} SET {var}.{prop} = datetime({var}.{prop}) }} IN TRANSACTIONS OF 5000 ROWS"
+    )
+
+
+# (version, description, statements). Append only; never edit an applied migration.
+MIGRATIONS: list[tuple[int, str, list[str]]] = [
+    (
+        1,
+        "uniqueness constraints",
+        [
+            "CREATE CONSTRAINT user_id IF NOT EXISTS FOR (u:User) REQUIRE u.user_id IS UNIQUE",
+            "CREATE CONSTRAINT session_id IF NOT EXISTS FOR (s:Session) REQUIRE s.session_id IS UNIQUE",
+            "CREATE CONSTRAINT answer_id IF NOT EXISTS FOR (a:Answer) REQUIRE a.answer_id IS UNIQUE",
+            "CREATE CONSTRAINT decision_id IF NOT EXISTS FOR (d:Decision) REQUIRE d.decision_id IS UNIQUE",
+            "CREATE CONSTRAINT entity_key IF NOT EXISTS FOR (e:Entity) REQUIRE (e.label, e.text) IS UNIQUE",
+            "CREATE CONSTRAINT schema_version_id IF NOT EXISTS FOR (m:__SchemaVersion) REQUIRE m.id IS UNIQUE",
+        ],
+    ),
+    (
+        2,
+        "drop relationship-type placeholder nodes (notifications are disabled in the driver config)",
+        ["MATCH (n:__SchemaDummy) DETACH DELETE n"],
+    ),
+    (
+        3,
+        "per-user entity label counters (memory running aggregates)",
+        [
+            "CREATE CONSTRAINT user_label_stat IF NOT EXISTS "
+            "FOR (ls:UserLabelStat) REQUIRE (ls.user_id, ls.label) IS UNIQUE",
+        ],
+    ),
+    (
+        4,
+        "range indexes for recent-answer and per-session reads; native DateTime timestamps",
+        [
+            "CREATE INDEX answer_user_created IF NOT EXISTS FOR (a:Answer) ON (a.user_id, a.created_at)",
+            "CREATE INDEX answer_session_question IF NOT EXISTS FOR (a:Answer) ON (a.session_id, a.question_number)",
+            "MATCH (u:User)-[:HAS_SESSION]->(:Session)-[:HAS_ANSWER]->(a:Answer) WHERE a.user_id IS NULL "
+            "CALL { WITH u, a SET a.user_id = u.user_id } IN TRANSACTIONS OF 5000 ROWS",
+            _to_datetime("(n:Answer)", "n", "created_at"),
+            _to_datetime("(n:Answer)", "n", "updated_at"),
+            _to_datetime("(n:Answer)", "n", "aggregated_at"),
+            _to_datetime("(n:Decision)", "n", "created_at"),
+            _to_datetime("(n:Decision)", "n", "updated_at"),
+            _to_datetime("(n:Session)", "n", "updated_at"),
+            _to_datetime("(n:User)", "n", "updated_at"),
+            _to_datetime("()-[m:MENTIONS]->()", "m", "counted_at"),
+        ],
+    ),
+    (
+        5,
+        "vector index over answer transcript embeddings (RAG search)",
+        [
+            # 1024 = services.retrieval.VECTOR_DIM at the time of this migration.
+            "CREATE VECTOR INDEX answer_embedding IF NOT EXISTS FOR (a:Answer) ON (a.embedding) "
+            "OPTIONS {indexConfig: {`vector.dimensions`: 1024, `vector.similarity_function`: 'cosine'}}",
+        ],
+    ),
+    (
+        6,
+        "drop the answer_embedding vector index (RAG scores each user's answers exactly instead)",
+        ["DROP INDEX answer_embedding IF EXISTS"],
+    ),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+_state: dict = {"ready": False, "mode": None, "version": None, "applied": [], "error": None}
+_retry_task: asyncio.Task | None = None
+
+
+async def _current_version(session) -> int:
+    result = await session.run(
+        "MATCH (m:__SchemaVersion {id: $id}) RETURN m.version AS version",
+        id=SCHEMA_MARKER_ID,
+    )
+    record = await result.single()
+    return int(record["version"]) if record and record["version"] is not None else 0
+
+
+async def migrate(driver, database: str | None) -> int:
+    """Apply pending migrations in order; returns the schema version now in the database."""
+    async with driver.session(database=database) as session:
+        version = await _current_version(session)
+        for target, description, statements in MIGRATIONS:
+            if target <= version:
+                continue
+            # Schema statements can't share a transaction with writes, and CALL ... IN TRANSACTIONS
+            # needs an auto-commit one, so each statement runs on its own.
+            for statement in statements:
+                await (await session.run(statement)).consume()
+            await (await session.run(
+                """
+                MERGE (m:__SchemaVersion {id: $id})
+                SET m.version = $version, m.applied_at = datetime(), m.description = $description
+                """,
+                id=SCHEMA_MARKER_ID,
+                version=target,
+                description=description,
+            )).consume()
+            version = target
+            _state["applied"].append(target)
+            logger.info("Neo4j schema migration %d applied: %s", target, description)
+    return version
+
+
+async def bootstrap() -> bool:
+    """Run migrations once at startup. Returns readiness; schedules retries on failure."""
+    from services import memory, memory_sqlite
+
+    if memory.backend() == "sqlite":
+        # Embedded store: its own PRAGMA user_version migrations, applied on open.
+        version = await memory_sqlite.bootstrap()
+        _state.update(ready=True, mode="sqlite", version=version, error=None)
+        return True
+    if memory.backend() is None:
+        _state.update(ready=True, mode="stub", version=None, error=None)
+        return True
+    driver = memory._get_driver()
+    if driver is None:
+        _state.update(ready=False, mode="neo4j", error="driver init failed")
+        return False
+    try:
+        version = await migrate(driver, memory._env("NEO4J_DATABASE"))
+    except Exception as exc:
+        logger.exception("Neo4j schema migrations failed; will retry in %.0fs.", RETRY_SECONDS)
+        _state.update(ready=False, mode="neo4j", error=type(exc).__name__)
+        _schedule_retry()
+        return False
+    _state.update(ready=True, mode="neo4j", version=version, error=None)
+    print(f"[Neo4j] Schema at version {version}")
+    return True
+
+
+def _schedule_retry() -> None:
+    global _retry_task
+    if _retry_task is not None and not _retry_task.done():
+        return
+
+    async def _retry() -> None:
+        while not _state["ready"]:
+            await asyncio.sleep(RETRY_SECONDS)
+            await bootstrap()
+
+    _retry_task = asyncio.create_task(_retry())
+
+
+async def shutdown() -> None:
+    if _retry_task is not None and not _retry_task.done():
+        _retry_task.cancel()
+
+
+def is_ready() -> bool:
+    return bool(_state["ready"])
+
+
+def status() -> dict:
+    return {**_state, "target_version": SCHEMA_VERSION}
@@ -0,0 +1,550 @@
+"""Embedded SQLite backend for services.memory (MEMORY_BACKEND=sqlite).
+
+Same data model and semantics as the Neo4j queries in services.memory, as tables:
+  users, sessions, answers, entities, mentions (answer -> entity), user_label_stats,
+  decisions, precedents (decision -> next decision)
+Graph edges become columns: sessions.user_id (HAS_SESSION), answers.session_id (HAS_ANSWER),
+decisions.session_id (HAS_DECISION), decisions.answer_id (LED_TO). Writes are idempotent upserts
+and maintain the same running aggregates (aggregated_at / counted_at markers), so journal replay
+never double counts. Timestamps are stored as fixed-width UTC ISO strings, which sort by time.
+
+One connection in WAL mode (synchronous=NORMAL), guarded by a lock; each call runs in a worker
+thread so the event loop never waits on disk. Schema versions are tracked in PRAGMA user_version.
+
+Env:
+  MEMORY_SQLITE_PATH   default backend/data/memory.sqlite3 (":memory:" for a throwaway store)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = Path(__file__).resolve().parent.parent / "data" / "memory.sqlite3"
+
+# (version, statements). Append only, like services.memory_schema.MIGRATIONS.
+MIGRATIONS: list[tuple[int, list[str]]] = [
+    (
+        1,
+        [
+            """
+            CREATE TABLE IF NOT EXISTS users (
+                user_id TEXT PRIMARY KEY,
+                role TEXT, company TEXT, level TEXT, difficulty TEXT,
+                updated_at TEXT,
+                agg_version INTEGER,
+                agg_answer_count INTEGER,
+                agg_stress_sum REAL, agg_stress_sumsq REAL,
+                agg_conf_sum REAL, agg_conf_sumsq REAL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS sessions (
+                session_id TEXT PRIMARY KEY,
+                user_id TEXT, role TEXT, company TEXT, updated_at TEXT
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS sessions_user ON sessions (user_id)",
+            """
+            CREATE TABLE IF NOT EXISTS answers (
+                answer_id TEXT PRIMARY KEY,
+                user_id TEXT, session_id TEXT, question_number INTEGER,
+                question TEXT, transcript TEXT, duration_seconds INTEGER,
+                stress REAL, confidence REAL, yutori_correct INTEGER,
+                created_at TEXT, updated_at TEXT, aggregated_at TEXT
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS answers_session_question ON answers (session_id, question_number)",
+            "CREATE INDEX IF NOT EXISTS answers_user_created ON answers (user_id, created_at)",
+            """
+            CREATE TABLE IF NOT EXISTS entities (
+                entity_id INTEGER PRIMARY KEY,
+                label TEXT NOT NULL, text TEXT NOT NULL,
+                UNIQUE (label, text)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS mentions (
+                answer_id TEXT NOT NULL, entity_id INTEGER NOT NULL, counted_at TEXT,
+                PRIMARY KEY (answer_id, entity_id)
+            ) WITHOUT ROWID
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS user_label_stats (
+                user_id TEXT NOT NULL, label TEXT NOT NULL, count INTEGER NOT NULL,
+                PRIMARY KEY (user_id, label)
+            ) WITHOUT ROWID
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS decisions (
+                decision_id TEXT PRIMARY KEY,
+                session_id TEXT, answer_id TEXT, question_number INTEGER,
+                tone TEXT, difficulty_delta INTEGER, next_question TEXT, feedback_note TEXT,
+                reasoning TEXT, stress REAL, confidence REAL, yutori_correct INTEGER,
+                created_at TEXT, updated_at TEXT
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS decisions_answer ON decisions (answer_id)",
+            """
+            CREATE TABLE IF NOT EXISTS precedents (
+                prev_decision_id TEXT NOT NULL, decision_id TEXT NOT NULL,
+                PRIMARY KEY (prev_decision_id, decision_id)
+            ) WITHOUT ROWID
+            """,
+        ],
+    ),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def path_from_env() -> str:
+    raw = (os.getenv("MEMORY_SQLITE_PATH") or "").strip()
+    return raw or str(DEFAULT_PATH)
+
+
+def _ts(value) -> str | None:
+    """Fixed-width UTC ISO string (microseconds always present) so text order is time order."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+
+def _bool(value) -> int | None:
+    return None if value is None else int(bool(value))
+
+
+class SQLiteStore:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self.version = self._migrate()
+
+    def _migrate(self) -> int:
+        with self._lock:
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            for target, statements in MIGRATIONS:
+                if target <= version:
+                    continue
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    for statement in statements:
+                        self._conn.execute(statement)
+                    self._conn.execute(f"PRAGMA user_version = {int(target)}")
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+                version = target
+                logger.info("SQLite memory schema migration %d applied (%s)", target, self.path)
+        return version
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _read(self, fn, *args):
+        with self._lock:
+            return fn(self._conn, *args)
+
+    def _write(self, fn, *args):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(self._conn, *args)
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return result
+
+    async def read(self, fn, *args):
+        return await asyncio.to_thread(self._read, fn, *args)
+
+    async def write(self, fn, *args):
+        return await asyncio.to_thread(self._write, fn, *args)
+
+
+# --- writes ---
+
+
+def _register_user(conn, user_id: str, now, agg_version: int, role, company, level, difficulty) -> None:
+    conn.execute(
+        """
+        INSERT INTO users (user_id, agg_version, updated_at, role, company, level, difficulty)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (user_id) DO UPDATE SET
+            updated_at = excluded.updated_at,
+            role = coalesce(excluded.role, users.role),
+            company = coalesce(excluded.company, users.company),
+            level = coalesce(excluded.level, users.level),
+            difficulty = coalesce(excluded.difficulty, users.difficulty)
+        """,
+        (user_id, agg_version, _ts(now), role, company, level, difficulty),
+    )
+
+
+def _write_answer(conn, row: dict, agg_version: int) -> None:
+    now = _ts(row["now"])
+    user_id = row["user_id"]
+    conn.execute(
+        "INSERT INTO users (user_id, agg_version, updated_at) VALUES (?, ?, ?) "
+        "ON CONFLICT (user_id) DO UPDATE SET updated_at = excluded.updated_at",
+        (user_id, agg_version, now),
+    )
+    conn.execute(
+        """
+        INSERT INTO sessions (session_id, user_id, role, company, updated_at) VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (session_id) DO UPDATE SET
+            user_id = excluded.user_id, role = excluded.role,
+            company = excluded.company, updated_at = excluded.updated_at
+        """,
+        (row["session_id"], user_id, row.get("role"), row.get("company"), now),
+    )
+    prior = conn.execute("SELECT aggregated_at FROM answers WHERE answer_id = ?", (row["answer_id"],)).fetchone()
+    fresh = prior is None or prior["aggregated_at"] is None
+    conn.execute(
+        """
+        INSERT INTO answers (answer_id, user_id, session_id, question_number, question, transcript,
+                             duration_seconds, stress, confidence, yutori_correct,
+                             created_at, updated_at, aggregated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (answer_id) DO UPDATE SET
+            user_id = excluded.user_id, session_id = excluded.session_id,
+            question_number = excluded.question_number, question = excluded.question,
+            transcript = excluded.transcript, duration_seconds = excluded.duration_seconds,
+            stress = excluded.stress, confidence = excluded.confidence,
+            yutori_correct = excluded.yutori_correct,
+            created_at = coalesce(answers.created_at, excluded.created_at),
+            updated_at = excluded.updated_at,
+            aggregated_at = coalesce(answers.aggregated_at, excluded.aggregated_at)
+        """,
+        (
+            row["answer_id"], user_id, row["session_id"], row.get("question_number"), row.get("question"),
+            row.get("transcript"), row.get("duration_seconds"), row.get("stress"), row.get("confidence"),
+            _bool(row.get("yutori_correct")), now, now, now,
+        ),
+    )
+    if fresh:
+        stress = float(row.get("stress") or 0.0)
+        conf = float(row.get("confidence") or 0.0)
+        conn.execute(
+            """
+            UPDATE users SET
+                agg_answer_count = coalesce(agg_answer_count, 0) + 1,
+                agg_stress_sum = coalesce(agg_stress_sum, 0.0) + ?,
+                agg_stress_sumsq = coalesce(agg_stress_sumsq, 0.0) + ?,
+                agg_conf_sum = coalesce(agg_conf_sum, 0.0) + ?,
+                agg_conf_sumsq = coalesce(agg_conf_sumsq, 0.0) + ?
+            WHERE user_id = ?
+            """,
+            (stress, stress * stress, conf, conf * conf, user_id),
+        )
+    for ent in row.get("entities") or []:
+        if not ent or ent.get("label") is None or ent.get("text") is None:
+            continue
+        conn.execute("INSERT OR IGNORE INTO entities (label, text) VALUES (?, ?)", (ent["label"], ent["text"]))
+        entity_id = conn.execute(
+            "SELECT entity_id FROM entities WHERE label = ? AND text = ?", (ent["label"], ent["text"])
+        ).fetchone()[0]
+        mention = conn.execute(
+            "SELECT counted_at FROM mentions WHERE answer_id = ? AND entity_id = ?", (row["answer_id"], entity_id)
+        ).fetchone()
+        if mention is not None and mention["counted_at"] is not None:
+            continue
+        conn.execute(
+            "INSERT INTO mentions (answer_id, entity_id, counted_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (answer_id, entity_id) DO UPDATE SET counted_at = excluded.counted_at",
+            (row["answer_id"], entity_id, now),
+        )
+        conn.execute(
+            "INSERT INTO user_label_stats (user_id, label, count) VALUES (?, ?, 1) "
+            "ON CONFLICT (user_id, label) DO UPDATE SET count = count + 1",
+            (user_id, ent["label"]),
+        )
+
+
+def _write_decision(conn, row: dict) -> None:
+    now = _ts(row["now"])
+    conn.execute("INSERT OR IGNORE INTO users (user_id) VALUES (?)", (row["user_id"],))
+    conn.execute(
+        "INSERT INTO sessions (session_id, user_id) VALUES (?, ?) "
+        "ON CONFLICT (session_id) DO UPDATE SET user_id = coalesce(sessions.user_id, excluded.user_id)",
+        (row["session_id"], row["user_id"]),
+    )
+    conn.execute("INSERT OR IGNORE INTO answers (answer_id) VALUES (?)", (row["answer_id"],))
+    conn.execute(
+        """
+        INSERT INTO decisions (decision_id, session_id, answer_id, question_number, tone, difficulty_delta,
+                               next_question, feedback_note, reasoning, stress, confidence, yutori_correct,
+                               created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (decision_id) DO UPDATE SET
+            session_id = excluded.session_id, answer_id = excluded.answer_id,
+            question_number = excluded.question_number, tone = excluded.tone,
+            difficulty_delta = excluded.difficulty_delta, next_question = excluded.next_question,
+            feedback_note = excluded.feedback_note, reasoning = excluded.reasoning,
+            stress = excluded.stress, confidence = excluded.confidence,
+            yutori_correct = excluded.yutori_correct,
+            created_at = coalesce(decisions.created_at, excluded.created_at),
+            updated_at = excluded.updated_at
+        """,
+        (
+            row["decision_id"], row["session_id"], row["answer_id"], row.get("question_number"), row.get("tone"),
+            row.get("difficulty_delta"), row.get("next_question"), row.get("feedback_note"), row.get("reasoning"),
+            row.get("stress"), row.get("confidence"), _bool(row.get("yutori_correct")), now, now,
+        ),
+    )
+    if int(row.get("question_number") or 0) > 1:
+        conn.execute(
+            "INSERT OR IGNORE INTO precedents (prev_decision_id, decision_id) "
+            "SELECT decision_id, ? FROM decisions WHERE decision_id = ?",
+            (row["decision_id"], row["prev_decision_id"]),
+        )
+    if row.get("next_decision_id"):
+        # A deferred decision replayed after the next one was written links forward too.
+        conn.execute(
+            "INSERT OR IGNORE INTO precedents (prev_decision_id, decision_id) "
+            "SELECT ?, decision_id FROM decisions WHERE decision_id = ?",
+            (row["decision_id"], row["next_decision_id"]),
+        )
+
+
+def _write_batch(conn, answers: list[dict], decisions: list[dict], agg_version: int) -> None:
+    for row in answers:
+        _write_answer(conn, row, agg_version)
+    for row in decisions:
+        _write_decision(conn, row)
+
+
+def _backfill(conn, user_id: str, now, agg_version: int) -> int | None:
+    if conn.execute("SELECT 1 FROM users WHERE user_id = ?", (user_id,)).fetchone() is None:
+        return None
+    now = _ts(now)
+    answers = conn.execute(
+        """
+        SELECT DISTINCT a.answer_id, a.stress, a.confidence
+        FROM sessions s JOIN answers a ON a.session_id = s.session_id
+        WHERE s.user_id = ?
+        """,
+        (user_id,),
+    ).fetchall()
+    ids = [a["answer_id"] for a in answers]
+    stress = [float(a["stress"] or 0.0) for a in answers]
+    conf = [float(a["confidence"] or 0.0) for a in answers]
+    conn.executemany(
+        "UPDATE answers SET aggregated_at = coalesce(aggregated_at, ?) WHERE answer_id = ?",
+        [(now, answer_id) for answer_id in ids],
+    )
+    conn.execute(
+        """
+        UPDATE users SET agg_answer_count = ?, agg_stress_sum = ?, agg_stress_sumsq = ?,
+                         agg_conf_sum = ?, agg_conf_sumsq = ?
+        WHERE user_id = ?
+        """,
+        (len(ids), sum(stress), sum(x * x for x in stress), sum(conf), sum(x * x for x in conf), user_id),
+    )
+    conn.execute("DELETE FROM user_label_stats WHERE user_id = ?", (user_id,))
+    conn.executemany(
+        "UPDATE mentions SET counted_at = coalesce(counted_at, ?) WHERE answer_id = ?",
+        [(now, answer_id) for answer_id in ids],
+    )
+    conn.execute(
+        """
+        INSERT INTO user_label_stats (user_id, label, count)
+        SELECT ?, e.label, count(*)
+        FROM sessions s
+        JOIN answers a ON a.session_id = s.session_id
+        JOIN mentions m ON m.answer_id = a.answer_id
+        JOIN entities e ON e.entity_id = m.entity_id
+        WHERE s.user_id = ?
+        GROUP BY e.label
+        """,
+        (user_id, user_id),
+    )
+    conn.execute("UPDATE users SET agg_version = ? WHERE user_id = ?", (agg_version, user_id))
+    return len(ids)
+
+
+# --- reads ---
+
+
+def _load_profile(conn, user_id: str, k: int) -> dict | None:
+    user = conn.execute(
+        """
+        SELECT agg_version, agg_answer_count AS answer_count,
+               agg_stress_sum AS stress_sum, agg_stress_sumsq AS stress_sumsq,
+               agg_conf_sum AS conf_sum, agg_conf_sumsq AS conf_sumsq
+        FROM users WHERE user_id = ?
+        """,
+        (user_id,),
+    ).fetchone()
+    if user is None:
+        return None
+    labels = conn.execute(
+        "SELECT label, count AS c FROM user_label_stats WHERE user_id = ? ORDER BY count DESC, label",
+        (user_id,),
+    ).fetchall()
+    recent = conn.execute(
+        """
+        SELECT transcript FROM answers
+        WHERE user_id = ? AND created_at IS NOT NULL AND transcript IS NOT NULL AND transcript <> ''
+        ORDER BY created_at DESC LIMIT ?
+        """,
+        (user_id, int(k)),
+    ).fetchall()
+    return {
+        **dict(user),
+        "labels": [dict(r) for r in labels],
+        "recent": [r["transcript"] for r in recent],
+    }
+
+
+def _session_graph_rows(conn, session_id: str) -> list[dict]:
+    """Rows shaped like memory._SESSION_GRAPH's, so the same builder turns them into nodes/edges."""
+    session = conn.execute(
+        "SELECT session_id, role, company FROM sessions WHERE session_id = ?", (session_id,)
+    ).fetchone()
+    if session is None:
+        return []
+    base = {"sid": session["session_id"], "role": session["role"], "company": session["company"]}
+    answers = conn.execute(
+        "SELECT answer_id, question_number, transcript FROM answers WHERE session_id = ? ORDER BY question_number",
+        (session_id,),
+    ).fetchall()
+    if not answers:
+        return [{**base, "aid": None, "qnum": None, "transcript": None, "entity_list": [], "did": None, "next_q": None}]
+    rows: list[dict] = []
+    for a in answers:
+        entity_list = [
+            dict(e)
+            for e in conn.execute(
+                """
+                SELECT DISTINCT e.label, e.text FROM mentions m JOIN entities e ON e.entity_id = m.entity_id
+                WHERE m.answer_id = ? ORDER BY e.label, e.text
+                """,
+                (a["answer_id"],),
+            ).fetchall()
+        ]
+        answer = {"aid": a["answer_id"], "qnum": a["question_number"], "transcript": a["transcript"]}
+        decisions = conn.execute(
+            "SELECT decision_id, next_question FROM decisions WHERE answer_id = ?", (a["answer_id"],)
+        ).fetchall()
+        for d in decisions or [None]:
+            rows.append({
+                **base,
+                **answer,
+                "entity_list": entity_list,
+                "did": d["decision_id"] if d else None,
+                "next_q": d["next_question"] if d else None,
+            })
+    return rows
+
+
+def _session_transcripts(conn, session_id: str) -> list[str]:
+    rows = conn.execute(
+        """
+        SELECT transcript FROM answers
+        WHERE session_id = ? AND question_number IS NOT NULL AND transcript IS NOT NULL AND transcript <> ''
+        ORDER BY question_number
+        """,
+        (session_id,),
+    ).fetchall()
+    return [r["transcript"] for r in rows]
+
+
+def _list_user_ids(conn, only_stale: bool, agg_version: int) -> list[str]:
+    rows = conn.execute(
+        "SELECT user_id FROM users WHERE NOT ? OR agg_version IS NULL OR agg_version <> ?",
+        (int(bool(only_stale)), agg_version),
+    ).fetchall()
+    return [r["user_id"] for r in rows]
+
+
+# --- module API (called by services.memory) ---
+
+_store: SQLiteStore | None = None
+
+
+def get_store() -> SQLiteStore:
+    global _store
+    path = path_from_env()
+    if _store is None or _store.path != path:
+        if _store is not None:
+            _store.close()
+        _store = SQLiteStore(path)
+    return _store
+
+
+def close() -> None:
+    global _store
+    if _store is not None:
+        _store.close()
+        _store = None
+
+
+async def bootstrap() -> int:
+    """Open the store (applies migrations) off the event loop; returns the schema version."""
+    store = await asyncio.to_thread(get_store)
+    return store.version
+
+
+async def register_user(user_id: str, now, agg_version: int, **metadata) -> None:
+    await get_store().write(
+        _register_user,
+        user_id,
+        now,
+        agg_version,
+        metadata.get("role"),
+        metadata.get("company"),
+        metadata.get("level"),
+        metadata.get("difficulty"),
+    )
+
+
+async def write_batch(answers: list[dict], decisions: list[dict], agg_version: int) -> None:
+    await get_store().write(_write_batch, answers, decisions, agg_version)
+
+
+async def backfill_user_aggregates(user_id: str, now, agg_version: int) -> int | None:
+    return await get_store().write(_backfill, user_id, now, agg_version)
+
+
+async def load_profile(user_id: str, k: int) -> dict | None:
+    return await get_store().read(_load_profile, user_id, k)
+
+
+async def session_graph_rows(session_id: str) -> list[dict]:
+    return await get_store().read(_session_graph_rows, session_id)
+
+
+async def session_transcripts(session_id: str) -> list[str]:
+    return await get_store().read(_session_transcripts, session_id)
+
+
+async def list_user_ids(only_stale: bool, agg_version: int) -> list[str]:
+    return await get_store().read(_list_user_ids, only_stale, agg_version)
+
+
+def stats() -> dict:
+    if _store is None:
+        return {"path": path_from_env(), "open": False}
+    return {"path": _store.path, "open": True, "schema_version": _store.version}
@@ -1,21 +1,32 @@
 """Modulate Velma voice analysis. Stub when API key missing.
 
-This implementation now uses the Velma-2 STT **Streaming** API so we can
+Vendor calls for the three Velma-2 STT endpoints live here (transcribe_streaming,
+transcribe_batch, transcribe_vfast); services.transcription picks one per answer.
+
+The streaming path uses the Velma-2 STT **Streaming** API so we can
 get real-time(ish) transcripts and emotion/accent signals from a single
 recorded answer. We still send a pre-recorded blob from the browser, but
 we feed it to the WebSocket endpoint in chunks, following Modulate's
-streaming quickstart guide.
+streaming quickstart guide. Because the blob is already complete, chunks are
+sent in "burst" mode by default instead of being paced at realtime speed
+(see SEND_MODES and scripts/bench_modulate_send.py).
 """
 import logging
 import os
-from collections import Counter
 from models.session import ModulateResult
 
 
 logger = logging.getLogger(__name__)
 
+MODULATE_BASE_URL = "https://modulate-developer-apis.com"
+MODULATE_STREAMING_PATH = "/api/velma-2-stt-streaming"
+MODULATE_BATCH_PATH = "/api/velma-2-stt-batch"
+MODULATE_VFAST_PATH = "/api/velma-2-stt-batch-english-vfast"
 MODULATE_STREAMING_URL = "wss://modulate-developer-apis.com/api/velma-2-stt-streaming"
 
+# Batch endpoints answer after the whole file is processed; vfast documents a 60s server timeout.
+BATCH_TIMEOUT_SECONDS = 90.0
+
 
 def _get_modulate_api_key() -> str | None:
     # Read env at call-time so load_dotenv timing never surprises us.
@@ -31,198 +42,895 @@ def _level_from_confidence(conf: float) -> str:
     return "low"
 
 
+_STRESS_LABELS = frozenset({
+    "Stressed", "Anxious", "Afraid", "Concerned", "Angry", "Frustrated",
+    "Ashamed", "Sad", "Tired", "Disgusted", "Disappointed", "Confused",
+})
+_CONFIDENT_LABELS = frozenset({
+    "Confident", "Proud", "Excited", "Hopeful", "Interested", "Calm",
+    "Happy", "Amused", "Relieved", "Affectionate",
+})
+
+
+class EmotionScorer:
+    """
+    Running stress/confidence over utterance emotions, updated one utterance at a time so
+    partial results can be published while Velma-2 is still transcribing. Gives the same
+    scores as _scores_from_emotions over the same labels.
+    """
+
+    __slots__ = ("labelled", "stress", "confident", "texts", "end_ms")
+
+    def __init__(self) -> None:
+        self.labelled = 0
+        self.stress = 0
+        self.confident = 0
+        self.texts: list[str] = []
+        self.end_ms = 0
+
+    def add_label(self, label) -> None:
+        if not isinstance(label, str) or not label.strip():
+            return
+        label = label.strip()
+        self.labelled += 1
+        if label in _STRESS_LABELS:
+            self.stress += 1
+        elif label in _CONFIDENT_LABELS:
+            self.confident += 1
+
+    def update(self, utterance: dict) -> None:
+        self.add_label(utterance.get("emotion"))
+        text = str(utterance.get("text") or "").strip()
+        if text:
+            self.texts.append(text)
+        try:
+            end = int(utterance.get("start_ms") or 0) + int(utterance.get("duration_ms") or 0)
+        except (TypeError, ValueError):
+            end = 0
+        self.end_ms = max(self.end_ms, end)
+
+    def scores(self) -> tuple[float, float]:
+        if not self.labelled:
+            return 0.35, 0.6
+        # Keep a reasonable floor/ceiling so downstream UI remains stable.
+        stress_score = max(0.05, min(0.95, 0.2 + 0.9 * self.stress / self.labelled))
+        confidence_score = max(0.05, min(0.95, 0.3 + 0.9 * self.confident / self.labelled))
+        return stress_score, confidence_score
+
+    def snapshot(self) -> ModulateResult:
+        """Partial ModulateResult for the utterances seen so far."""
+        stress_score, confidence_score = self.scores()
+        return ModulateResult(
+            transcript=" ".join(self.texts),
+            stress_score=float(stress_score),
+            confidence_level=_level_from_confidence(float(confidence_score)),
+            confidence_score=float(confidence_score),
+            hesitation_count=0,
+            emotion={
+                "partial": True,
+                "utterance_count": len(self.texts),
+                "labelled_count": self.labelled,
+                "audio_ms": self.end_ms,
+            },
+            deception_score=None,
+        )
+
+
 def _scores_from_emotions(emotions: list[str]) -> tuple[float, float]:
     """
     Map utterance-level emotion labels to (stress_score, confidence_score) in [0,1].
     Modulate returns categorical emotions (e.g. "Stressed", "Confident") when enabled.
     """
-    if not emotions:
-        return 0.35, 0.6
+    scorer = EmotionScorer()
+    for label in emotions or ():
+        scorer.add_label(label)
+    return scorer.scores()
+
+
+# Send modes for feeding audio into the streaming socket:
+# - "realtime": pace chunks at the quickstart's nominal rate (only useful for live mic audio)
+# - "burst":    the browser already uploaded the whole recording; push chunks as fast as the
+#               socket's own flow control (send_bytes awaits the transport drain) allows
+# - "adaptive": burst, but back off when send latency climbs well above the handshake RTT
+SEND_MODES = ("realtime", "burst", "adaptive")
+DEFAULT_SEND_MODE = "burst"
 
-    counts = Counter(e.strip() for e in emotions if isinstance(e, str) and e.strip())
-    total = sum(counts.values()) or 1
+CHUNK_SIZE = 8192
+# Multipart uploads to the batch endpoints are streamed in larger chunks.
+UPLOAD_CHUNK_SIZE = 64 * 1024
+REALTIME_SECONDS_PER_CHUNK = CHUNK_SIZE / 4000.0  # from Modulate quickstart
 
-    stress_labels = {
-        "Stressed", "Anxious", "Afraid", "Concerned", "Angry", "Frustrated",
-        "Ashamed", "Sad", "Tired", "Disgusted", "Disappointed", "Confused",
-    }
-    confident_labels = {
-        "Confident", "Proud", "Excited", "Hopeful", "Interested", "Calm",
-        "Happy", "Amused", "Relieved", "Affectionate",
-    }
+# 4029 = rate limit (monthly or concurrent). Concurrent-limit rejections clear quickly,
+# so retry the handshake a few times with exponential backoff.
+RATE_LIMIT_CLOSE_CODE = 4029
+RATE_LIMIT_MAX_RETRIES = 3
+RATE_LIMIT_BACKOFF_SECONDS = 0.5
 
-    stress_mass = sum(counts.get(lbl, 0) for lbl in stress_labels) / total
-    conf_mass = sum(counts.get(lbl, 0) for lbl in confident_labels) / total
 
-    # Keep a reasonable floor/ceiling so downstream UI remains stable.
-    stress_score = max(0.05, min(0.95, 0.2 + 0.9 * stress_mass))
-    confidence_score = max(0.05, min(0.95, 0.3 + 0.9 * conf_mass))
-    return stress_score, confidence_score
+class ModulateRateLimited(RuntimeError):
+    """Velma-2 rejected the request for rate limiting (WebSocket 4029 / HTTP 429)."""
 
 
-async def analyze_voice(audio_bytes: bytes, session_ctx: dict | None = None) -> ModulateResult:
+def _send_mode(session_ctx: dict | None) -> str:
+    mode = ((session_ctx or {}).get("send_mode") or os.getenv("MODULATE_SEND_MODE") or DEFAULT_SEND_MODE)
+    mode = str(mode).strip().lower()
+    return mode if mode in SEND_MODES else DEFAULT_SEND_MODE
+
+
+def _api_url(path: str, override_env: str) -> str:
     """
-    Send audio to Modulate Velma-2 STT Streaming API.
-    Returns transcript, derived stress/confidence, and raw metadata.
-    Uses stub when MODULATE_API_KEY is not set or request fails.
+    Endpoint URL: explicit per-endpoint override, else MODULATE_BASE_URL + path.
+    Pointing MODULATE_BASE_URL at a local stand-in exercises every backend offline.
     """
-    api_key = _get_modulate_api_key()
-    if not api_key:
-        logger.warning("Modulate stub: MODULATE_API_KEY is not set; returning stub ModulateResult.")
-        print("[Modulate] MODULATE_API_KEY missing; using stub result.")
-        return _stub_result(audio_bytes)
+    override = (os.getenv(override_env) or "").strip()
+    if override:
+        return override
+    base = (os.getenv("MODULATE_BASE_URL") or "").strip().rstrip("/") or MODULATE_BASE_URL
+    return base + path
+
+
+def _streaming_url() -> str:
+    url = _api_url(MODULATE_STREAMING_PATH, "MODULATE_STREAMING_URL")
+    if url.startswith("https://"):
+        return "wss://" + url[len("https://"):]
+    if url.startswith("http://"):
+        return "ws://" + url[len("http://"):]
+    return url
+
+
+class AdaptivePacer:
+    """
+    AIMD pacing for "adaptive" send mode.
+
+    `rtt_s` is seeded from the WebSocket handshake. Each chunk's send latency (time for
+    send_bytes to drain into the transport) is compared with the smoothed RTT: when it
+    exceeds `slow_factor` x RTT the inter-chunk delay doubles (starting at `min_delay`),
+    otherwise it halves. A prior 4029 starts the pacer at realtime speed.
+    """
+
+    def __init__(
+        self,
+        rtt_s: float,
+        rate_limited: bool = False,
+        min_delay: float = 0.005,
+        max_delay: float = REALTIME_SECONDS_PER_CHUNK,
+        slow_factor: float = 4.0,
+    ) -> None:
+        self.rtt_s = max(rtt_s, 0.001)
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.slow_factor = slow_factor
+        self.delay = max_delay if rate_limited else 0.0
+
+    def observe(self, send_latency_s: float) -> float:
+        """Record one chunk's send latency; return how long to sleep before the next chunk."""
+        if send_latency_s > self.slow_factor * self.rtt_s:
+            self.delay = min(self.max_delay, max(self.min_delay, self.delay * 2))
+        else:
+            self.delay = self.delay / 2 if self.delay > self.min_delay else 0.0
+        # EWMA so a single stall doesn't redefine the baseline.
+        self.rtt_s = 0.875 * self.rtt_s + 0.125 * max(send_latency_s, 0.001)
+        return self.delay
+
+
+class AudioTooLarge(ValueError):
+    """Audio exceeded the per-answer byte limit while it was being read."""
+
+
+class AudioSource:
+    """
+    Re-readable audio input, consumed in fixed-size chunks: either in-memory bytes or an
+    uploaded (spooled) file, so a whole recording never has to be materialized as one
+    bytes object. `max_bytes` is enforced with a running byte count while reading.
+    Uploads expose Starlette's async read(n)/seek(pos); reads are sequential, not concurrent.
+    """
+
+    def __init__(
+        self,
+        *,
+        data: bytes | None = None,
+        upload=None,
+        size: int = 0,
+        filename: str | None = None,
+        content_type: str | None = None,
+        max_bytes: int | None = None,
+    ) -> None:
+        self._data = data
+        self._upload = upload
+        self.size = size
+        self.filename = filename
+        self.content_type = content_type
+        self.max_bytes = max_bytes
+
+    @classmethod
+    def from_bytes(cls, data: bytes | None, **kwargs) -> "AudioSource":
+        data = data or b""
+        return cls(data=data, size=len(data), **kwargs)
+
+    @classmethod
+    def from_upload(cls, upload, max_bytes: int | None = None) -> "AudioSource":
+        size = upload.size
+        if size is None:
+            # Spooled file (memory or disk): seeking to the end is cheap and reads nothing.
+            pos = upload.file.tell()
+            upload.file.seek(0, 2)
+            size = upload.file.tell()
+            upload.file.seek(pos)
+        return cls(
+            upload=upload,
+            size=int(size),
+            filename=upload.filename,
+            content_type=upload.content_type,
+            max_bytes=max_bytes,
+        )
 
+    @classmethod
+    def coerce(cls, audio) -> "AudioSource":
+        return audio if isinstance(audio, AudioSource) else cls.from_bytes(audio)
+
+    def _check(self, total: int) -> None:
+        if self.max_bytes is not None and total > self.max_bytes:
+            raise AudioTooLarge(f"Audio exceeds {self.max_bytes} bytes")
+
+    async def iter_chunks(self, chunk_size: int = CHUNK_SIZE):
+        total = 0
+        if self._upload is None:
+            mv = memoryview(self._data or b"")
+            for offset in range(0, len(mv), chunk_size):
+                chunk = mv[offset : offset + chunk_size]
+                total += len(chunk)
+                self._check(total)
+                yield chunk
+            return
+        await self._upload.seek(0)
+        while True:
+            chunk = await self._upload.read(chunk_size)
+            if not chunk:
+                break
+            total += len(chunk)
+            self._check(total)
+            yield chunk
+
+    async def read_all(self) -> bytes:
+        if self._upload is None:
+            return self._data or b""
+        return b"".join([bytes(c) async for c in self.iter_chunks(64 * 1024)])
+
+
+def _emit_partial(on_partial, scorer: EmotionScorer) -> None:
+    # Partial results are advisory; a failing subscriber must never break transcription.
     try:
-        import asyncio
-        import json
+        on_partial(scorer.snapshot())
+    except Exception:
+        logger.exception("Modulate on_partial callback failed (ignored).")
+
+
+async def _stream_once(
+    url: str,
+    source: AudioSource,
+    send_mode: str,
+    rate_limited: bool,
+    prewarm_key: str | None = None,
+    on_partial=None,
+) -> tuple[list[dict], int | None]:
+    """
+    One WebSocket round: send audio, collect utterances until `done`. Raises ModulateRateLimited
+    on 4029. `on_partial(ModulateResult)` is called after each utterance with running scores.
+    """
+    import asyncio
+    import json
+    import time
+    import aiohttp
+
+    utterances: list[dict] = []
+    done_duration_ms: int | None = None
+    scorer = EmotionScorer() if on_partial is not None else None
+
+    ws, handshake_rtt = await _open_stream(url, prewarm_key)
+    async with ws:
+
+        # Task to send audio bytes in the background
+        async def send_audio() -> None:
+            sent = 0
+            pacer = AdaptivePacer(handshake_rtt, rate_limited=rate_limited) if send_mode == "adaptive" else None
+            t_send = time.perf_counter()
+            async for chunk in source.iter_chunks(CHUNK_SIZE):
+                t0 = time.perf_counter()
+                await ws.send_bytes(chunk)
+                sent += len(chunk)
+                if send_mode == "realtime":
+                    await asyncio.sleep(REALTIME_SECONDS_PER_CHUNK)
+                elif pacer is not None:
+                    delay = pacer.observe(time.perf_counter() - t0)
+                    if delay:
+                        await asyncio.sleep(delay)
+            # Signal end of audio
+            await ws.send_str("")
+            print(
+                f"[Modulate] Streaming send complete: {sent} bytes in "
+                f"{(time.perf_counter() - t_send) * 1000:.0f}ms (mode={send_mode})"
+            )
+
+        send_task = asyncio.create_task(send_audio())
+        # If sending fails (e.g. AudioTooLarge), close the socket so the receive loop ends.
+        send_task.add_done_callback(
+            lambda t: asyncio.ensure_future(ws.close()) if not t.cancelled() and t.exception() else None
+        )
+
+        try:
+            async for msg in ws:
+                if msg.type == aiohttp.WSMsgType.TEXT:
+                    data = json.loads(msg.data)
+                    msg_type = data.get("type")
+                    if msg_type == "utterance":
+                        u = data.get("utterance") or {}
+                        utterances.append(u)
+                        if scorer is not None:
+                            scorer.update(u)
+                            _emit_partial(on_partial, scorer)
+                    elif msg_type == "done":
+                        done_duration_ms = int(data.get("duration_ms") or 0)
+                        break
+                    elif msg_type == "error":
+                        err = data.get("error") or "Unknown error"
+                        logger.error("Modulate streaming error message: %s", err)
+                        print(f"[Modulate] Streaming error from Velma-2: {err}")
+                        raise RuntimeError(f"Modulate streaming error: {err}")
+                elif msg.type in (
+                    aiohttp.WSMsgType.ERROR,
+                    aiohttp.WSMsgType.CLOSE,
+                    aiohttp.WSMsgType.CLOSED,
+                ):
+                    logger.warning("Modulate streaming connection closed with type=%s", msg.type)
+                    break
+        finally:
+            if not send_task.done():
+                send_task.cancel()
+                try:
+                    await send_task
+                except (asyncio.CancelledError, ConnectionResetError):
+                    pass
+            elif not send_task.cancelled() and send_task.exception() is not None:
+                raise send_task.exception()
+
+        if ws.close_code == RATE_LIMIT_CLOSE_CODE and not utterances and done_duration_ms is None:
+            raise ModulateRateLimited("Velma-2 rejected the stream with 4029 (rate limit)")
+
+    return utterances, done_duration_ms
+
+
+# --- Application-lifetime client ---
+# Building an SSL context parses the whole CA bundle, and a fresh connector means a fresh
+# TCP + TLS handshake per answer, so both are created once and shared. close_client() is
+# called from the FastAPI lifespan on shutdown.
+
+_ssl_ctx: tuple | None = None
+_http_session = None
+_http_session_loop = None
+
+# prewarm_key -> (ws, url, handshake_rtt_s, opened_at) for sockets opened when the candidate
+# presses record, so the WebSocket handshake is off the answer's critical path.
+_prewarmed: dict[str, tuple] = {}
+# The socket is opened when recording starts, so it must outlive the UI's 90 s maximum recording
+# plus the upload before the answer claims it.
+DEFAULT_PREWARM_TTL_SECONDS = 150.0
+_prewarm_stats = {"opened": 0, "used": 0, "expired": 0, "closed_by_server": 0, "failed": 0}
+
+
+def _prewarm_ttl_seconds() -> float:
+    try:
+        return max(1.0, float(os.getenv("MODULATE_PREWARM_TTL_SECONDS") or DEFAULT_PREWARM_TTL_SECONDS))
+    except ValueError:
+        return DEFAULT_PREWARM_TTL_SECONDS
+
+
+def prewarm_stats() -> dict:
+    """Parked-socket counters for the status endpoint (expired = closed unused after the TTL)."""
+    return {**_prewarm_stats, "parked": len(_prewarmed), "ttl_seconds": _prewarm_ttl_seconds()}
+
+
+def _ssl_context():
+    global _ssl_ctx
+    if _ssl_ctx is None:
         import ssl
-        import aiohttp
 
         try:
             import certifi  # type: ignore[import]
-            ssl_context = ssl.create_default_context(cafile=certifi.where())
-            ssl_mode = "certifi"
+            _ssl_ctx = (ssl.create_default_context(cafile=certifi.where()), "certifi")
         except Exception:
             # Fallback to default SSL context if certifi is unavailable.
-            ssl_context = ssl.create_default_context()
-            ssl_mode = "default"
+            _ssl_ctx = (ssl.create_default_context(), "default")
+    return _ssl_ctx
 
-        payload_size = len(audio_bytes) if audio_bytes is not None else 0
-        print(
-            f"[Modulate] Streaming to Velma-2: url={MODULATE_STREAMING_URL}, "
-            f"audio_bytes={payload_size}, ssl_mode={ssl_mode}"
-        )
-        logger.info(
-            "Modulate analyze_voice (streaming): WS %s with audio_bytes=%d ssl_mode=%s",
-            MODULATE_STREAMING_URL,
-            payload_size,
-            ssl_mode,
-        )
 
-        # Build WebSocket URL with query params as per docs.
-        # Request English-only transcription; override via MODULATE_LANGUAGE (e.g. en) if API supports it.
-        lang = (os.getenv("MODULATE_LANGUAGE") or "en").strip().lower() or "en"
-        url = (
-            f"{MODULATE_STREAMING_URL}"
-            f"?api_key={api_key}"
-            f"&speaker_diarization=true"
-            f"&emotion_signal=true"
-            f"&accent_signal=true"
-            f"&pii_phi_tagging=false"
-            f"&language={lang}"
-        )
+def _pool_limit() -> int:
+    try:
+        return max(1, int(os.getenv("MODULATE_POOL_LIMIT") or 100))
+    except ValueError:
+        return 100
+
+
+async def get_http_session():
+    """Shared aiohttp session (keep-alive connector, cached SSL context, DNS cache)."""
+    global _http_session, _http_session_loop
+    import asyncio
+    import aiohttp
+
+    loop = asyncio.get_running_loop()
+    if _http_session is not None and not _http_session.closed and _http_session_loop is loop:
+        return _http_session
+    ssl_context, _ = _ssl_context()
+    connector = aiohttp.TCPConnector(
+        ssl=ssl_context,
+        limit=_pool_limit(),
+        use_dns_cache=True,
+        ttl_dns_cache=300,
+        keepalive_timeout=30,
+    )
+    _http_session = aiohttp.ClientSession(connector=connector)
+    _http_session_loop = loop
+    return _http_session
 
-        CHUNK_SIZE = 8192
-        seconds_per_chunk = CHUNK_SIZE / 4000.0  # from Modulate quickstart
-
-        utterances: list[dict] = []
-        done_duration_ms: int | None = None
-
-        connector = aiohttp.TCPConnector(ssl=ssl_context)
-        async with aiohttp.ClientSession(connector=connector) as session:
-            async with session.ws_connect(url) as ws:
-                # Task to send audio bytes in the background
-                async def send_audio() -> None:
-                    nonlocal audio_bytes
-                    sent = 0
-                    mv = memoryview(audio_bytes or b"")
-                    for offset in range(0, len(mv), CHUNK_SIZE):
-                        chunk = mv[offset : offset + CHUNK_SIZE]
-                        if not chunk:
-                            break
-                        await ws.send_bytes(chunk)
-                        sent += len(chunk)
-                        await asyncio.sleep(seconds_per_chunk)
-                    # Signal end of audio
-                    await ws.send_str("")
-                    print(f"[Modulate] Streaming send complete: {sent} bytes")
-
-                send_task = asyncio.create_task(send_audio())
 
-                try:
-                    async for msg in ws:
-                        if msg.type == aiohttp.WSMsgType.TEXT:
-                            data = json.loads(msg.data)
-                            msg_type = data.get("type")
-                            if msg_type == "utterance":
-                                u = data.get("utterance") or {}
-                                utterances.append(u)
-                            elif msg_type == "done":
-                                done_duration_ms = int(data.get("duration_ms") or 0)
-                                break
-                            elif msg_type == "error":
-                                err = data.get("error") or "Unknown error"
-                                logger.error("Modulate streaming error message: %s", err)
-                                print(f"[Modulate] Streaming error from Velma-2: {err}")
-                                raise RuntimeError(f"Modulate streaming error: {err}")
-                        elif msg.type in (
-                            aiohttp.WSMsgType.ERROR,
-                            aiohttp.WSMsgType.CLOSE,
-                            aiohttp.WSMsgType.CLOSED,
-                        ):
-                            logger.warning("Modulate streaming connection closed with type=%s", msg.type)
-                            break
-                finally:
-                    if not send_task.done():
-                        send_task.cancel()
-                        try:
-                            await send_task
-                        except asyncio.CancelledError:
-                            pass
-
-        transcript = " ".join(
-            str(u.get("text", "")).strip() for u in utterances if isinstance(u, dict) and u.get("text")
-        ).strip()
-        emotions = [
-            str(u.get("emotion"))
-            for u in utterances
-            if isinstance(u, dict) and u.get("emotion") not in (None, "")
-        ]
-        speakers = {
-            u.get("speaker")
-            for u in utterances
-            if isinstance(u, dict) and u.get("speaker") is not None
-        }
-
-        stress_score, confidence_score = _scores_from_emotions(emotions)
-
-        logger.info(
-            "Modulate streaming OK: utterances=%d speakers=%d duration_ms=%s",
-            len(utterances),
-            len(speakers),
-            done_duration_ms,
-        )
-        print(
-            "[Modulate] Streaming OK: "
-            f"utterance_count={len(utterances)}, "
-            f"speakers={len(speakers)}, "
-            f"duration_ms={done_duration_ms}"
-        )
+async def close_client() -> None:
+    """Close parked sockets and the shared session (FastAPI lifespan shutdown)."""
+    global _http_session, _http_session_loop
+    for key in list(_prewarmed):
+        ws = _prewarmed.pop(key)[0]
+        try:
+            await ws.close()
+        except Exception:
+            pass
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+    _http_session_loop = None
+
+
+def _streaming_ws_url(api_key: str, session_ctx: dict | None) -> str:
+    # Build WebSocket URL with query params as per docs.
+    emotion = "true" if _emotion_enabled(session_ctx) else "false"
+    return (
+        f"{_streaming_url()}"
+        f"?api_key={api_key}"
+        f"&speaker_diarization=true"
+        f"&emotion_signal={emotion}"
+        f"&accent_signal={emotion}"
+        f"&pii_phi_tagging=false"
+        f"&language={_language(session_ctx)}"
+    )
 
-        return ModulateResult(
-            transcript=transcript or "[Modulate] (empty transcript)",
-            stress_score=float(stress_score),
-            confidence_level=_level_from_confidence(float(confidence_score)),
-            confidence_score=float(confidence_score),
-            hesitation_count=0,
-            emotion={
-                "model": "velma-2-stt-streaming",
-                "duration_ms": done_duration_ms,
-                "utterance_count": len(utterances),
-                "speaker_count": len(speakers),
-                "raw_utterances": utterances,
-            },
-            deception_score=None,
-        )
+
+async def _drop_stale_prewarmed() -> None:
+    import time
+
+    now = time.monotonic()
+    ttl = _prewarm_ttl_seconds()
+    for key, (ws, _, _, opened_at) in list(_prewarmed.items()):
+        if ws.closed or now - opened_at > ttl:
+            _prewarm_stats["closed_by_server" if ws.closed else "expired"] += 1
+            _prewarmed.pop(key, None)
+            try:
+                await ws.close()
+            except Exception:
+                pass
+
+
+async def prewarm_stream(prewarm_key: str, session_ctx: dict | None = None) -> bool:
+    """
+    Open (and park) a streaming socket ahead of time, e.g. when the candidate presses
+    record. The next transcription with the same prewarm_key and parameters reuses it.
+    Returns False in stub mode or if the handshake fails.
+    """
+    import time
+
+    api_key = _get_modulate_api_key()
+    if not api_key or not prewarm_key:
+        return False
+    await _drop_stale_prewarmed()
+    if prewarm_key in _prewarmed:
+        return True
+    url = _streaming_ws_url(api_key, session_ctx)
+    try:
+        session = await get_http_session()
+        t0 = time.perf_counter()
+        ws = await session.ws_connect(url)
+        _prewarmed[prewarm_key] = (ws, url, time.perf_counter() - t0, time.monotonic())
+        _prewarm_stats["opened"] += 1
+        return True
     except Exception as exc:
-        logger.exception("Modulate analyze_voice failed; falling back to stub result.")
-        print(
-            "[Modulate] analyze_voice exception; using stub result. "
-            f"type={type(exc).__name__}, details={getattr(exc, 'args', '')}"
-        )
-        return _stub_result(audio_bytes)
+        _prewarm_stats["failed"] += 1
+        logger.warning("Modulate prewarm failed (%s)", type(exc).__name__)
+        return False
+
+
+async def _open_stream(url: str, prewarm_key: str | None = None):
+    """Return (ws, handshake_rtt_s): a fresh parked socket for this url, else a new connection."""
+    import time
+
+    await _drop_stale_prewarmed()
+    if prewarm_key and prewarm_key in _prewarmed and _prewarmed[prewarm_key][1] == url:
+        ws, _, rtt, _ = _prewarmed.pop(prewarm_key)
+        _prewarm_stats["used"] += 1
+        print("[Modulate] Using prewarmed streaming socket")
+        return ws, rtt
+    session = await get_http_session()
+    t0 = time.perf_counter()
+    ws = await session.ws_connect(url)
+    return ws, time.perf_counter() - t0
+
+
+def _language(session_ctx: dict | None) -> str:
+    # Request English-only transcription; override via MODULATE_LANGUAGE (e.g. en) if API supports it.
+    lang = (session_ctx or {}).get("language") or os.getenv("MODULATE_LANGUAGE") or "en"
+    return str(lang).strip().lower() or "en"
+
+
+def _emotion_enabled(session_ctx: dict | None) -> bool:
+    return bool((session_ctx or {}).get("emotion", True))
+
+
+def _upload_filename(session_ctx: dict | None, source=None) -> str:
+    return str((session_ctx or {}).get("filename") or getattr(source, "filename", None) or "answer.webm")
+
+
+def _result_from_utterances(utterances: list[dict], duration_ms: int | None, model: str) -> ModulateResult:
+    """
+    Shared mapping from Velma-2 utterances (streaming or batch) to ModulateResult.
+    The rows are kept compactly on the result (`result.utterances`); `emotion` holds only a summary.
+    """
+    from services.utterances import UtteranceStore
+
+    store = UtteranceStore.from_utterances(utterances)
+    transcript = " ".join(t.strip() for t in store.texts if t.strip()).strip()
+    summary = store.summary()
+
+    stress_score, confidence_score = _scores_from_emotions(store.emotion_labels())
+
+    logger.info(
+        "Modulate %s OK: utterances=%d speakers=%d duration_ms=%s",
+        model,
+        summary["utterance_count"],
+        summary["speaker_count"],
+        duration_ms,
+    )
+    print(
+        f"[Modulate] {model} OK: "
+        f"utterance_count={summary['utterance_count']}, "
+        f"speakers={summary['speaker_count']}, "
+        f"duration_ms={duration_ms}"
+    )
+
+    result = ModulateResult(
+        transcript=transcript or "[Modulate] (empty transcript)",
+        stress_score=float(stress_score),
+        confidence_level=_level_from_confidence(float(confidence_score)),
+        confidence_score=float(confidence_score),
+        hesitation_count=0,
+        emotion={
+            "model": model,
+            "duration_ms": duration_ms,
+            **summary,
+        },
+        deception_score=None,
+    )
+    result._utterances = store
+    return result
+
+
+async def transcribe_streaming(audio, session_ctx: dict | None = None) -> ModulateResult:
+    """
+    Velma-2 STT Streaming (WebSocket). Raises on failure so the transcription
+    router can fall back to another backend.
+    """
+    import asyncio
+
+    api_key = _get_modulate_api_key()
+    if not api_key:
+        raise RuntimeError("MODULATE_API_KEY is not set")
+
+    _, ssl_mode = _ssl_context()
+    send_mode = _send_mode(session_ctx)
+    streaming_url = _streaming_url()
+    prewarm_key = (session_ctx or {}).get("prewarm_key")
+    source = AudioSource.coerce(audio)
+    payload_size = source.size
+    print(
+        f"[Modulate] Streaming to Velma-2: url={streaming_url}, "
+        f"audio_bytes={payload_size}, ssl_mode={ssl_mode}, send_mode={send_mode}"
+    )
+    logger.info(
+        "Modulate analyze_voice (streaming): WS %s with audio_bytes=%d ssl_mode=%s send_mode=%s",
+        streaming_url,
+        payload_size,
+        ssl_mode,
+        send_mode,
+    )
+
+    url = _streaming_ws_url(api_key, session_ctx)
+    rate_limited = False
+    for attempt in range(RATE_LIMIT_MAX_RETRIES + 1):
+        try:
+            utterances, done_duration_ms = await _stream_once(
+                url,
+                source,
+                send_mode,
+                rate_limited,
+                prewarm_key if attempt == 0 else None,
+                on_partial=(session_ctx or {}).get("on_partial"),
+            )
+            break
+        except ModulateRateLimited:
+            if attempt >= RATE_LIMIT_MAX_RETRIES:
+                raise
+            rate_limited = True
+            backoff = RATE_LIMIT_BACKOFF_SECONDS * (2 ** attempt)
+            logger.warning("Modulate 4029 rate limit; retrying in %.1fs (attempt %d)", backoff, attempt + 1)
+            await asyncio.sleep(backoff)
+
+    return _result_from_utterances(utterances, done_duration_ms, "velma-2-stt-streaming")
+
+
+async def _post_upload(url: str, audio, session_ctx: dict | None, fields: dict[str, str]) -> dict:
+    """
+    POST multipart `upload_file` (+ form fields) to a Velma-2 batch endpoint and return the JSON body.
+    The file part is streamed from the AudioSource in chunks rather than buffered.
+    """
+    import aiohttp
+
+    api_key = _get_modulate_api_key()
+    if not api_key:
+        raise RuntimeError("MODULATE_API_KEY is not set")
+    form = aiohttp.FormData()
+    source = AudioSource.coerce(audio)
+    form.add_field(
+        "upload_file",
+        source.iter_chunks(UPLOAD_CHUNK_SIZE),
+        filename=_upload_filename(session_ctx, source),
+        content_type=(session_ctx or {}).get("content_type") or source.content_type or "application/octet-stream",
+    )
+    for k, v in fields.items():
+        form.add_field(k, v)
+    print(f"[Modulate] Uploading to {url}: audio_bytes={source.size}")
+    timeout = aiohttp.ClientTimeout(total=BATCH_TIMEOUT_SECONDS)
+    session = await get_http_session()
+    async with session.post(url, data=form, headers={"X-API-Key": api_key}, timeout=timeout) as resp:
+        if resp.status == 429:
+            raise ModulateRateLimited(f"{url} returned 429 (rate limit)")
+        if resp.status >= 400:
+            body = (await resp.text())[:200]
+            raise RuntimeError(f"{url} returned {resp.status}: {body}")
+        return await resp.json()
+
+
+async def transcribe_batch(audio, session_ctx: dict | None = None) -> ModulateResult:
+    """Velma-2 STT Batch (multipart upload, full utterances incl. emotion). Raises on failure."""
+    emotion = "true" if _emotion_enabled(session_ctx) else "false"
+    data = await _post_upload(
+        _api_url(MODULATE_BATCH_PATH, "MODULATE_BATCH_URL"),
+        audio,
+        session_ctx,
+        {
+            "speaker_diarization": "true",
+            "emotion_signal": emotion,
+            "accent_signal": emotion,
+            "pii_phi_tagging": "false",
+        },
+    )
+    utterances = [u for u in (data.get("utterances") or []) if isinstance(u, dict)]
+    return _result_from_utterances(utterances, int(data.get("duration_ms") or 0), "velma-2-stt-batch")
+
+
+async def transcribe_vfast(audio, session_ctx: dict | None = None) -> ModulateResult:
+    """
+    Velma-2 STT Batch English VFast: English-only, Opus-only, transcript + duration with
+    no utterances or emotion, so stress/confidence fall back to neutral defaults. Raises on failure.
+    """
+    data = await _post_upload(
+        _api_url(MODULATE_VFAST_PATH, "MODULATE_VFAST_URL"),
+        audio,
+        session_ctx,
+        {},
+    )
+    text = str(data.get("text") or "").strip()
+    duration_ms = int(data.get("duration_ms") or 0)
+    result = _result_from_utterances([], duration_ms, "velma-2-stt-batch-english-vfast")
+    result.transcript = text or "[Modulate] (empty transcript)"
+    return result
+
+
+class LiveTranscription:
+    """
+    Relay microphone chunks into one Velma-2 streaming socket while the candidate is still
+    speaking, accumulating utterances server-side so the transcript is (nearly) complete
+    when they stop. Every chunk is also buffered (up to `max_bytes`); if the live socket
+    fails, finish() transcribes the buffer through analyze_voice instead.
+    """
+
+    def __init__(
+        self,
+        session_ctx: dict | None = None,
+        on_utterance=None,
+        max_bytes: int = 8 * 1024 * 1024,
+        on_partial=None,
+    ) -> None:
+        self.session_ctx = dict(session_ctx or {})
+        self.on_utterance = on_utterance  # optional async callback(utterance: dict)
+        self.on_partial = on_partial  # optional callback(partial: ModulateResult)
+        self.scorer = EmotionScorer()
+        self.max_bytes = max_bytes
+        self.utterances: list[dict] = []
+        self.bytes_received = 0
+        self._buffer = bytearray()
+        self._duration_ms: int | None = None
+        self._error: Exception | None = None
+        self._ws = None
+        self._reader = None
+        self._done = None
+
+    @property
+    def relaying(self) -> bool:
+        return self._ws is not None and self._error is None
+
+    async def start(self) -> None:
+        """Open the upstream socket. In stub mode (no key) or on failure, chunks are only buffered."""
+        import asyncio
+
+        self._done = asyncio.Event()
+        api_key = _get_modulate_api_key()
+        if not api_key:
+            logger.info("Modulate live relay stub: MODULATE_API_KEY not set; buffering only.")
+            return
+        try:
+            self._ws, _ = await _open_stream(
+                _streaming_ws_url(api_key, self.session_ctx),
+                self.session_ctx.get("prewarm_key"),
+            )
+            self._reader = asyncio.create_task(self._read())
+            print("[Modulate] Live relay connected to Velma-2 streaming")
+        except Exception as exc:
+            logger.warning("Modulate live relay connect failed (%s); buffering only.", type(exc).__name__)
+            self._error = exc
+            await self._close_upstream()
+
+    async def _read(self) -> None:
+        import json
+        import aiohttp
+
+        try:
+            async for msg in self._ws:
+                if msg.type == aiohttp.WSMsgType.TEXT:
+                    data = json.loads(msg.data)
+                    msg_type = data.get("type")
+                    if msg_type == "utterance":
+                        u = data.get("utterance") or {}
+                        self.utterances.append(u)
+                        self.scorer.update(u)
+                        if self.on_partial is not None:
+                            _emit_partial(self.on_partial, self.scorer)
+                        if self.on_utterance is not None:
+                            await self.on_utterance(u)
+                    elif msg_type == "done":
+                        self._duration_ms = int(data.get("duration_ms") or 0)
+                        break
+                    elif msg_type == "error":
+                        raise RuntimeError(f"Modulate streaming error: {data.get('error') or 'Unknown error'}")
+                elif msg.type in (
+                    aiohttp.WSMsgType.ERROR,
+                    aiohttp.WSMsgType.CLOSE,
+                    aiohttp.WSMsgType.CLOSED,
+                ):
+                    break
+            if self._duration_ms is None:
+                code = self._ws.close_code
+                raise RuntimeError(f"Velma-2 live socket closed before done (code={code})")
+        except Exception as exc:
+            logger.warning("Modulate live relay read failed: %s", type(exc).__name__)
+            self._error = exc
+        finally:
+            self._done.set()
+
+    async def send(self, chunk: bytes) -> None:
+        """Forward one chunk upstream (and keep it for fallback). Raises ValueError past max_bytes."""
+        self.bytes_received += len(chunk)
+        if self.bytes_received > self.max_bytes:
+            raise ValueError("Audio stream too large")
+        self._buffer.extend(chunk)
+        if self.relaying:
+            try:
+                await self._ws.send_bytes(chunk)
+            except Exception as exc:
+                logger.warning("Modulate live relay send failed (%s); will fall back.", type(exc).__name__)
+                self._error = exc
+
+    async def finish(self, timeout: float = 30.0) -> ModulateResult:
+        """Signal end of audio and return the result (live utterances, or fallback transcription)."""
+        import asyncio
+
+        try:
+            if self.relaying:
+                try:
+                    await self._ws.send_str("")
+                    await asyncio.wait_for(self._done.wait(), timeout=timeout)
+                except Exception as exc:
+                    self._error = self._error or exc
+            if self._ws is not None and self._error is None:
+                result = _result_from_utterances(self.utterances, self._duration_ms, "velma-2-stt-streaming")
+                if isinstance(result.emotion, dict):
+                    result.emotion["backend"] = "live"
+                return result
+        finally:
+            await self._close_upstream()
+        if not self._buffer:
+            return _stub_result(b"")
+        # Relay unavailable or failed mid-stream: transcribe the buffered recording instead.
+        return await analyze_voice(bytes(self._buffer), self.session_ctx)
+
+    async def _close_upstream(self) -> None:
+        if self._reader is not None and not self._reader.done():
+            self._reader.cancel()
+        if self._ws is not None and not self._ws.closed:
+            try:
+                await self._ws.close()
+            except Exception:
+                pass
+
+    async def aclose(self) -> None:
+        """Abort without a result (client disconnected)."""
+        await self._close_upstream()
+
+
+async def analyze_voice(audio, session_ctx: dict | None = None) -> ModulateResult:
+    """
+    Transcribe audio with Modulate Velma-2 and derive stress/confidence.
+    The backend (streaming / batch / vfast) is picked per answer by services.transcription,
+    falling back between backends on failure.
+    Uses stub when MODULATE_API_KEY is not set or every backend fails.
+
+    session_ctx keys (all optional): send_mode (see SEND_MODES), language, emotion (bool),
+    filename, content_type, backend (force one backend by name), prewarm_key,
+    cache (False bypasses services.transcription_cache), on_partial (callback receiving a
+    partial ModulateResult after each streamed utterance).
+
+    `audio` is bytes or an AudioSource (e.g. AudioSource.from_upload for a spooled upload,
+    streamed upstream in chunks). AudioTooLarge propagates so callers can reject the request.
+    """
+    api_key = _get_modulate_api_key()
+    if not api_key:
+        logger.warning("Modulate stub: MODULATE_API_KEY is not set; returning stub ModulateResult.")
+        print("[Modulate] MODULATE_API_KEY missing; using stub result.")
+        return _stub_result(audio)
+
+    from services import transcription, transcription_cache
+
+    source = AudioSource.coerce(audio)
+
+    async def _transcribe() -> ModulateResult:
+        try:
+            return await transcription.transcribe(source, session_ctx)
+        except AudioTooLarge:
+            raise
+        except Exception as exc:
+            logger.exception("Modulate analyze_voice failed; falling back to stub result.")
+            print(
+                "[Modulate] analyze_voice exception; using stub result. "
+                f"type={type(exc).__name__}, details={getattr(exc, 'args', '')}"
+            )
+            return _stub_result(source)
+
+    if (session_ctx or {}).get("cache") is False:
+        return await _transcribe()
+    # Identical audio + options (frontend retries, repeated demo recordings) hit the cache;
+    # stub results are never stored.
+    return await transcription_cache.get_or_transcribe(
+        source,
+        session_ctx,
+        _transcribe,
+        cacheable=lambda r: not r.transcript.startswith("[Stub]"),
+    )
+
 
-def _stub_result(audio_bytes: bytes) -> ModulateResult:
+def _stub_result(audio=None) -> ModulateResult:
     """Stub result when API key missing or request fails."""
     return ModulateResult(
         transcript="[Stub] User spoke for a short answer. Enable Modulate API for real analysis.",
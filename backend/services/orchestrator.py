@@ -1,5 +1,5 @@
 """Orchestrator: synthesize signals using Fastino, Yutori, and Modulate (OpenAI removed)."""
-import asyncio
+import copy
 import re
 import random
 from models.session import (
@@ -10,7 +10,8 @@ from models.session import (
     Level,
     Tone,
 )
-from services import claims, memory, yutori
+from services import factcheck_worker, memory
+from services.cache import SingleFlight, TTLCache
 
 
 # First question is always this; rest of the session is dynamic (company brief, RAG, etc.).
@@ -37,6 +38,13 @@ JD_FIRST_QUESTION_TEMPLATE = "Based on the {role} requirements for {company}, wa
 
 # When JD is long, use JD line this fraction of the time; otherwise use default.
 JD_FIRST_QUESTION_PROB = 0.5
+# How long a report waits for fact-checks still running in the background.
+REPORT_FACT_CHECK_WAIT_SECONDS = 20.0
+
+# Session reports memoized per (session_id, question_count): a new answer is a new version, so
+# reloading the report (GET /session/{id}/feedback, POST /session/{id}/end) is free until then.
+_reports = TTLCache(max_entries=256, ttl_seconds=6 * 3600, name="session_report")
+_report_flight = SingleFlight()
 
 # Keywords that suggest a line is a requirement or responsibility (for JD parsing).
 _JD_TOPIC_KEYWORDS = (
@@ -138,25 +146,12 @@ async def generate_first_question(
     return DEFAULT_FIRST_QUESTION
 
 
-async def generate_next_question(
-    current_question: str,
-    transcript: str,
-    modulate: ModulateResult,
-    yutori: FactCheckResult,
-    fastino_context: str,
-    rag_snippets: list[str],
-    session_state: dict,
-    company_brief: str | None = None,
-) -> OrchestratorResponse:
+def select_tone(stress: float, conf: float, session_state: dict) -> tuple[Tone, int]:
     """
-    Synthesize all signals WITHOUT OpenAI.
-    1. Tone/Difficulty: Derived directly from Modulate stress/confidence.
-    2. Feedback: Generated via Fastino profile query/summary.
-    3. Next Question: Pulled from Yutori company brief or state topics.
+    Map Modulate stress/confidence (plus recent history and difficulty preference) to
+    (tone, difficulty_delta). Also used on partial voice results so the UI can show the
+    likely tone before the final transcript lands.
     """
-    # 1. Map Modulate signals to Tone and Difficulty (with autonomy: use history for streaks)
-    stress = modulate.stress_score
-    conf = modulate.confidence_score
     history = session_state.get("modulate_history") or []
     recent = history[-3:] if len(history) >= 2 else []
 
@@ -196,15 +191,38 @@ async def generate_next_question(
             diff_delta = 0
         if tone == Tone.SUPPORTIVE and not high_stress_streak:
             tone = Tone.NEUTRAL
-    
+
+    return tone, diff_delta
+
+
+async def generate_next_question(
+    current_question: str,
+    transcript: str,
+    modulate: ModulateResult,
+    yutori: FactCheckResult,
+    fastino_context: str,
+    rag_snippets: list[str],
+    session_state: dict,
+    company_brief: str | None = None,
+    profile: memory.ProfileContext | None = None,
+) -> OrchestratorResponse:
+    """
+    Synthesize all signals WITHOUT OpenAI.
+    `profile` is the request's memory.load_profile_context() result; loaded here if not given.
+    1. Tone/Difficulty: Derived directly from Modulate stress/confidence.
+    2. Feedback: Generated via Fastino profile query/summary.
+    3. Next Question: Pulled from Yutori company brief or state topics.
+    """
+    # 1. Map Modulate signals to Tone and Difficulty (with autonomy: use history for streaks)
+    stress = modulate.stress_score
+    conf = modulate.confidence_score
+    tone, diff_delta = select_tone(stress, conf, session_state)
+
     # 2. Generate feedback using Fastino Task-Specific Reasoning
     # We use the stored profile context as an 'evaluator' input (demo-friendly, no LLM required)
-    eval_query = (
-        f"Evaluating this answer: '{transcript}'. "
-        f"The user had confidence={conf} and stress={stress}. "
-        f"Provide a 1-sentence supportive coach feedback note."
-    )
-    feedback_note = await memory.get_user_context(session_state.get("user_id", "default"), eval_query)
+    if profile is None:
+        profile = await memory.load_profile_context(session_state.get("user_id", "default"))
+    feedback_note = profile.summary
     
     if not feedback_note or "[Stub]" in feedback_note:
         # Code-based fallback if Fastino key missing or returns stub
@@ -243,11 +261,7 @@ async def generate_next_question(
             next_question = f"Regarding {target}, how have you demonstrated this in your past roles?"
     else:
         # Use Neo4j entity coverage to nudge toward under-covered topics.
-        user_id = session_state.get("user_id", "default")
-        try:
-            label_counts = await memory.get_entity_label_counts(user_id)
-        except Exception:
-            label_counts = {}
+        label_counts = profile.label_counts
 
         if label_counts:
             core_labels = [
@@ -301,16 +315,34 @@ async def generate_next_question(
     )
 
 
-async def generate_session_report(
-    session_id: str,
-    user_id: str,
-    fastino_context: str,
-    rag_snippets: list[str],
-    session_state: dict,
-) -> dict:
+async def get_session_report(session_id: str, user_id: str, session_state: dict) -> dict:
+    """
+    Session report for the current version of the session (its question count), generated once:
+    later fetches are served from memory and concurrent ones share one generation. A report with
+    fact-checks still running is not kept, so the next fetch picks up their results.
+    """
+    key = (session_id, int(session_state.get("question_count", 0) or 0))
+    report = _reports.get(key)
+    if report is None:
+
+        async def _generate() -> dict:
+            report, complete = await _build_session_report(session_id, user_id, session_state)
+            if complete:
+                _reports.set(key, report)
+            return report
+
+        report = await _report_flight.do(key, _generate)
+    return copy.deepcopy(report)
+
+
+def session_report_cache_stats() -> dict:
+    return {**_reports.stats(), "single_flight": _report_flight.stats()}
+
+
+async def _build_session_report(session_id: str, user_id: str, session_state: dict) -> tuple[dict, bool]:
     """
-    Synthesize report using Fastino's personalization capabilities.
-    Run Yutori fact-check on all session answers here (deferred from per-answer).
+    Synthesize the end-of-session report, and whether it is final (no fact-check was still running).
+    Yutori fact-checks of the session's answers are collected here (started per answer).
     """
     question_count = session_state.get("question_count", 0)
     role = (session_state.get("role") or "").strip() or "this role"
@@ -319,43 +351,37 @@ async def generate_session_report(
     # Human-readable summary for this session (not raw Neo4j context)
     overall_trend = f"Session complete. You answered {question_count} question(s) in this session. Your voice metrics suggest steady delivery."
 
-    # Fact-check at report time: get session transcripts, extract claims, verify in parallel (capped at 20s)
+    # Fact-check at report time: claims were queued in the background as answers arrived
+    # (services.factcheck_worker), so only the stragglers are awaited here (capped at 20s).
     fact_check_summary: str | None = None
     disputed_claims: list[str] = []
+    still_running = 0
+    await memory.flush_writes()
     transcripts = await memory.get_session_transcripts(session_id)
-    claims_to_check = []
-    for t in transcripts:
-        c = (claims.extract_claim_simple(t) or "").strip()
-        if c and len(c) >= 10:
-            claims_to_check.append(c)
-    # Dedupe by claim text to avoid redundant API calls
-    claims_to_check = list(dict.fromkeys(claims_to_check))
+    # Dedupe by claim text; factcheck_cache also skips claims already checked in earlier reports
+    claims_to_check = list(dict.fromkeys(c for c in map(factcheck_worker.claim_of, transcripts) if c))
     if claims_to_check:
-        try:
-            results = await asyncio.wait_for(
-                asyncio.gather(
-                    *[yutori.verify_claim(c) for c in claims_to_check],
-                    return_exceptions=True,
-                ),
-                timeout=20.0,
-            )
-            verified = 0
-            for i, r in enumerate(results):
-                if isinstance(r, Exception):
-                    disputed_claims.append((claims_to_check[i] or "")[:80] + ("…" if len(claims_to_check[i] or "") > 80 else ""))
-                    continue
-                if getattr(r, "correct", True):
-                    verified += 1
-                else:
-                    line = (getattr(r, "summary", None) or getattr(r, "actual_value", None) or (claims_to_check[i] or "")[:80])
-                    if line and "[Stub]" not in str(line):
-                        disputed_claims.append(line[:200])
-            total = len(claims_to_check)
-            fact_check_summary = f"{verified} of {total} claims verified."
-            if disputed_claims:
-                fact_check_summary += " Some claims need verification or a source."
-        except asyncio.TimeoutError:
-            fact_check_summary = "Fact-check timed out (Yutori Research took too long); partial results only."
+        results = await factcheck_worker.collect(session_id, claims_to_check, timeout=REPORT_FACT_CHECK_WAIT_SECONDS)
+        verified = 0
+        for i, r in enumerate(results):
+            if r is None:
+                still_running += 1
+                continue
+            if isinstance(r, BaseException):
+                disputed_claims.append((claims_to_check[i] or "")[:80] + ("…" if len(claims_to_check[i] or "") > 80 else ""))
+                continue
+            if getattr(r, "correct", True):
+                verified += 1
+            else:
+                line = (getattr(r, "summary", None) or getattr(r, "actual_value", None) or (claims_to_check[i] or "")[:80])
+                if line and "[Stub]" not in str(line):
+                    disputed_claims.append(line[:200])
+        total = len(claims_to_check)
+        fact_check_summary = f"{verified} of {total} claims verified."
+        if disputed_claims:
+            fact_check_summary += " Some claims need verification or a source."
+        if still_running:
+            fact_check_summary += f" {still_running} still being checked (Yutori Research took too long); partial results only."
     else:
         fact_check_summary = "No verifiable claims in this session." if transcripts else None
 
@@ -366,7 +392,7 @@ async def generate_session_report(
         "Practice pacing with Modulate signals.",
     ]
 
-    return {
+    report = {
         "session_id": session_id,
         "overall_trend": overall_trend,
         "strengths": strengths,
@@ -375,6 +401,7 @@ async def generate_session_report(
         "fact_check_summary": fact_check_summary,
         "disputed_claims": disputed_claims,
     }
+    return report, still_running == 0
 
 
 async def extract_profile_topics(fastino_context: str) -> dict:
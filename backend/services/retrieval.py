@@ -0,0 +1,402 @@
+"""Per-user relevance index over answer transcripts (RAG for services.memory).
+
+Each committed answer (memory.write_batch) is embedded with a local hashed bag of words: word
+unigrams and bigrams are hashed into RETRIEVAL_DIM signed buckets, weighted 1 + log(tf) and
+L2-normalized. No model or network call is involved, and the hash is stable across processes.
+Vectors are sparse: each is a pair of NumPy arrays (sorted bucket ids, weights), so the bucket
+space can be large enough that collisions are rare. A user's answers are concatenated CSR-style
+and a top-k cosine search is one vectorized sparse dot product over them.
+
+On the Neo4j backend the search runs server-side instead: embed_dense() folds the same features
+into VECTOR_DIM dimensions, which are stored on each Answer and scored per user with
+vector.similarity.cosine (see services.memory). This in-process index serves the SQLite backend.
+
+Memory is bounded twice: each user keeps at most RETRIEVAL_MAX_DOCS answers (oldest dropped
+first), and indexes are evicted least-recently-used once all loaded indexes together pass
+RETRIEVAL_MAX_BYTES. Changed indexes are saved to RETRIEVAL_INDEX_DIR (one .npz per user,
+written atomically) at most every RETRIEVAL_FLUSH_SECONDS, on eviction and on shutdown, and
+loaded again on the next search, so the index survives restarts.
+
+Env:
+  RETRIEVAL_DIM             default 2**20 hash buckets (changing it discards saved indexes)
+  RETRIEVAL_MAX_DOCS        default 512 answers per user
+  RETRIEVAL_MAX_BYTES       default 64 MiB across loaded indexes
+  RETRIEVAL_INDEX_DIR       default backend/data/retrieval ("off" keeps indexes in memory only)
+  RETRIEVAL_FLUSH_SECONDS   default 5
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+from collections import Counter, OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from services.cache import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIR = Path(__file__).resolve().parent.parent / "data" / "retrieval"
+# Bump when tokenization or hashing changes; saved indexes with another version are discarded.
+EMBEDDING_VERSION = 1
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:[+#.][a-z0-9+#]+)*")
+# Function words plus interview-prompt filler ("tell me about a time..."), which would otherwise
+# make every answer look related to every question.
+_STOPWORDS = frozenset(
+    "a about an and are as at be but by can could describe do did example for from give had has "
+    "have how i if in into is it its me my of on or our share so tell that the their them then "
+    "there they this through time to walk was we were what when where which who why will with "
+    "would you your um uh like just really very".split()
+)
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name) or default)
+    except ValueError:
+        return default
+
+
+DIM = max(1024, _int_env("RETRIEVAL_DIM", 1 << 20))
+MAX_DOCS = max(8, _int_env("RETRIEVAL_MAX_DOCS", 512))
+MAX_BYTES = max(1024 * 1024, _int_env("RETRIEVAL_MAX_BYTES", 64 * 1024 * 1024))
+FLUSH_SECONDS = max(0, _int_env("RETRIEVAL_FLUSH_SECONDS", 5))
+
+# Size of embed_dense() vectors. Fixed: Answer nodes in Neo4j store embeddings of this size, so
+# changing it means re-embedding every stored answer.
+VECTOR_DIM = 1024
+
+Vector = tuple[np.ndarray, np.ndarray]  # (sorted int32 bucket ids, float32 weights), unit length
+
+
+def index_dir() -> Path | None:
+    raw = (os.getenv("RETRIEVAL_INDEX_DIR") or "").strip()
+    if raw.lower() in ("off", "none", "false", "0"):
+        return None
+    return Path(raw) if raw else DEFAULT_DIR
+
+
+def _features(text: str) -> Counter:
+    words = [w for w in _TOKEN.findall((text or "").lower()) if w not in _STOPWORDS and len(w) > 1]
+    feats = Counter(words)
+    feats.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    return feats
+
+
+def _bucket(feature: str, dim: int = DIM) -> tuple[int, float]:
+    h = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+    return h % dim, (1.0 if (h >> 63) & 1 else -1.0)
+
+
+def embed(text: str) -> Vector | None:
+    """Sparse hashed, L2-normalized vector for `text`; None when it has no indexable words."""
+    feats = _features(text)
+    if not feats:
+        return None
+    buckets = np.empty(len(feats), dtype=np.int32)
+    weights = np.empty(len(feats), dtype=np.float32)
+    for n, (feature, tf) in enumerate(feats.items()):
+        buckets[n], sign = _bucket(feature)
+        weights[n] = sign * (1.0 + math.log(tf))
+    # Features that share a bucket add up (and with opposite signs partly cancel).
+    idx, inverse = np.unique(buckets, return_inverse=True)
+    val = np.zeros(len(idx), dtype=np.float32)
+    np.add.at(val, inverse, weights)
+    keep = val != 0.0
+    idx, val = idx[keep], val[keep]
+    norm = float(np.linalg.norm(val))
+    if norm == 0.0:
+        return None
+    return idx.astype(np.int32, copy=False), val / np.float32(norm)
+
+
+def embed_dense(text: str, dim: int = VECTOR_DIM) -> np.ndarray | None:
+    """
+    Same features folded into `dim` dense float32 dimensions, L2-normalized: the fixed-size
+    embedding stored on Neo4j Answer nodes for the server-side vector index.
+    """
+    feats = _features(text)
+    if not feats:
+        return None
+    vec = np.zeros(dim, dtype=np.float32)
+    for feature, tf in feats.items():
+        i, sign = _bucket(feature, dim)
+        vec[i] += sign * (1.0 + math.log(tf))
+    norm = float(np.linalg.norm(vec))
+    if norm == 0.0:
+        return None
+    vec /= norm
+    return vec
+
+
+class UserIndex:
+    """One user's answers: docs[i] embeds texts[i] (stored under ids[i]), oldest first."""
+
+    def __init__(self, user_id: str) -> None:
+        self.user_id = user_id
+        self.docs: list[Vector] = []
+        self.ids: list[str] = []
+        self.texts: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._csr: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None
+        self.dirty = False
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(i.nbytes + v.nbytes for i, v in self.docs) * 2 + sum(len(t) for t in self.texts)
+
+    def upsert(self, doc_id: str, text: str, vec: Vector) -> None:
+        row = self._rows.get(doc_id)
+        if row is not None:
+            # Journal replay / re-ingest: replace in place.
+            self.docs[row], self.texts[row] = vec, text
+        else:
+            if len(self.ids) >= MAX_DOCS:
+                drop = max(1, MAX_DOCS // 8)
+                del self.docs[:drop], self.ids[:drop], self.texts[:drop]
+                self._rows = {d: i for i, d in enumerate(self.ids)}
+            self._rows[doc_id] = len(self.ids)
+            self.docs.append(vec)
+            self.ids.append(doc_id)
+            self.texts.append(text)
+        self._csr = None
+        self.dirty = True
+
+    def _matrix(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """All docs concatenated: bucket ids, weights and the doc row of each entry."""
+        if self._csr is None:
+            sizes = [len(i) for i, _ in self.docs]
+            self._csr = (
+                np.concatenate([i for i, _ in self.docs]),
+                np.concatenate([v for _, v in self.docs]),
+                np.repeat(np.arange(len(self.docs), dtype=np.int32), sizes),
+            )
+        return self._csr
+
+    def scores(self, query: Vector) -> np.ndarray:
+        """Cosine similarity of `query` with every doc."""
+        q_idx, q_val = query
+        idx, val, row = self._matrix()
+        pos = np.minimum(np.searchsorted(q_idx, idx), len(q_idx) - 1)
+        hit = q_idx[pos] == idx
+        return np.bincount(row[hit], weights=val[hit] * q_val[pos[hit]], minlength=len(self.docs))
+
+    def search(self, query: Vector, k: int, exclude: set[str]) -> list[tuple[float, str]]:
+        n = len(self.ids)
+        if n == 0 or k <= 0:
+            return []
+        scores = self.scores(query)
+        # Take a few extra so excluded texts don't shrink the result.
+        take = min(n, k + len(exclude))
+        top = np.argpartition(-scores, take - 1)[:take] if take < n else np.arange(n)
+        # Ties go to the newer answer.
+        ranked = sorted(top.tolist(), key=lambda i: (-float(scores[i]), -i))
+        out: list[tuple[float, str]] = []
+        for i in ranked:
+            if float(scores[i]) <= 0.0 or self.texts[i] in exclude:
+                continue
+            out.append((float(scores[i]), self.texts[i]))
+            if len(out) == k:
+                break
+        return out
+
+    def arrays(self) -> dict[str, np.ndarray]:
+        """Persisted form: concatenated buckets / weights plus per-doc offsets."""
+        sizes = np.array([len(i) for i, _ in self.docs], dtype=np.int64)
+        offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+        if not self.docs:
+            return {"buckets": np.zeros(0, np.int32), "weights": np.zeros(0, np.float32), "offsets": offsets}
+        return {
+            "buckets": np.concatenate([i for i, _ in self.docs]),
+            "weights": np.concatenate([v for _, v in self.docs]),
+            "offsets": offsets,
+        }
+
+    @classmethod
+    def from_arrays(cls, user_id: str, arrays: dict, ids: list[str], texts: list[str]) -> "UserIndex":
+        index = cls(user_id)
+        offsets = arrays["offsets"]
+        index.docs = [
+            (arrays["buckets"][a:b].astype(np.int32), arrays["weights"][a:b].astype(np.float32))
+            for a, b in zip(offsets[:-1], offsets[1:])
+        ]
+        index.ids, index.texts = list(ids), list(texts)
+        index._rows = {doc_id: i for i, doc_id in enumerate(index.ids)}
+        return index
+
+
+_indexes: OrderedDict[str, UserIndex] = OrderedDict()
+_loads = SingleFlight()
+_flush_task: asyncio.Task | None = None
+_stats = {"searches": 0, "hits": 0, "added": 0, "loaded": 0, "saved": 0, "evicted": 0}
+
+
+def _path(user_id: str) -> Path | None:
+    d = index_dir()
+    if d is None:
+        return None
+    return d / (hashlib.sha256(user_id.encode()).hexdigest()[:32] + ".npz")
+
+
+def _save(user_id: str, arrays: dict[str, np.ndarray], ids: list[str], texts: list[str]) -> None:
+    path = _path(user_id)
+    if path is None:
+        return
+    meta = {"user_id": user_id, "dim": DIM, "version": EMBEDDING_VERSION, "ids": ids, "texts": texts}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "wb") as fh:
+        np.savez(fh, meta=np.frombuffer(json.dumps(meta).encode(), dtype=np.uint8), **arrays)
+    os.replace(tmp, path)
+
+
+def _load(user_id: str) -> UserIndex | None:
+    path = _path(user_id)
+    if path is None or not path.exists():
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(data["meta"].tobytes().decode())
+            arrays = {name: data[name] for name in ("buckets", "weights", "offsets")}
+    except (OSError, ValueError, KeyError):
+        logger.warning("Retrieval index for %s is unreadable; starting a new one.", user_id)
+        return None
+    if meta.get("dim") != DIM or meta.get("version") != EMBEDDING_VERSION or meta.get("user_id") != user_id:
+        return None
+    return UserIndex.from_arrays(user_id, arrays, meta["ids"], meta["texts"])
+
+
+async def _write(index: UserIndex) -> None:
+    if not index.dirty or index_dir() is None:
+        index.dirty = False
+        return
+    arrays, ids, texts = index.arrays(), list(index.ids), list(index.texts)
+    index.dirty = False
+    try:
+        await asyncio.to_thread(_save, index.user_id, arrays, ids, texts)
+        _stats["saved"] += 1
+    except OSError:
+        index.dirty = True
+        logger.exception("Saving retrieval index for %s failed.", index.user_id)
+
+
+async def _get(user_id: str, create: bool) -> UserIndex | None:
+    index = _indexes.get(user_id)
+    if index is not None:
+        _indexes.move_to_end(user_id)
+        return index
+
+    async def _open() -> UserIndex | None:
+        loaded = await asyncio.to_thread(_load, user_id)
+        if loaded is not None:
+            _stats["loaded"] += 1
+        return loaded
+
+    index = await _loads.do(user_id, _open)
+    if user_id in _indexes:
+        # Another caller created or loaded it while this one waited.
+        index = _indexes[user_id]
+    elif index is None:
+        if not create:
+            return None
+        index = UserIndex(user_id)
+    _indexes[user_id] = index
+    _indexes.move_to_end(user_id)
+    await _evict()
+    return index
+
+
+async def _evict() -> None:
+    total = sum(ix.nbytes for ix in _indexes.values())
+    while total > MAX_BYTES and len(_indexes) > 1:
+        _, index = _indexes.popitem(last=False)
+        total -= index.nbytes
+        _stats["evicted"] += 1
+        await _write(index)
+
+
+def _schedule_flush() -> None:
+    global _flush_task
+    if _flush_task is not None and not _flush_task.done():
+        return
+
+    async def _later() -> None:
+        await asyncio.sleep(FLUSH_SECONDS)
+        await flush()
+
+    try:
+        _flush_task = asyncio.get_running_loop().create_task(_later())
+    except RuntimeError:
+        _flush_task = None
+
+
+async def add_answers(rows: list[dict]) -> int:
+    """Index committed answer rows (memory.write_batch shape). Returns how many were embedded."""
+    added = 0
+    for row in rows:
+        user_id, text = row.get("user_id"), (row.get("transcript") or "").strip()
+        if not user_id or not text:
+            continue
+        vec = embed(text)
+        if vec is None:
+            continue
+        index = await _get(user_id, create=True)
+        index.upsert(str(row.get("answer_id") or text), text, vec)
+        added += 1
+    if added:
+        _stats["added"] += added
+        await _evict()
+        _schedule_flush()
+    return added
+
+
+async def search(user_id: str, query: str, k: int = 5, exclude: set[str] | None = None) -> list[tuple[float, str]]:
+    """Top-k (cosine, transcript) for `query` among this user's answers, best first."""
+    _stats["searches"] += 1
+    vec = embed(query)
+    if vec is None or k <= 0:
+        return []
+    index = await _get(user_id, create=False)
+    if index is None:
+        return []
+    results = index.search(vec, k, exclude or set())
+    if results:
+        _stats["hits"] += 1
+    return results
+
+
+async def flush() -> None:
+    """Save every changed index now."""
+    for index in list(_indexes.values()):
+        await _write(index)
+
+
+async def close() -> None:
+    global _flush_task
+    if _flush_task is not None and not _flush_task.done():
+        _flush_task.cancel()
+    _flush_task = None
+    await flush()
+
+
+def stats() -> dict:
+    return {
+        **_stats,
+        "users_loaded": len(_indexes),
+        "docs_loaded": sum(len(ix) for ix in _indexes.values()),
+        "bytes": sum(ix.nbytes for ix in _indexes.values()),
+        "max_bytes": MAX_BYTES,
+        "dim": DIM,
+        "persist_dir": str(index_dir()) if index_dir() else None,
+    }
@@ -0,0 +1,343 @@
+"""Shared poller for asynchronous Yutori tasks (Research fact-checks, Browsing briefs).
+
+A Yutori task is created with a POST and then polled with GET until it reaches a terminal status.
+Callers used to run their own sleep-and-GET loop on a private httpx client, so a report with 10
+claims meant 10 loops and 10 connections. Now callers create the task, register its status URL
+with wait() and await the returned future. One background worker owns every pending task and
+sends all status checks that are due at once, concurrently, over one pooled httpx client.
+
+Scheduling is per task and adapts to how long tasks of that kind actually take:
+- The first check is at FIRST_POLL_FRACTION of the expected completion time. That starts from
+  the caller's estimate and then follows a moving average of observed completion times.
+- Later gaps grow by BACKOFF_FACTOR, capped at MAX_INTERVAL_FRACTION of the expected time,
+  with ±JITTER so tasks started together don't poll in lockstep.
+- A Retry-After header on a 429/503 (seconds or HTTP date) pushes that task's next check out at
+  least that far.
+- The task's timeout still ends it on time: the last check lands on the deadline, and the
+  future then resolves to None.
+Metrics (stats()) are per kind and include polls per completed task.
+
+Env:
+  YUTORI_POLL_CONCURRENCY   default 16 status requests in flight at once
+  YUTORI_POOL_LIMIT         default 32 pooled connections
+"""
+
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import logging
+import os
+import random
+import time
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("succeeded", "failed", "cancelled")
+FIRST_POLL_FRACTION = 0.4
+BACKOFF_FACTOR = 1.6
+MAX_INTERVAL_FRACTION = 0.5
+MIN_INTERVAL_SECONDS = 1.0
+JITTER = 0.2
+# Weight of the newest observation in the per-kind completion-time average.
+EXPECTED_EWMA_ALPHA = 0.3
+REQUEST_TIMEOUT_SECONDS = 15.0
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name) or default)
+    except ValueError:
+        return default
+
+
+def retry_after_seconds(value: str | None) -> float | None:
+    """Retry-After as seconds from now: delta-seconds or an HTTP date. None if absent/invalid."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+@dataclass
+class _Pending:
+    kind: str
+    url: str
+    headers: dict
+    future: asyncio.Future
+    started_at: float
+    deadline: float
+    expected: float
+    next_at: float
+    interval: float
+    polls: int = 0
+    polling: bool = False
+
+
+class TaskPoller:
+    def __init__(self, concurrency: int = 16, pool_limit: int = 32, fetch=None) -> None:
+        self.concurrency = max(1, concurrency)
+        self.pool_limit = max(1, pool_limit)
+        self._fetch = fetch  # async (url, headers) -> (status_code, headers, json | None); default: pooled httpx GET
+        self._pending: dict[str, _Pending] = {}
+        self._expected: dict[str, float] = {}
+        self._stats: dict[str, dict] = {}
+        self._loop = None
+        self._worker: asyncio.Task | None = None
+        self._wake: asyncio.Event | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._inflight: set[asyncio.Task] = set()
+        self._client = None
+
+    # --- shared client ---
+
+    def client(self):
+        """Pooled httpx.AsyncClient for every Yutori call (create and status), bound to this loop."""
+        self._ensure_started()
+        if self._client is None or self._client.is_closed:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                timeout=REQUEST_TIMEOUT_SECONDS,
+                limits=httpx.Limits(max_connections=self.pool_limit, max_keepalive_connections=self.pool_limit),
+            )
+        return self._client
+
+    async def _http_get(self, url: str, headers: dict) -> tuple[int, dict, dict | None]:
+        resp = await self.client().get(url, headers=headers)
+        body = resp.json() if resp.is_success else None
+        return resp.status_code, dict(resp.headers), body
+
+    # --- lifecycle ---
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._worker is not None and self._loop is loop and not self._worker.done():
+            return
+        if self._loop is not loop:
+            # A client or futures from another (finished) loop can't be used here.
+            self._client = None
+            self._pending.clear()
+            self._inflight.clear()
+        self._loop = loop
+        self._wake = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._worker = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Stop the worker, give up on pending tasks and close the client (FastAPI lifespan)."""
+        tasks = [t for t in (self._worker, *self._inflight) if t is not None]
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        for p in self._pending.values():
+            if not p.future.done():
+                p.future.set_result(None)
+        self._pending.clear()
+        self._worker = None
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    # --- public API ---
+
+    def expected_seconds(self, kind: str, default: float) -> float:
+        return self._expected.get(kind, default)
+
+    async def wait(
+        self,
+        kind: str,
+        task_id: str,
+        url: str,
+        headers: dict,
+        *,
+        expected_seconds: float,
+        timeout_seconds: float,
+    ) -> dict | None:
+        """
+        Poll `url` until the task reaches a terminal status; returns that status payload, or None
+        on timeout. Waiting twice on the same task shares one set of polls.
+        """
+        self._ensure_started()
+        key = f"{kind}:{task_id}"
+        pending = self._pending.get(key)
+        if pending is None:
+            now = time.monotonic()
+            expected = max(MIN_INTERVAL_SECONDS, self.expected_seconds(kind, expected_seconds))
+            first = min(timeout_seconds, max(MIN_INTERVAL_SECONDS, expected * FIRST_POLL_FRACTION))
+            pending = _Pending(
+                kind=kind,
+                url=url,
+                headers=headers,
+                future=self._loop.create_future(),
+                started_at=now,
+                deadline=now + timeout_seconds,
+                expected=expected,
+                next_at=min(now + self._jittered(first), now + timeout_seconds),
+                interval=max(MIN_INTERVAL_SECONDS, expected * (1 - FIRST_POLL_FRACTION) / 4),
+            )
+            self._pending[key] = pending
+            self._kind_stats(kind)["registered"] += 1
+            self._wake.set()
+        else:
+            self._kind_stats(kind)["joined"] += 1
+        # shield: one waiter giving up must not cancel the shared future.
+        return await asyncio.shield(pending.future)
+
+    def stats(self) -> dict:
+        kinds = {}
+        for kind, s in self._stats.items():
+            finished = s["succeeded"] + s["failed"]
+            kinds[kind] = {
+                **s,
+                "polls_per_completed": round(s["polls"] / finished, 2) if finished else None,
+                "mean_completion_seconds": round(s["completion_seconds"] / finished, 2) if finished else None,
+                "expected_seconds": round(self._expected[kind], 2) if kind in self._expected else None,
+            }
+            del kinds[kind]["completion_seconds"]
+        return {
+            "pending": len(self._pending),
+            "polls_in_flight": len(self._inflight),
+            "concurrency": self.concurrency,
+            "kinds": kinds,
+        }
+
+    # --- worker ---
+
+    def _kind_stats(self, kind: str) -> dict:
+        return self._stats.setdefault(
+            kind,
+            {
+                "registered": 0,
+                "joined": 0,
+                "succeeded": 0,
+                "failed": 0,
+                "timed_out": 0,
+                "polls": 0,
+                "http_errors": 0,
+                "retry_after": 0,
+                "completion_seconds": 0.0,
+            },
+        )
+
+    @staticmethod
+    def _jittered(seconds: float) -> float:
+        return max(0.0, seconds * random.uniform(1 - JITTER, 1 + JITTER))
+
+    async def _run(self) -> None:
+        while True:
+            now = time.monotonic()
+            due = [(k, p) for k, p in self._pending.items() if not p.polling and p.next_at <= now]
+            for key, p in due:
+                p.polling = True
+                task = asyncio.create_task(self._poll(key, p))
+                self._inflight.add(task)
+                task.add_done_callback(self._inflight.discard)
+            waiting = [p.next_at for p in self._pending.values() if not p.polling]
+            self._wake.clear()
+            try:
+                timeout = max(0.0, min(waiting) - time.monotonic()) if waiting else None
+                await asyncio.wait_for(self._wake.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _finish(self, key: str, p: _Pending, result: dict | None) -> None:
+        self._pending.pop(key, None)
+        stats = self._kind_stats(p.kind)
+        if result is None:
+            stats["timed_out"] += 1
+        else:
+            elapsed = time.monotonic() - p.started_at
+            stats["succeeded" if result.get("status") == "succeeded" else "failed"] += 1
+            stats["completion_seconds"] += elapsed
+            if result.get("status") == "succeeded":
+                prev = self._expected.get(p.kind)
+                self._expected[p.kind] = elapsed if prev is None else prev + EXPECTED_EWMA_ALPHA * (elapsed - prev)
+        if not p.future.done():
+            p.future.set_result(result)
+
+    async def _poll(self, key: str, p: _Pending) -> None:
+        retry_after: float | None = None
+        try:
+            async with self._slots:
+                p.polls += 1
+                self._kind_stats(p.kind)["polls"] += 1
+                fetch = self._fetch or self._http_get
+                status_code, headers, body = await fetch(p.url, p.headers)
+            if body is not None and str(body.get("status")) in TERMINAL_STATUSES:
+                self._finish(key, p, body)
+                return
+            if body is None:
+                self._kind_stats(p.kind)["http_errors"] += 1
+                if status_code in (429, 503):
+                    retry_after = retry_after_seconds(
+                        next((v for k, v in headers.items() if k.lower() == "retry-after"), None)
+                    )
+                    if retry_after is not None:
+                        self._kind_stats(p.kind)["retry_after"] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._kind_stats(p.kind)["http_errors"] += 1
+            logger.warning("Yutori %s status check failed (%s).", p.kind, p.url, exc_info=True)
+        finally:
+            p.polling = False
+
+        now = time.monotonic()
+        if p.future.done() or now >= p.deadline:
+            self._finish(key, p, None)
+            return
+        delay = self._jittered(p.interval)
+        p.interval = min(p.interval * BACKOFF_FACTOR, max(MIN_INTERVAL_SECONDS, p.expected * MAX_INTERVAL_FRACTION))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        # Never sleep past the deadline: the last check lands on it.
+        p.next_at = min(now + delay, p.deadline)
+        self._wake.set()
+
+
+_poller = TaskPoller(
+    concurrency=_int_env("YUTORI_POLL_CONCURRENCY", 16),
+    pool_limit=_int_env("YUTORI_POOL_LIMIT", 32),
+)
+
+
+def client():
+    return _poller.client()
+
+
+async def wait(
+    kind: str,
+    task_id: str,
+    url: str,
+    headers: dict,
+    *,
+    expected_seconds: float,
+    timeout_seconds: float,
+) -> dict | None:
+    return await _poller.wait(
+        kind, task_id, url, headers, expected_seconds=expected_seconds, timeout_seconds=timeout_seconds
+    )
+
+
+async def close() -> None:
+    await _poller.close()
+
+
+def stats() -> dict:
+    return _poller.stats()
@@ -0,0 +1,181 @@
+"""Pluggable transcription backends and per-answer routing between them.
+
+Backends wrap the Velma-2 endpoints in services.modulate:
+- streaming: WebSocket, utterances + emotion, good default for short answers
+- batch:     multipart upload, utterances + emotion, better for long uploads (up to 100 MB)
+- vfast:     English + .opus files only, transcript without emotion; fastest for transcript-only
+             jobs. Picked for .opus uploads when a caller passes session_ctx["emotion"] = False;
+             forcing backend="vfast" implies emotion=False. The answer routes always want
+             emotion and upload WebM, so they never use it.
+
+`choose_backends` orders the backends that can serve a request; `transcribe` tries them in
+that order and falls back to the next one on failure. Endpoints follow MODULATE_BASE_URL,
+so every backend can be exercised against a local stand-in server.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from dataclasses import dataclass
+
+from models.session import ModulateResult
+from services import modulate
+
+logger = logging.getLogger(__name__)
+
+# Uploads at or above this size go to batch first (≈4 minutes of 32 kbps Opus/WebM).
+DEFAULT_BATCH_MIN_BYTES = 1024 * 1024
+# Batch and vfast accept up to 100 MB per file.
+MAX_UPLOAD_BYTES = 100 * 1024 * 1024
+
+
+def _batch_min_bytes() -> int:
+    try:
+        return int(os.getenv("MODULATE_BATCH_MIN_BYTES") or DEFAULT_BATCH_MIN_BYTES)
+    except ValueError:
+        return DEFAULT_BATCH_MIN_BYTES
+
+
+@dataclass
+class TranscriptionRequest:
+    """What the router knows about one answer when picking a backend."""
+
+    size_bytes: int
+    filename: str = "answer.webm"
+    content_type: str = ""
+    language: str = "en"
+    need_emotion: bool = True
+    forced_backend: str | None = None
+
+    @classmethod
+    def from_ctx(cls, source: modulate.AudioSource, session_ctx: dict | None) -> "TranscriptionRequest":
+        ctx = session_ctx or {}
+        forced = str(ctx["backend"]).strip().lower() if ctx.get("backend") else None
+        return cls(
+            size_bytes=source.size,
+            filename=str(ctx.get("filename") or source.filename or "answer.webm"),
+            content_type=str(ctx.get("content_type") or source.content_type or ""),
+            language=modulate._language(ctx),
+            # vfast returns no emotion; forcing it says the caller doesn't need any.
+            need_emotion=modulate._emotion_enabled(ctx) and forced != "vfast",
+            forced_backend=forced,
+        )
+
+    @property
+    def is_opus(self) -> bool:
+        # vfast takes .opus files only. The browser's audio/webm;codecs=opus is Opus in a WebM
+        # container and the upload keeps its filename, so the content type alone doesn't qualify.
+        return self.filename.lower().endswith(".opus")
+
+
+class TranscriptionBackend:
+    """Base class: `supports` filters by capability, `transcribe` raises on failure."""
+
+    name = "base"
+
+    def supports(self, req: TranscriptionRequest) -> bool:
+        return req.size_bytes > 0
+
+    async def transcribe(self, audio: modulate.AudioSource, session_ctx: dict | None) -> ModulateResult:
+        raise NotImplementedError
+
+
+class StreamingBackend(TranscriptionBackend):
+    name = "streaming"
+
+    async def transcribe(self, audio: modulate.AudioSource, session_ctx: dict | None) -> ModulateResult:
+        return await modulate.transcribe_streaming(audio, session_ctx)
+
+
+class BatchBackend(TranscriptionBackend):
+    name = "batch"
+
+    def supports(self, req: TranscriptionRequest) -> bool:
+        return 0 < req.size_bytes <= MAX_UPLOAD_BYTES
+
+    async def transcribe(self, audio: modulate.AudioSource, session_ctx: dict | None) -> ModulateResult:
+        return await modulate.transcribe_batch(audio, session_ctx)
+
+
+class VFastBackend(TranscriptionBackend):
+    name = "vfast"
+
+    def supports(self, req: TranscriptionRequest) -> bool:
+        return (
+            0 < req.size_bytes <= MAX_UPLOAD_BYTES
+            and req.language.startswith("en")
+            and req.is_opus
+            and not req.need_emotion
+        )
+
+    async def transcribe(self, audio: modulate.AudioSource, session_ctx: dict | None) -> ModulateResult:
+        return await modulate.transcribe_vfast(audio, session_ctx)
+
+
+BACKENDS: dict[str, TranscriptionBackend] = {
+    b.name: b for b in (StreamingBackend(), BatchBackend(), VFastBackend())
+}
+
+
+def choose_backends(req: TranscriptionRequest) -> list[TranscriptionBackend]:
+    """
+    Order backends for one answer:
+    - forced backend (session_ctx["backend"]) first, others as fallbacks; a forced backend that
+      can't serve the request (e.g. vfast for a non-.opus file) is skipped with a warning
+    - transcript-only English Opus (e.g. re-analysis jobs) -> vfast
+    - long uploads -> batch (one request, no per-chunk round trips)
+    - otherwise streaming, then batch
+    """
+    if req.forced_backend in BACKENDS:
+        order = [req.forced_backend, "streaming", "batch", "vfast"]
+    elif not req.need_emotion:
+        order = ["vfast", "batch", "streaming"]
+    elif req.size_bytes >= _batch_min_bytes():
+        order = ["batch", "streaming"]
+    else:
+        order = ["streaming", "batch"]
+    out: list[TranscriptionBackend] = []
+    for name in order:
+        backend = BACKENDS[name]
+        if backend not in out and backend.supports(req):
+            out.append(backend)
+    if req.forced_backend and (not out or out[0].name != req.forced_backend):
+        logger.warning(
+            "Forced transcription backend %r can't serve %s (%d bytes, language=%s); using %s.",
+            req.forced_backend, req.filename, req.size_bytes, req.language,
+            [b.name for b in out] or "none",
+        )
+    return out
+
+
+async def transcribe(audio, session_ctx: dict | None = None) -> ModulateResult:
+    """
+    Transcribe with the best backend for this request, falling back on failure. Raises if all
+    fail. `audio` is bytes or a modulate.AudioSource; AudioTooLarge is never retried.
+    """
+    source = modulate.AudioSource.coerce(audio)
+    req = TranscriptionRequest.from_ctx(source, session_ctx)
+    candidates = choose_backends(req)
+    if not candidates:
+        raise RuntimeError(f"No transcription backend supports this request: {req}")
+    last_exc: Exception | None = None
+    for backend in candidates:
+        try:
+            result = await backend.transcribe(source, session_ctx)
+            if isinstance(result.emotion, dict):
+                result.emotion["backend"] = backend.name
+            return result
+        except modulate.AudioTooLarge:
+            raise
+        except Exception as exc:
+            last_exc = exc
+            # Exception text can embed the WebSocket URL (with api_key), so log the type only.
+            logger.warning(
+                "Transcription backend %s failed (%s); trying next.",
+                backend.name,
+                type(exc).__name__,
+            )
+            print(f"[Modulate] backend={backend.name} failed: {type(exc).__name__}; falling back")
+    assert last_exc is not None
+    raise last_exc
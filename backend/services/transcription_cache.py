@@ -0,0 +1,175 @@
+"""Content-addressed cache of transcription results.
+
+Frontend retries and repeated demo recordings upload identical audio; each would otherwise
+cost a full Velma-2 transcription. Results are keyed by SHA-256 of the audio plus the options
+that change the output (language, emotion and accent flags), kept in an in-memory LRU + TTL
+tier and optionally on disk (MODULATE_CACHE_DIR, one JSON file per key). Identical requests
+from the same session that arrive while one is in flight share that single upstream call.
+
+Env:
+  MODULATE_CACHE_TTL_SECONDS   default 3600 (0 disables the cache)
+  MODULATE_CACHE_MAX_ENTRIES   default 256
+  MODULATE_CACHE_DIR           optional directory for the on-disk tier
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from models.session import ModulateResult
+from services.cache import SingleFlight, TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name) or default)
+    except ValueError:
+        return default
+
+
+def _ttl_seconds() -> int:
+    return _int_env("MODULATE_CACHE_TTL_SECONDS", 3600)
+
+
+_memory = TTLCache(
+    max_entries=_int_env("MODULATE_CACHE_MAX_ENTRIES", 256),
+    ttl_seconds=_ttl_seconds(),
+    name="transcription",
+)
+_inflight = SingleFlight()
+_disk_hits = 0
+_disk_writes = 0
+
+
+def _disk_dir() -> Path | None:
+    d = (os.getenv("MODULATE_CACHE_DIR") or "").strip()
+    return Path(d) if d else None
+
+
+async def cache_key(source, session_ctx: dict | None) -> str:
+    """SHA-256 over the audio bytes (read in chunks) and the output-affecting options."""
+    from services import modulate
+
+    ctx = session_ctx or {}
+    emotion = modulate._emotion_enabled(ctx)
+    accent = bool(ctx.get("accent", emotion))
+    h = hashlib.sha256()
+    async for chunk in source.iter_chunks(64 * 1024):
+        h.update(chunk)
+    h.update(f"|lang={modulate._language(ctx)}|emotion={emotion}|accent={accent}".encode())
+    return h.hexdigest()
+
+
+def _disk_read(path: Path) -> ModulateResult | None:
+    try:
+        payload = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    if float(payload.get("expires_at") or 0) < time.time():
+        try:
+            path.unlink()
+        except OSError:
+            pass
+        return None
+    from services.utterances import UtteranceStore
+
+    result = ModulateResult(**payload["result"])
+    if payload.get("utterances"):
+        result._utterances = UtteranceStore.from_utterances(payload["utterances"])
+    return result
+
+
+def _disk_write(path: Path, result: ModulateResult) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    store = result.utterances
+    tmp.write_text(json.dumps({
+        "expires_at": time.time() + _ttl_seconds(),
+        "result": result.model_dump(),
+        "utterances": store.to_dicts() if store is not None else [],
+    }))
+    os.replace(tmp, path)
+
+
+async def _lookup(key: str) -> ModulateResult | None:
+    global _disk_hits
+    hit = _memory.get(key)
+    if hit is not None:
+        return hit
+    d = _disk_dir()
+    if d is None:
+        return None
+    hit = await asyncio.to_thread(_disk_read, d / f"{key}.json")
+    if hit is not None:
+        _disk_hits += 1
+        _memory.set(key, hit)
+    return hit
+
+
+async def _store(key: str, result: ModulateResult) -> None:
+    global _disk_writes
+    _memory.set(key, result)
+    d = _disk_dir()
+    if d is not None:
+        try:
+            await asyncio.to_thread(_disk_write, d / f"{key}.json", result)
+            _disk_writes += 1
+        except OSError:
+            logger.exception("Transcription cache disk write failed (non-fatal).")
+
+
+async def get_or_transcribe(
+    source,
+    session_ctx: dict | None,
+    transcribe: Callable[[], Awaitable[ModulateResult]],
+    cacheable: Callable[[ModulateResult], bool],
+) -> ModulateResult:
+    """
+    Return a cached result for this audio + options, or run `transcribe()` once for all
+    concurrent identical requests from the same session (session_ctx["prewarm_key"]). Only results accepted by `cacheable` are stored
+    (stub/fallback results must not be). Callers get their own copy.
+    """
+    if _ttl_seconds() <= 0:
+        return await transcribe()
+    key = await cache_key(source, session_ctx)
+    hit = await _lookup(key)
+    if hit is not None:
+        logger.info("Transcription cache hit: key=%s…", key[:12])
+        return hit.model_copy(deep=True)
+
+    async def _run() -> ModulateResult:
+        result = await transcribe()
+        if cacheable(result):
+            await _store(key, result)
+        return result
+
+    # Share an in-flight call only within one session: `transcribe` carries this caller's
+    # session_ctx (partial-result publisher, prewarmed socket), which another session must not
+    # borrow. Finished results are still shared across sessions through the cache.
+    flight_key = (key, (session_ctx or {}).get("prewarm_key"))
+    result = await _inflight.do(flight_key, _run)
+    return result.model_copy(deep=True)
+
+
+def stats() -> dict:
+    """Hit/miss counters for the status endpoint."""
+    return {
+        **_memory.stats(),
+        "disk_enabled": _disk_dir() is not None,
+        "disk_hits": _disk_hits,
+        "disk_writes": _disk_writes,
+        "single_flight": _inflight.stats(),
+    }
+
+
+def clear() -> None:
+    _memory.clear()
@@ -0,0 +1,160 @@
+"""Compact per-answer utterance storage.
+
+Velma-2 returns one dict per utterance; keeping those lists inside ModulateResult meant every
+answer response re-serialized them and every session kept them alive as Python dicts. An
+UtteranceStore keeps the same data column-wise in typed arrays (offsets, durations, speaker
+IDs, interned emotion/accent/language codes, packed UUIDs) plus the texts. Answer responses
+carry only a summary; the raw rows are served page by page from
+GET /session/{session_id}/answers/{question_number}/utterances.
+"""
+
+from __future__ import annotations
+
+import os
+import uuid
+from array import array
+from collections import Counter
+
+from services.cache import TTLCache
+
+# Documented Velma-2 values, interned to small codes; unseen labels are appended on the fly.
+EMOTIONS = (
+    "Neutral", "Calm", "Happy", "Amused", "Excited", "Proud", "Affectionate", "Interested",
+    "Hopeful", "Frustrated", "Angry", "Contemptuous", "Concerned", "Afraid", "Sad", "Ashamed",
+    "Bored", "Tired", "Surprised", "Anxious", "Stressed", "Disgusted", "Disappointed",
+    "Confused", "Relieved", "Confident",
+)
+ACCENTS = (
+    "American", "British", "Australian", "Southern", "Indian", "Irish", "Scottish",
+    "Eastern_European", "African", "Asian", "Latin_American", "Middle_Eastern", "Unknown",
+)
+
+NO_CODE = 255  # missing / null value
+_MAX_CODES = 254
+
+
+class _Interner:
+    __slots__ = ("labels", "codes")
+
+    def __init__(self, seed: tuple[str, ...]) -> None:
+        self.labels: list[str] = list(seed)
+        self.codes: dict[str, int] = {label: i for i, label in enumerate(seed)}
+
+    def code(self, label) -> int:
+        if label in (None, ""):
+            return NO_CODE
+        label = str(label)
+        code = self.codes.get(label)
+        if code is None:
+            if len(self.labels) >= _MAX_CODES:
+                return NO_CODE
+            code = len(self.labels)
+            self.labels.append(label)
+            self.codes[label] = code
+        return code
+
+    def label(self, code: int) -> str | None:
+        return None if code == NO_CODE else self.labels[code]
+
+
+_emotions = _Interner(EMOTIONS)
+_accents = _Interner(ACCENTS)
+_languages = _Interner(("en",))
+
+
+def _int(v, default: int = 0) -> int:
+    try:
+        return max(0, int(v))
+    except (TypeError, ValueError):
+        return default
+
+
+class UtteranceStore:
+    """Column-oriented utterances for one answer."""
+
+    __slots__ = ("texts", "start_ms", "duration_ms", "speakers", "emotions", "accents", "languages", "uuids")
+
+    def __init__(self) -> None:
+        self.texts: list[str] = []
+        self.start_ms = array("I")
+        self.duration_ms = array("I")
+        self.speakers = array("H")
+        self.emotions = array("B")
+        self.accents = array("B")
+        self.languages = array("B")
+        self.uuids = bytearray()  # 16 bytes per utterance, zeros when absent
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def append(self, u: dict) -> None:
+        self.texts.append(str(u.get("text") or ""))
+        self.start_ms.append(_int(u.get("start_ms")))
+        self.duration_ms.append(_int(u.get("duration_ms")))
+        self.speakers.append(min(_int(u.get("speaker")), 0xFFFF))
+        self.emotions.append(_emotions.code(u.get("emotion")))
+        self.accents.append(_accents.code(u.get("accent")))
+        self.languages.append(_languages.code(u.get("language")))
+        try:
+            self.uuids += uuid.UUID(str(u.get("utterance_uuid"))).bytes
+        except (TypeError, ValueError):
+            self.uuids += bytes(16)
+
+    @classmethod
+    def from_utterances(cls, utterances: list[dict]) -> "UtteranceStore":
+        store = cls()
+        for u in utterances:
+            if isinstance(u, dict):
+                store.append(u)
+        return store
+
+    def row(self, i: int) -> dict:
+        raw_uuid = bytes(self.uuids[i * 16 : (i + 1) * 16])
+        return {
+            "utterance_uuid": str(uuid.UUID(bytes=raw_uuid)) if any(raw_uuid) else None,
+            "text": self.texts[i],
+            "start_ms": self.start_ms[i],
+            "duration_ms": self.duration_ms[i],
+            "speaker": self.speakers[i] or None,
+            "language": _languages.label(self.languages[i]),
+            "emotion": _emotions.label(self.emotions[i]),
+            "accent": _accents.label(self.accents[i]),
+        }
+
+    def page(self, offset: int = 0, limit: int = 50) -> list[dict]:
+        return [self.row(i) for i in range(max(0, offset), min(len(self), max(0, offset) + max(0, limit)))]
+
+    def to_dicts(self) -> list[dict]:
+        return self.page(0, len(self))
+
+    def emotion_labels(self) -> list[str]:
+        return [label for label in (_emotions.label(c) for c in self.emotions) if label]
+
+    def summary(self) -> dict:
+        """Small, response-friendly digest (no per-utterance rows)."""
+        return {
+            "utterance_count": len(self),
+            "speaker_count": len({s for s in self.speakers if s}),
+            "emotion_counts": dict(Counter(self.emotion_labels()).most_common()),
+        }
+
+
+# answer_id ("{session_id}:q{n}") -> UtteranceStore; bounded so long-running servers don't grow.
+_by_answer = TTLCache(
+    max_entries=int(os.getenv("UTTERANCE_STORE_MAX_ANSWERS") or 2000),
+    ttl_seconds=float(os.getenv("UTTERANCE_STORE_TTL_SECONDS") or 6 * 3600),
+    name="utterances",
+)
+
+
+def answer_key(session_id: str, question_number: int) -> str:
+    return f"{session_id}:q{int(question_number)}"
+
+
+def save(session_id: str, question_number: int, store: "UtteranceStore | None") -> None:
+    if store is not None and len(store):
+        _by_answer.set(answer_key(session_id, question_number), store)
+
+
+def get(session_id: str, question_number: int) -> "UtteranceStore | None":
+    return _by_answer.get(answer_key(session_id, question_number))
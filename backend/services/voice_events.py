@@ -0,0 +1,73 @@
+"""Per-session fan-out of voice analysis events (partial and final Modulate results).
+
+Transcription publishes into a session; GET /session/{session_id}/voice-stream subscribers
+each get their own bounded asyncio.Queue. Slow subscribers lose their oldest events rather
+than slowing down transcription. The latest event per session is kept briefly so a client
+that connects mid-answer starts from the current state.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+
+from services.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+QUEUE_MAX_EVENTS = 32
+# Seconds between SSE keep-alive comments when nothing is published.
+KEEPALIVE_SECONDS = 15.0
+
+_subscribers: dict[str, set[asyncio.Queue]] = {}
+_latest = TTLCache(max_entries=1000, ttl_seconds=600, name="voice_events")
+_published = 0
+_dropped = 0
+
+
+def publish(session_id: str, event: dict) -> None:
+    """Deliver `event` to every subscriber of the session without blocking."""
+    global _published, _dropped
+    _published += 1
+    _latest.set(session_id, event)
+    for queue in _subscribers.get(session_id, ()):
+        if queue.full():
+            try:
+                queue.get_nowait()
+                _dropped += 1
+            except asyncio.QueueEmpty:
+                pass
+        queue.put_nowait(event)
+
+
+def subscribe(session_id: str) -> asyncio.Queue:
+    queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_MAX_EVENTS)
+    latest = _latest.get(session_id, count=False)
+    if latest is not None:
+        queue.put_nowait(latest)
+    _subscribers.setdefault(session_id, set()).add(queue)
+    return queue
+
+
+def unsubscribe(session_id: str, queue: asyncio.Queue) -> None:
+    subs = _subscribers.get(session_id)
+    if subs is None:
+        return
+    subs.discard(queue)
+    if not subs:
+        _subscribers.pop(session_id, None)
+
+
+def format_sse(event: dict) -> str:
+    """One text/event-stream frame; the event name is the payload's `type`."""
+    return f"event: {event.get('type') or 'message'}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+def stats() -> dict:
+    return {
+        "sessions": len(_subscribers),
+        "subscribers": sum(len(s) for s in _subscribers.values()),
+        "published": _published,
+        "dropped": _dropped,
+    }
@@ -3,6 +3,7 @@ import logging
 import os
 import re
 from models.session import FactCheckResult
+from services import task_poller
 
 
 logger = logging.getLogger(__name__)
@@ -10,6 +11,13 @@ logger = logging.getLogger(__name__)
 YUTORI_API_KEY = os.getenv("YUTORI_API_KEY")
 YUTORI_BASE = "https://api.yutori.com/v1"
 
+# Research/Browsing tasks are polled by services.task_poller. "Expected" seeds its backoff
+# schedule until it has observed real completion times; "timeout" is the hard cap per task.
+RESEARCH_EXPECTED_SECONDS = 12.0
+RESEARCH_TIMEOUT_SECONDS = 24.0
+BROWSING_EXPECTED_SECONDS = 40.0
+BROWSING_TIMEOUT_SECONDS = 90.0
+
 
 def _yutori_headers() -> dict:
     """Yutori API uses X-API-Key header per docs."""
@@ -33,61 +41,55 @@ async def verify_claim(claim: str) -> FactCheckResult:
         return _stub_fact_check(claim)
 
     try:
-        import httpx
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            query = (
-                "Fact-check the claim below using reliable sources. "
-                "Return EXACTLY this format (4 lines):\n"
-                "CORRECT: <true|false>\n"
-                "ACTUAL_VALUE: <short actual value or 'unknown'>\n"
-                "SOURCE: <best URL>\n"
-                "SUMMARY: <one short sentence>\n\n"
-                f"CLAIM: {claim.strip()}"
-            )
-            create_resp = await client.post(
-                f"{YUTORI_BASE}/research/tasks",
-                headers=_yutori_headers(),
-                json={"query": query},
-            )
-            create_resp.raise_for_status()
-            task_data = create_resp.json()
-            task_id = task_data.get("task_id")
-            if not task_id:
-                return _stub_fact_check(claim)
-
-            import asyncio
-            # Cap polling so report generation doesn't hang (max ~24s per claim)
-            for _ in range(12):
-                await asyncio.sleep(2)
-                status_resp = await client.get(
-                    f"{YUTORI_BASE}/research/tasks/{task_id}",
-                    headers={"X-API-Key": YUTORI_API_KEY},
-                )
-                status_resp.raise_for_status()
-                status_data = status_resp.json()
-                status = status_data.get("status")
-                if status == "succeeded":
-                    result = status_data.get("result")
-                    summary = result if isinstance(result, str) else ""
-                    correct, actual_value, source_url, one_liner = _parse_factcheck_block(summary)
-                    if not source_url:
-                        updates = status_data.get("updates") or []
-                        for upd in updates:
-                            citations = upd.get("citations") or []
-                            if citations:
-                                source_url = citations[0].get("url")
-                                break
-                    return FactCheckResult(
-                        claim=claim,
-                        correct=correct,
-                        actual_value=actual_value,
-                        source_url=source_url,
-                        summary=one_liner or (summary[:280] if summary else None),
-                    )
-                if status == "failed":
-                    return _stub_fact_check(claim)
+        client = task_poller.client()
+        query = (
+            "Fact-check the claim below using reliable sources. "
+            "Return EXACTLY this format (4 lines):\n"
+            "CORRECT: <true|false>\n"
+            "ACTUAL_VALUE: <short actual value or 'unknown'>\n"
+            "SOURCE: <best URL>\n"
+            "SUMMARY: <one short sentence>\n\n"
+            f"CLAIM: {claim.strip()}"
+        )
+        create_resp = await client.post(
+            f"{YUTORI_BASE}/research/tasks",
+            headers=_yutori_headers(),
+            json={"query": query},
+        )
+        create_resp.raise_for_status()
+        task_data = create_resp.json()
+        task_id = task_data.get("task_id")
+        if not task_id:
+            return _stub_fact_check(claim)
 
+        # Cap polling so report generation doesn't hang (RESEARCH_TIMEOUT_SECONDS per claim)
+        status_data = await task_poller.wait(
+            "research",
+            task_id,
+            f"{YUTORI_BASE}/research/tasks/{task_id}",
+            {"X-API-Key": YUTORI_API_KEY},
+            expected_seconds=RESEARCH_EXPECTED_SECONDS,
+            timeout_seconds=RESEARCH_TIMEOUT_SECONDS,
+        )
+        if status_data is None or status_data.get("status") != "succeeded":
             return _stub_fact_check(claim)
+        result = status_data.get("result")
+        summary = result if isinstance(result, str) else ""
+        correct, actual_value, source_url, one_liner = _parse_factcheck_block(summary)
+        if not source_url:
+            updates = status_data.get("updates") or []
+            for upd in updates:
+                citations = upd.get("citations") or []
+                if citations:
+                    source_url = citations[0].get("url")
+                    break
+        return FactCheckResult(
+            claim=claim,
+            correct=correct,
+            actual_value=actual_value,
+            source_url=source_url,
+            summary=one_liner or (summary[:280] if summary else None),
+        )
     except Exception:
         logger.exception("Yutori verify_claim failed; falling back to stub result.")
         return _stub_fact_check(claim)
@@ -271,71 +273,65 @@ async def run_company_brief_browsing(role: str, company: str) -> dict:
     )
     start_url = f"https://www.google.com/search?q={company.replace(' ', '+')}+careers"
     try:
-        import httpx
-        import asyncio
-        async with httpx.AsyncClient(timeout=90.0) as client:
-            create_resp = await client.post(
-                f"{YUTORI_BASE}/browsing/tasks",
-                headers=_yutori_headers(),
-                json={"task": task_desc, "start_url": start_url, "max_steps": 40},
-            )
-            if not create_resp.is_success:
-                return {"expectations": [], "hints": [], "source_urls": []}
-            data = create_resp.json()
-            task_id = data.get("task_id")
-            if not task_id:
-                return {"expectations": [], "hints": [], "source_urls": []}
-            for _ in range(45):
-                await asyncio.sleep(2)
-                status_resp = await client.get(
-                    f"{YUTORI_BASE}/browsing/tasks/{task_id}",
-                    headers={"X-API-Key": YUTORI_API_KEY},
-                )
-                if not status_resp.is_success:
-                    continue
-                status_data = status_resp.json()
-                status = status_data.get("status")
-                if status == "succeeded":
-                    result = status_data.get("result") or ""
-                    expectations: list[str] = []
-                    hints: list[str] = []
-                    bullet_lines: list[str] = []
-                    for raw in (result or "").split("\n"):
-                        line = raw.strip()
-                        if not line:
-                            continue
-                        # Strip simple HTML tags Yutori may emit
-                        line = re.sub(r"<[^>]+>", "", line)
-                        if not line or line.lower().startswith("sources"):
-                            continue
-                        # Skip markdown headings like "## Final Summary"
-                        if line.lstrip().startswith("#"):
-                            continue
-                        if line.startswith("-"):
-                            line = line[1:].strip()
-                        if not line:
-                            continue
-                        bullet_lines.append(line[:200])
-                        if "expectation" in line.lower() or "require" in line.lower():
-                            expectations.append(line[:200])
-                        else:
-                            hints.append(line[:200])
+        client = task_poller.client()
+        create_resp = await client.post(
+            f"{YUTORI_BASE}/browsing/tasks",
+            headers=_yutori_headers(),
+            json={"task": task_desc, "start_url": start_url, "max_steps": 40},
+        )
+        if not create_resp.is_success:
+            return {"expectations": [], "hints": [], "source_urls": []}
+        data = create_resp.json()
+        task_id = data.get("task_id")
+        if not task_id:
+            return {"expectations": [], "hints": [], "source_urls": []}
+        status_data = await task_poller.wait(
+            "browsing",
+            task_id,
+            f"{YUTORI_BASE}/browsing/tasks/{task_id}",
+            {"X-API-Key": YUTORI_API_KEY},
+            expected_seconds=BROWSING_EXPECTED_SECONDS,
+            timeout_seconds=BROWSING_TIMEOUT_SECONDS,
+        )
+        if status_data is None or status_data.get("status") != "succeeded":
+            return {"expectations": [], "hints": [], "source_urls": []}
+        result = status_data.get("result") or ""
+        expectations: list[str] = []
+        hints: list[str] = []
+        bullet_lines: list[str] = []
+        for raw in (result or "").split("\n"):
+            line = raw.strip()
+            if not line:
+                continue
+            # Strip simple HTML tags Yutori may emit
+            line = re.sub(r"<[^>]+>", "", line)
+            if not line or line.lower().startswith("sources"):
+                continue
+            # Skip markdown headings like "## Final Summary"
+            if line.lstrip().startswith("#"):
+                continue
+            if line.startswith("-"):
+                line = line[1:].strip()
+            if not line:
+                continue
+            bullet_lines.append(line[:200])
+            if "expectation" in line.lower() or "require" in line.lower():
+                expectations.append(line[:200])
+            else:
+                hints.append(line[:200])
 
-                    # Fallback: if our keyword-based split found nothing,
-                    # still surface Yutori's text by treating the first
-                    # few bullet lines as expectations and the rest as hints.
-                    if not expectations and not hints and bullet_lines:
-                        expectations = bullet_lines[:3]
-                        hints = bullet_lines[3:8]
+        # Fallback: if our keyword-based split found nothing,
+        # still surface Yutori's text by treating the first
+        # few bullet lines as expectations and the rest as hints.
+        if not expectations and not hints and bullet_lines:
+            expectations = bullet_lines[:3]
+            hints = bullet_lines[3:8]
 
-                    return {
-                        "expectations": expectations[:5],
-                        "hints": hints[:5],
-                        "source_urls": [start_url],
-                    }
-                if status == "failed":
-                    return {"expectations": [], "hints": [], "source_urls": []}
-            return {"expectations": [], "hints": [], "source_urls": []}
+        return {
+            "expectations": expectations[:5],
+            "hints": hints[:5],
+            "source_urls": [start_url],
+        }
     except Exception:
         logger.exception("Yutori run_company_brief_browsing failed.")
         return {"expectations": [], "hints": [], "source_urls": []}
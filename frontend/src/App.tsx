@@ -19,6 +19,8 @@ import {
   getScoutUpdates,
   getSessionGraph,
   postCompanyBrief,
+  prewarmTranscription,
+  subscribeVoiceStream,
   triggerFinetuning,
   type AnswerResponse,
   type ModulateSummary,
@@ -285,6 +287,28 @@ function App() {
     };
   }, [recording]);
 
+  // While an answer is recorded and processed, show running stress/confidence from the voice
+  // stream; the answer response replaces them with the final values.
+  const listening = recording || processing;
+  useEffect(() => {
+    if (!listening || !sessionId || sessionId === 'offline') return;
+    return subscribeVoiceStream(sessionId, (e) => {
+      if (e.type === 'final') return;
+      setEmotionBars(modulateToEmotionBars(e.modulate));
+      if (e.modulate.transcript) setTranscript(e.modulate.transcript);
+      if (e.tone) setCoachTone(e.tone);
+    });
+  }, [listening, sessionId]);
+
+  const handleStartRecord = useCallback(() => {
+    setRecording(true);
+    if (!sessionId || sessionId === 'offline') return;
+    // Open the transcription socket now, while the candidate speaks, not after upload.
+    prewarmTranscription(sessionId).catch((e) => {
+      console.error('Transcription prewarm failed:', e);
+    });
+  }, [sessionId]);
+
   const handleRecorded = useCallback(
     async (blob: Blob, durationSeconds: number, videoFrameBase64?: string) => {
       if (!sessionId || sessionId === 'offline') return;
@@ -413,7 +437,7 @@ function App() {
       setGraphLoading(true);
       setGraphError(null);
       try {
-        const data = await getSessionGraph(sessionId);
+        const data = await getSessionGraph(sessionId, graphData);
         setGraphData(data);
         setGraphError(null);
       } catch (e) {
@@ -511,7 +535,7 @@ function App() {
               statusText={processing ? 'Processing…' : recording ? 'Recording…' : 'Ready'}
               hintText={processing ? 'Running ARIA analysis' : recording ? (recordSeconds >= 75 ? 'Wrap up soon (90s max)' : 'Modulate analyzing · 90s max') : 'Click mic · 90s max'}
               processing={processing}
-              onStartRecord={() => setRecording(true)}
+              onStartRecord={handleStartRecord}
               onStopRecord={() => setRecording(false)}
               onRecorded={handleRecorded}
               onError={(msg) => { setFeedbackText(msg); setFeedbackVisible(true); }}
@@ -59,6 +59,12 @@ export interface AnswerResponse {
   voice_pacing_score?: number | null;
   /** "modulate" = real per-answer metrics; "stub" = demo/fallback */
   metrics_source?: 'modulate' | 'stub' | null;
+  /** Per-stage timings of the answer pipeline and its critical path */
+  pipeline_timings?: {
+    total_ms: number;
+    critical_path: string[];
+    stages: Record<string, { start_ms: number; end_ms: number; duration_ms: number }>;
+  } | null;
 }
 
 export async function startSession(body: SessionStartRequest): Promise<SessionStartResponse> {
@@ -71,6 +77,31 @@ export async function startSession(body: SessionStartRequest): Promise<SessionSt
   return res.json();
 }
 
+/** Open the transcription socket when recording starts so the handshake is off the answer's critical path. */
+export async function prewarmTranscription(sessionId: string): Promise<{ prewarmed: boolean }> {
+  const res = await fetch(`${API_BASE}/session/${sessionId}/prewarm`, { method: 'POST' });
+  if (!res.ok) throw new Error(await res.text());
+  return res.json();
+}
+
+export interface VoiceEvent {
+  type: 'partial' | 'transcribed' | 'final';
+  question_number: number;
+  tone: string;
+  difficulty_delta?: number;
+  next_question?: string;
+  modulate: ModulateSummary;
+}
+
+/** Subscribe to partial voice results for the current answer; returns a function that closes the stream. */
+export function subscribeVoiceStream(sessionId: string, onEvent: (e: VoiceEvent) => void): () => void {
+  const source = new EventSource(`${API_BASE}/session/${sessionId}/voice-stream`);
+  for (const type of ['partial', 'transcribed', 'final']) {
+    source.addEventListener(type, (msg) => onEvent(JSON.parse((msg as MessageEvent).data)));
+  }
+  return () => source.close();
+}
+
 export async function submitAnswer(
   sessionId: string,
   audioBlob: Blob,
@@ -192,20 +223,45 @@ export interface SessionGraphResponse {
   session_id: string;
   nodes: SessionGraphNode[];
   edges: SessionGraphEdge[];
-  /** When false, Neo4j env vars are not set; graph will stay empty until configured. */
+  /** Monotonically increasing graph version; pass it back as `previous` to fetch only what changed. */
+  version?: number;
+  /** Present when the response is a delta (only nodes/edges added or changed after this version). */
+  since?: number;
+  /** When false, no memory backend (Neo4j or MEMORY_BACKEND=sqlite) is set; graph will stay empty until configured. */
   neo4j_configured?: boolean;
+  /** "neo4j", "sqlite", or null in stub mode. */
+  memory_backend?: string | null;
 }
 
 const GRAPH_FETCH_TIMEOUT_MS = 15_000;
 
-/** Neo4j session subgraph for the current session (proves graph is working). Times out after 15s so UI doesn't hang. */
-export async function getSessionGraph(sessionId: string): Promise<SessionGraphResponse> {
+function mergeSessionGraph(previous: SessionGraphResponse, delta: SessionGraphResponse): SessionGraphResponse {
+  const nodes = new Map(previous.nodes.map((n) => [n.id, n]));
+  for (const n of delta.nodes) nodes.set(n.id, n);
+  const edgeKey = (e: SessionGraphEdge) => `${e.source}|${e.type}|${e.target}`;
+  const edges = new Map(previous.edges.map((e) => [edgeKey(e), e]));
+  for (const e of delta.edges) edges.set(edgeKey(e), e);
+  return { ...delta, nodes: [...nodes.values()], edges: [...edges.values()], since: undefined };
+}
+
+/**
+ * Neo4j session subgraph for the current session (proves graph is working). Times out after 15s so UI doesn't hang.
+ * With `previous` (same session), only the delta since its version is fetched and merged in; an unchanged
+ * graph is revalidated by the browser via ETag (304).
+ */
+export async function getSessionGraph(
+  sessionId: string,
+  previous?: SessionGraphResponse | null,
+): Promise<SessionGraphResponse> {
   const controller = new AbortController();
   const timeoutId = setTimeout(() => controller.abort(), GRAPH_FETCH_TIMEOUT_MS);
+  const base = previous && previous.session_id === sessionId && previous.version ? previous : null;
+  const query = base ? `?since=${base.version}` : '';
   try {
-    const res = await fetch(`${API_BASE}/session/${sessionId}/graph`, { signal: controller.signal });
+    const res = await fetch(`${API_BASE}/session/${sessionId}/graph${query}`, { signal: controller.signal });
     if (!res.ok) throw new Error(await res.text());
-    return res.json();
+    const data: SessionGraphResponse = await res.json();
+    return base && data.since !== undefined ? mergeSessionGraph(base, data) : data;
   } catch (e) {
     if (e instanceof Error && e.name === 'AbortError') {
       throw new Error('Graph request timed out. Try again or check the backend.');